@@ -0,0 +1,78 @@
+"""Сравнение скорости сериализации списка целей
+
+Запуск из каталога todolist (с переменными окружения проекта): python -m benchmarks.list_serialization [--goals 1000]
+
+Сравнивает сериализацию страницы целей через GoalListSerializer (ModelSerializer с вложенным
+ProfileSerializer) и через ValuesSerializer по строкам QuerySet.values(). Данные формируются
+в памяти, поэтому измеряется только сериализация, без запросов к базе данных.
+"""
+import argparse
+import os
+import timeit
+from datetime import timedelta
+
+import django
+
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'todolist.settings')
+django.setup()
+
+from django.utils import timezone  # noqa: E402
+
+from core.models import User  # noqa: E402
+from goals.models import Goal  # noqa: E402
+from goals.serializers import GoalListSerializer, ValuesSerializer  # noqa: E402
+
+
+def make_goals(count: int) -> list[Goal]:
+    """Формирует цели с загруженными авторами (как select_related('user'))"""
+    now = timezone.now()
+    users = [
+        User(id=number, username=f'user{number}', first_name='Name', last_name='Surname', email=f'user{number}@mail.ru')
+        for number in range(1, 11)
+    ]
+    return [
+        Goal(
+            id=number, user=users[number % len(users)], category_id=1, board_id=1,
+            title=f'Goal {number}', description='Description', status=Goal.Status.to_do,
+            priority=Goal.Priority.medium, due_date=now + timedelta(days=number % 30),
+            created=now, updated=now,
+        )
+        for number in range(1, count + 1)
+    ]
+
+
+def to_row(goal: Goal, columns: list[str]) -> dict:
+    """Строка QuerySet.values(*columns) для цели"""
+    row = {}
+    for column in columns:
+        value = goal
+        for attr in column.split('__'):
+            value = getattr(value, 'category_id' if attr == 'category' else attr)
+        row[column] = value
+    return row
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--goals', type=int, default=1000, help='goals per page')
+    parser.add_argument('--repeat', type=int, default=20, help='number of serialized pages')
+    args = parser.parse_args()
+
+    goals = make_goals(args.goals)
+    values_serializer = ValuesSerializer(GoalListSerializer)
+    rows = [to_row(goal, values_serializer.columns) for goal in goals]
+    assert values_serializer.to_representation(rows[:1]) == [dict(GoalListSerializer(goals[0]).data)]
+
+    serializers = {
+        'GoalListSerializer': lambda: GoalListSerializer(goals, many=True).data,
+        'ValuesSerializer': lambda: values_serializer.to_representation(rows),
+    }
+
+    results = {name: min(timeit.repeat(serialize, number=args.repeat, repeat=3)) for name, serialize in serializers.items()}
+    for name, seconds in results.items():
+        print(f'{name:>20}: {seconds / args.repeat * 1000:8.3f} ms per {args.goals} goals')
+    print(f'{"speedup":>20}: {results["GoalListSerializer"] / results["ValuesSerializer"]:8.1f}x')
+
+
+if __name__ == '__main__':
+    main()
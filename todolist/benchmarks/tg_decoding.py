@@ -0,0 +1,117 @@
+"""Сравнение скорости разбора ответа getUpdates
+
+Запуск из каталога todolist: python -m benchmarks.tg_decoding [--updates 100] [--repeat 200]
+
+Сравнивает разбор пакета обновлений через схемы dataclasses_json/marshmallow
+(прежняя реализация bot.tg.dc) и методом GetUpdatesResponse.from_dict.
+"""
+import argparse
+import json
+import timeit
+from dataclasses import dataclass, field
+from typing import Optional
+
+from dataclasses_json import dataclass_json, config, Undefined
+
+from bot.tg.dc import GetUpdatesResponse
+
+
+@dataclass_json(undefined=Undefined.EXCLUDE)
+@dataclass
+class LegacyMessageFrom:
+    id: int
+    is_bot: bool
+    first_name: str
+    last_name: Optional[str] = None
+    username: Optional[str] = None
+    language_code: Optional[str] = None
+    is_premium: Optional[bool] = None
+    added_to_attachment_menu: Optional[bool] = None
+
+
+@dataclass_json(undefined=Undefined.EXCLUDE)
+@dataclass
+class LegacyChat:
+    id: int
+    type: str
+    title: Optional[str] = None
+    username: Optional[str] = None
+    first_name: Optional[str] = None
+    last_name: Optional[str] = None
+
+
+@dataclass_json(undefined=Undefined.EXCLUDE)
+@dataclass
+class LegacyMessage:
+    message_id: int
+    message_from: LegacyMessageFrom = field(metadata=config(field_name='from'))
+    date: int
+    chat: LegacyChat
+    text: Optional[str] = None
+
+
+@dataclass_json(undefined=Undefined.EXCLUDE)
+@dataclass
+class LegacyUpdate:
+    update_id: int
+    message: Optional[LegacyMessage] = None
+    edited_message: Optional[LegacyMessage] = None
+
+
+@dataclass_json(undefined=Undefined.EXCLUDE)
+@dataclass
+class LegacyGetUpdatesResponse:
+    ok: bool
+    result: list[LegacyUpdate]
+
+
+LegacyGetUpdatesResponseSchema = LegacyGetUpdatesResponse.schema()
+
+
+def make_payload(updates: int) -> str:
+    """Формирует JSON ответа getUpdates с заданным количеством обновлений"""
+    return json.dumps({
+        'ok': True,
+        'result': [
+            {
+                'update_id': 1000 + number,
+                'message': {
+                    'message_id': number,
+                    'from': {
+                        'id': 100 + number, 'is_bot': False, 'first_name': 'Name', 'last_name': 'Surname',
+                        'username': f'user{number}', 'language_code': 'ru',
+                    },
+                    'chat': {
+                        'id': 100 + number, 'first_name': 'Name', 'last_name': 'Surname',
+                        'username': f'user{number}', 'type': 'private',
+                    },
+                    'date': 1675000000 + number,
+                    'text': '/goals',
+                    'entities': [{'offset': 0, 'length': 6, 'type': 'bot_command'}],
+                },
+            }
+            for number in range(updates)
+        ],
+    })
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--updates', type=int, default=100, help='updates per getUpdates response')
+    parser.add_argument('--repeat', type=int, default=200, help='number of decoded responses')
+    args = parser.parse_args()
+
+    payload = make_payload(args.updates)
+    decoders = {
+        'dataclasses_json schema': lambda: LegacyGetUpdatesResponseSchema.load(json.loads(payload)),
+        'from_dict': lambda: GetUpdatesResponse.from_dict(json.loads(payload)),
+    }
+
+    results = {name: min(timeit.repeat(decoder, number=args.repeat, repeat=3)) for name, decoder in decoders.items()}
+    for name, seconds in results.items():
+        print(f'{name:>24}: {seconds / args.repeat * 1000:8.3f} ms per {args.updates} updates')
+    print(f'{"speedup":>24}: {results["dataclasses_json schema"] / results["from_dict"]:8.1f}x')
+
+
+if __name__ == '__main__':
+    main()
@@ -1,6 +1,6 @@
 from django.contrib import admin
 
-from bot.models import TgUser, TgChatState
+from bot.models import TgUser, TgChatState, TgMessage, TgUpdate
 
 
 @admin.register(TgUser)
@@ -17,3 +17,21 @@ class TgChatStateAdmin(admin.ModelAdmin):
 
     list_display = ('tg_user', 'category', 'is_create_command',)
     search_fields = ('tg_user',)
+
+
+@admin.register(TgMessage)
+class TgMessageAdmin(admin.ModelAdmin):
+    """Регистрация модели TgMessage для отображения в панели администратора"""
+
+    list_display = ('chat_id', 'text', 'status', 'attempts', 'created', 'sent',)
+    list_filter = ('status',)
+    search_fields = ('chat_id',)
+
+
+@admin.register(TgUpdate)
+class TgUpdateAdmin(admin.ModelAdmin):
+    """Регистрация модели TgUpdate для отображения в панели администратора"""
+
+    list_display = ('update_id', 'chat_id', 'status', 'created',)
+    list_filter = ('status',)
+    search_fields = ('chat_id',)
@@ -0,0 +1,144 @@
+import threading
+from dataclasses import dataclass
+
+from django.conf import settings
+from django.core.cache import cache, caches
+
+from bot.models import TgChatState
+from goals.models import Category
+
+#: Шаблон ключа состояния чата в общем кэше Django
+CACHE_KEY = 'bot:chat-state:{tg_id}'
+
+#: Шаблон ключа индекса категорий пользователя в кэше Django
+CATEGORY_INDEX_KEY = 'bot:categories:{user_id}'
+
+
+class SharedCache:
+    """Адаптер бэкенда кэша Django (CACHES) для состояний чатов
+
+    Args:
+        alias (str): имя кэша в CACHES
+        timeout (float): время жизни записи в секундах
+    """
+
+    def __init__(self, alias: str, timeout: float):
+        self.cache = caches[alias]
+        self.timeout = timeout
+
+    def get(self, key):
+        return self.cache.get(CACHE_KEY.format(tg_id=key))
+
+    def set(self, key, value) -> None:
+        self.cache.set(CACHE_KEY.format(tg_id=key), value, self.timeout)
+
+    def delete(self, key) -> None:
+        self.cache.delete(CACHE_KEY.format(tg_id=key))
+
+
+class ChatStateCache:
+    """Кэш состояний чатов верифицированных пользователей по идентификатору Telegram
+
+    Хранит объекты TgChatState вместе со связанным TgUser, что позволяет обработать
+    сообщение известного пользователя без чтения из базы данных. Запись в кэш выполняется
+    при каждом сохранении состояния, а сброс - при изменении TgUser (сигналы bot.signals).
+
+    Используется только общий кэш Django, заданный параметром TG_CHAT_CACHE: пользователь
+    верифицируется и отвязывается в процессе API, и сброс должен доходить до процессов бота.
+    Без параметра состояния не кэшируются.
+    """
+
+    def __init__(self):
+        self.__backend = None
+        if settings.TG_CHAT_CACHE:
+            self.__backend = SharedCache(alias=settings.TG_CHAT_CACHE, timeout=settings.TG_CHAT_CACHE_TIMEOUT)
+
+    def get(self, tg_id: int) -> TgChatState | None:
+        """Возвращает состояние чата пользователя или None, если его нет в кэше"""
+        return self.__backend.get(tg_id) if self.__backend else None
+
+    def set(self, chat_state: TgChatState) -> None:
+        """Сохраняет состояние чата, если пользователь верифицирован"""
+        if not self.__backend:
+            return
+        tg_user = chat_state.tg_user
+        if tg_user.user_id:
+            self.__backend.set(tg_user.tg_id, chat_state)
+        else:
+            self.__backend.delete(tg_user.tg_id)
+
+    def delete(self, tg_id: int) -> None:
+        """Удаляет состояние чата пользователя из кэша"""
+        if self.__backend:
+            self.__backend.delete(tg_id)
+
+
+_chat_cache: ChatStateCache | None = None
+_chat_cache_lock = threading.Lock()
+
+
+def get_chat_cache() -> ChatStateCache:
+    """Возвращает кэш состояний чатов процесса
+
+    Returns:
+        объект класса ChatStateCache
+    """
+    global _chat_cache
+    if _chat_cache is None:
+        with _chat_cache_lock:
+            if _chat_cache is None:
+                _chat_cache = ChatStateCache()
+    return _chat_cache
+
+
+@dataclass(slots=True)
+class CategoryIndex:
+    """Индекс категорий пользователя для команды /create
+
+    Хранит пары (id, title) категорий в порядке названий, а также словарь названий
+    и множество идентификаторов для поиска за постоянное время.
+    """
+
+    items: tuple[tuple[int, str], ...]
+    titles: dict[str, int]
+    ids: frozenset[int]
+
+    @classmethod
+    def from_items(cls, items) -> 'CategoryIndex':
+        items = tuple(items)
+        titles = {}
+        for category_id, title in items:
+            #: При совпадении названий выбирается первая категория
+            titles.setdefault(title, category_id)
+        return cls(items, titles, frozenset(category_id for category_id, _ in items))
+
+
+def get_category_index(user_id: int) -> CategoryIndex:
+    """Возвращает индекс не удаленных категорий пользователя
+
+    Индекс хранится в кэше Django (settings.TG_CATEGORY_CACHE_TIMEOUT, 0 - без кэша) и
+    сбрасывается сигналами bot.signals при изменении категорий. Сброс доходит до процесса
+    бота только при общем бэкенде CACHES, поэтому выбранная категория дополнительно
+    проверяется по базе данных.
+
+    Args:
+        user_id (int): идентификатор пользователя
+    Returns:
+        объект класса CategoryIndex
+    """
+    timeout = settings.TG_CATEGORY_CACHE_TIMEOUT
+    key = CATEGORY_INDEX_KEY.format(user_id=user_id)
+    if not timeout or (index := cache.get(key)) is None:
+        index = CategoryIndex.from_items(
+            Category.objects.filter(
+                user_id=user_id, is_deleted=False, board__is_deleted=False
+            ).order_by('title', 'id').values_list('id', 'title')
+        )
+        if timeout:
+            cache.set(key, index, timeout)
+    return index
+
+
+def invalidate_category_index(*user_ids: int) -> None:
+    """Удаляет индексы категорий пользователей из кэша"""
+    cache.delete_many([CATEGORY_INDEX_KEY.format(user_id=user_id) for user_id in user_ids])
@@ -0,0 +1,100 @@
+import time
+
+from bot.cache import get_chat_cache
+from bot.models import TgUser
+from bot.states import (
+    BaseStateClass, NewState, NotVerifiedState, VerifiedState
+)
+from bot.tg.dc import CallbackQuery, Message
+from todolist.metrics import BOT_UPDATE_DURATION
+
+
+class Chat:
+    """Основной класс Telegram чата
+
+    Args:
+    message (Message): объект класса Message или CallbackQuery (нажатие кнопки встроенной клавиатуры).
+        Предоставляет доступ к атрибутам полученного сообщения.
+    """
+
+    def __init__(self, message: Message | CallbackQuery):
+        self.__message = message
+        if isinstance(message, CallbackQuery):
+            self.__text, self.__callback_data = None, message.data
+        else:
+            self.__text, self.__callback_data = message.text, None
+        #: Атрибут для хранения текущего состояния чата
+        self.__state: BaseStateClass | None = None
+
+    @property
+    def state(self):
+        """Позволяет получить текущее состояние чата"""
+        if self.__state:
+            return self.__state
+        raise RuntimeError('state does not set')
+
+    def set_state(self):
+        """Устанавливает текущее состояние чата:
+
+        Состояние чата верифицированного пользователя берется из кэша (bot.cache)
+        без обращения к базе данных.
+
+        Returns:
+            None
+        """
+        message_from = self.__message.message_from
+
+        chat_state = get_chat_cache().get(message_from.id)
+        if chat_state and chat_state.tg_user.tg_username == message_from.username:
+            self.__state = VerifiedState(
+                tg_user=chat_state.tg_user,
+                chat_msg=self.__text,
+                chat_state=chat_state,
+                callback_data=self.__callback_data
+            )
+            return
+
+        tg_user, created = TgUser.objects.get_or_create(
+            tg_id=message_from.id,
+            defaults={'tg_username': message_from.username}
+        )
+        if not created and tg_user.tg_username != message_from.username:
+            tg_user.tg_username = message_from.username
+            tg_user.save(update_fields=('tg_username',))
+
+        if created:
+            self.__state = NewState(tg_user=tg_user)
+        else:
+            if not tg_user.user_id:
+                self.__state = NotVerifiedState(tg_user=tg_user)
+            else:
+                self.__state = VerifiedState(
+                    tg_user=tg_user,
+                    chat_msg=self.__text,
+                    callback_data=self.__callback_data
+                )
+
+
+def process_message(message: Message | CallbackQuery) -> None:
+    """Обрабатывает входящее сообщение
+
+    Используется при получении обновлений методом getUpdates (runbot) и через webhook (runupdates).
+
+    Args:
+        message: объект класса Message или CallbackQuery
+    """
+    started = time.perf_counter()
+    try:
+        #: Старт чата
+        chat = Chat(message=message)
+
+        #: Инициализация текущего состояния чата
+        chat.set_state()
+
+        #: Выполнение действий для текущего состояния
+        chat.state.run_actions()
+    finally:
+        BOT_UPDATE_DURATION.observe(
+            time.perf_counter() - started,
+            type='callback_query' if isinstance(message, CallbackQuery) else 'message',
+        )
@@ -0,0 +1,15 @@
+from django.conf import settings
+from django.core import checks
+
+from goals.checks import check_shared_cache
+
+
+@checks.register(checks.Tags.caches)
+def check_bot_caches(app_configs, **kwargs) -> list[checks.Error]:
+    """Кэш состояний чатов и индексов категорий бота сбрасывается из процессов API"""
+    cache_settings = {}
+    if settings.TG_CHAT_CACHE:
+        cache_settings['TG_CHAT_CACHE'] = settings.TG_CHAT_CACHE
+    if settings.TG_CATEGORY_CACHE_TIMEOUT:
+        cache_settings['TG_CATEGORY_CACHE_TIMEOUT'] = 'default'
+    return check_shared_cache(cache_settings, error_id='bot.E001')
@@ -0,0 +1,61 @@
+import logging
+import queue
+import threading
+from typing import Any, Callable
+
+from django.db import close_old_connections, connection
+
+
+class ChatDispatcher:
+    """Диспетчер параллельной обработки сообщений Telegram
+
+    Сообщения (объекты Message и CallbackQuery или сохраненные обновления TgUpdate) распределяются
+    между потоками-обработчиками по идентификатору чата: сообщения одного чата всегда попадают
+    в один поток и обрабатываются по порядку, сообщения разных чатов обрабатываются параллельно.
+
+    Args:
+        handler: функция обработки сообщения
+        workers (int): количество потоков-обработчиков
+        queue_size (int): размер очереди каждого потока. При заполнении очереди
+            добавление сообщения блокируется до ее освобождения
+    """
+
+    def __init__(self, handler: Callable[[Any], None], workers: int = 1, queue_size: int = 100):
+        self.__handler = handler
+        self.__queues: list[queue.Queue] = [queue.Queue(maxsize=queue_size) for _ in range(max(workers, 1))]
+        self.__threads: list[threading.Thread] = [
+            threading.Thread(target=self.__run, args=(tasks,), name=f'tg-worker-{number}', daemon=True)
+            for number, tasks in enumerate(self.__queues)
+        ]
+        self.logger = logging.getLogger(__name__)
+
+    def start(self) -> None:
+        """Запускает потоки-обработчики"""
+        for thread in self.__threads:
+            thread.start()
+
+    def stop(self) -> None:
+        """Останавливает потоки-обработчики после обработки всех поставленных в очередь сообщений"""
+        for tasks in self.__queues:
+            tasks.put(None)
+        for thread in self.__threads:
+            thread.join()
+
+    def put(self, chat_id: int, message: Any) -> None:
+        """Ставит сообщение в очередь потока, закрепленного за чатом
+
+        Args:
+            chat_id (int): идентификатор чата
+            message: сообщение, нажатие кнопки встроенной клавиатуры или сохраненное обновление
+        """
+        self.__queues[chat_id % len(self.__queues)].put(message)
+
+    def __run(self, tasks: queue.Queue) -> None:
+        while (message := tasks.get()) is not None:
+            try:
+                self.__handler(message)
+            except Exception:
+                self.logger.exception('Message processing failed: %s', message)
+            finally:
+                close_old_connections()
+        connection.close()
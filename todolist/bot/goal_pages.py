@@ -0,0 +1,121 @@
+from dataclasses import dataclass
+
+from goals.models import Goal
+
+#: Максимальная длина текста сообщения Telegram
+MESSAGE_LIMIT = 4096
+
+#: Префикс данных кнопок перехода по страницам списка целей
+CALLBACK_PREFIX = 'goals:'
+
+
+@dataclass(slots=True)
+class GoalsQuery:
+    """Параметры страницы списка целей команды /goals
+
+    Страницы выбираются по ключу (id цели): after - следующая страница после цели,
+    before - предыдущая страница перед целью. Из базы данных читается не больше
+    одной страницы, поэтому объем памяти не зависит от количества целей.
+    """
+
+    status: int | None = None
+    priority: int | None = None
+    after: int | None = None
+    before: int | None = None
+
+    @classmethod
+    def from_command(cls, text: str) -> 'GoalsQuery':
+        """Разбирает команду '/goals [status=N] [priority=N]'
+
+        Raises:
+            ValueError: неизвестный или некорректный фильтр
+        """
+        query = cls()
+        for arg in text.split()[1:]:
+            name, _, value = arg.partition('=')
+            #: Архивные цели в список не входят
+            if name == 'status' and value.isdigit() and int(value) in Goal.Status.values \
+                    and int(value) != Goal.Status.archived:
+                query.status = int(value)
+            elif name == 'priority' and value.isdigit() and int(value) in Goal.Priority.values:
+                query.priority = int(value)
+            else:
+                raise ValueError(arg)
+        return query
+
+    @classmethod
+    def from_callback(cls, data: str) -> 'GoalsQuery':
+        """Разбирает данные кнопки 'goals:<направление><id>:<status>:<priority>'
+
+        Raises:
+            ValueError: некорректные данные кнопки
+        """
+        cursor, status, priority = data.removeprefix(CALLBACK_PREFIX).split(':')
+        query = cls(status=int(status) if status else None, priority=int(priority) if priority else None)
+        if cursor[:1] == '>':
+            query.after = int(cursor[1:])
+        elif cursor[:1] == '<':
+            query.before = int(cursor[1:])
+        else:
+            raise ValueError(data)
+        return query
+
+    def to_callback(self, after: int | None = None, before: int | None = None) -> str:
+        cursor = f'>{after}' if after is not None else f'<{before}'
+        return f'{CALLBACK_PREFIX}{cursor}:{self.status or ""}:{self.priority or ""}'
+
+
+def get_goals_page(user_id: int, query: GoalsQuery, size: int) -> tuple[str, dict | None]:
+    """Возвращает страницу списка целей пользователя
+
+    Страница содержит не больше size целей и ограничена длиной сообщения Telegram.
+
+    Args:
+        user_id (int): идентификатор пользователя
+        query (GoalsQuery): параметры страницы
+        size (int): количество целей на странице
+    Returns:
+        текст сообщения и клавиатура перехода по страницам (или None)
+    """
+    goals = Goal.objects.filter(
+        board__participants__user_id=user_id,
+        board__is_deleted=False,
+        category__is_deleted=False,
+        status__lt=Goal.Status.archived,
+    )
+    if query.status:
+        goals = goals.filter(status=query.status)
+    if query.priority:
+        goals = goals.filter(priority=query.priority)
+
+    #: Читается на одну цель больше страницы, чтобы определить наличие следующей страницы
+    if query.before is not None:
+        rows = list(goals.filter(id__lt=query.before).order_by('-id').values_list('id', 'title')[:size + 1])
+        has_prev, has_next = len(rows) > size, True
+        rows = rows[:size][::-1]
+    else:
+        if query.after is not None:
+            goals = goals.filter(id__gt=query.after)
+        rows = list(goals.order_by('id').values_list('id', 'title')[:size + 1])
+        has_prev, has_next = query.after is not None, len(rows) > size
+        rows = rows[:size]
+
+    if not rows:
+        return '[goals not found]', None
+
+    lines, length = [], 0
+    for number, (goal_id, title) in enumerate(rows):
+        length += len(title) + 1
+        if length > MESSAGE_LIMIT and lines:
+            #: Цели, не поместившиеся в сообщение, переносятся на следующую страницу
+            rows, has_next = rows[:number], True
+            break
+        lines.append(title[:MESSAGE_LIMIT])
+
+    buttons = []
+    if has_prev:
+        buttons.append({'text': '« Назад', 'callback_data': query.to_callback(before=rows[0][0])})
+    if has_next:
+        buttons.append({'text': 'Далее »', 'callback_data': query.to_callback(after=rows[-1][0])})
+
+    return '\n'.join(lines), {'inline_keyboard': [buttons]} if buttons else None
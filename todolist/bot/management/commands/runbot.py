@@ -1,10 +1,16 @@
 import logging
+import time
+
 from django.core.management import BaseCommand
+from requests import exceptions
 
-from bot.management.commands._chat import Chat
+from bot.dispatcher import ChatDispatcher
+from bot.chat import process_message
+from bot.sender import MessageSender
 from bot.tg.client import TgClient
-from bot.tg.dc import GetUpdatesResponse
+from bot.tg.dc import CallbackQuery, GetUpdatesResponse
 from todolist import settings
+from todolist.metrics import BOT_SEND_ERRORS, BOT_UPDATE_LAG
 
 
 class Command(BaseCommand):
@@ -18,22 +24,48 @@ class Command(BaseCommand):
         self.logger = logging.getLogger(__name__)
         self.logger.info('Bot start pooling')
 
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--workers', type=int, default=settings.TG_BOT_WORKERS,
+            help='Number of threads processing messages of different chats in parallel'
+        )
+        parser.add_argument(
+            '--no-sender', action='store_true',
+            help='Do not send queued messages (when "runsender" is run separately)'
+        )
+
     def handle(self, *args, **options):
+        dispatcher = ChatDispatcher(handler=process_message, workers=options['workers'])
+        dispatcher.start()
+
+        sender = None if options['no_sender'] else MessageSender(tg_client=self.tg_client)
+        if sender:
+            sender.start()
 
         #: int: идентификатор первого возвращаемого обновления
         offset = 0
-        while True:
-            response: GetUpdatesResponse = self.tg_client.get_updates(offset=offset)
-            for item in response.result:
-                offset = item.update_id + 1
-
-                #: Старт чата
-                self.logger.info(item.message)
-                if item.message:
-                    chat = Chat(message=item.message)
+        try:
+            while True:
+                response: GetUpdatesResponse = self.tg_client.get_updates(offset=offset)
+                for item in response.result:
+                    offset = item.update_id + 1
 
-                    #: Инициализация текущего состояния чата
-                    chat.set_state(tg_client=self.tg_client)
+                    self.logger.info(item.message)
+                    if item.message:
+                        BOT_UPDATE_LAG.observe(time.time() - item.message.date, source='polling')
+                        dispatcher.put(chat_id=item.message.chat.id, message=item.message)
+                    if callback_query := item.callback_query:
+                        dispatcher.put(chat_id=callback_query.chat_id, message=callback_query)
+                        self.answer_callback_query(callback_query)
+        finally:
+            dispatcher.stop()
+            if sender:
+                sender.stop()
 
-                    #: Выполнение действий для текущего состояния
-                    chat.state.run_actions()
+    def answer_callback_query(self, callback_query: CallbackQuery) -> None:
+        """Подтверждает нажатие кнопки встроенной клавиатуры"""
+        try:
+            self.tg_client.answer_callback_query(callback_query_id=callback_query.id)
+        except exceptions.RequestException:
+            BOT_SEND_ERRORS.inc(method='answerCallbackQuery')
+            self.logger.exception('Callback query %s answering failed', callback_query.id)
@@ -0,0 +1,21 @@
+import logging
+
+from django.core.management import BaseCommand
+
+from bot.sender import MessageSender
+from bot.tg.client import TgClient
+from todolist import settings
+
+
+class Command(BaseCommand):
+    """Класс команды для запуска отправки исходящих сообщений Telegram бота
+
+    Используется в режиме webhook или при запуске runbot с параметром --no-sender
+    """
+
+    help = 'Sends queued Telegram bot messages'
+
+    def handle(self, *args, **options):
+        logging.getLogger(__name__).info('Bot sender start')
+        sender = MessageSender(tg_client=TgClient(token=settings.TG_TOKEN))
+        sender.run()
@@ -0,0 +1,25 @@
+import logging
+
+from django.core.management import BaseCommand
+
+from bot.updates import UpdateProcessor
+from todolist import settings
+
+
+class Command(BaseCommand):
+    """Класс команды для запуска обработки обновлений Telegram бота, принятых через webhook
+
+    Используется в режиме webhook вместе с командой runsender
+    """
+
+    help = 'Processes Telegram bot updates received by webhook'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--workers', type=int, default=settings.TG_BOT_WORKERS,
+            help='Number of threads processing updates of different chats in parallel'
+        )
+
+    def handle(self, *args, **options):
+        logging.getLogger(__name__).info('Bot updates processing start')
+        UpdateProcessor(workers=options['workers']).run()
@@ -0,0 +1,41 @@
+from django.core.management import BaseCommand, CommandError
+
+from bot.tg.client import TgClient
+from todolist import settings
+
+
+class Command(BaseCommand):
+    """Класс команды для регистрации webhook Telegram бота
+
+    Обновления, принятые через webhook, обрабатываются командой runupdates, сообщения отправляются runsender
+    """
+
+    help = 'Registers (or deletes) Telegram bot webhook'
+
+    def add_arguments(self, parser):
+        parser.add_argument('url', nargs='?', help='HTTPS URL of the /bot/webhook endpoint')
+        parser.add_argument('--delete', action='store_true', help='Delete webhook and return to polling mode')
+        parser.add_argument(
+            '--max-connections', type=int, default=40,
+            help='Maximum number of simultaneous webhook requests from Telegram'
+        )
+
+    def handle(self, *args, **options):
+        tg_client = TgClient(token=settings.TG_TOKEN)
+
+        if options['delete']:
+            response = tg_client.delete_webhook()
+        else:
+            if not options['url']:
+                raise CommandError('url is required')
+            if not settings.TG_WEBHOOK_SECRET:
+                raise CommandError('TG_WEBHOOK_SECRET is not set')
+            response = tg_client.set_webhook(
+                url=options['url'],
+                secret_token=settings.TG_WEBHOOK_SECRET,
+                max_connections=options['max_connections']
+            )
+
+        if not response.ok:
+            raise CommandError(response.description)
+        self.stdout.write(self.style.SUCCESS('OK'))
@@ -0,0 +1,33 @@
+# Generated by Django 4.1.4 on 2026-10-18 18:02
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('bot', '0002_tgchatstate'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TgMessage',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('chat_id', models.BigIntegerField(verbose_name='ID чата в Telegram')),
+                ('text', models.TextField(verbose_name='Текст')),
+                ('status', models.PositiveSmallIntegerField(choices=[(1, 'В очереди'), (2, 'Отправлено'), (3, 'Ошибка отправки')], default=1, verbose_name='Статус')),
+                ('attempts', models.PositiveSmallIntegerField(default=0, verbose_name='Попыток отправки')),
+                ('created', models.DateTimeField(auto_now_add=True, verbose_name='Дата создания')),
+                ('sent', models.DateTimeField(blank=True, null=True, verbose_name='Дата отправки')),
+            ],
+            options={
+                'verbose_name': 'Исходящее сообщение',
+                'verbose_name_plural': 'Исходящие сообщения',
+            },
+        ),
+        migrations.AddIndex(
+            model_name='tgmessage',
+            index=models.Index(condition=models.Q(('status', 1)), fields=['id'], name='tg_message_pending_idx'),
+        ),
+    ]
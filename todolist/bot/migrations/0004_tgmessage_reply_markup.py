@@ -0,0 +1,18 @@
+# Generated by Django 4.1.4 on 2026-10-18 18:09
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('bot', '0003_tgmessage'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='tgmessage',
+            name='reply_markup',
+            field=models.JSONField(blank=True, null=True, verbose_name='Клавиатура'),
+        ),
+    ]
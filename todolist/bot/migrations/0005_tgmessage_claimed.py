@@ -0,0 +1,31 @@
+# Generated by Django 4.1.4 on 2026-10-18 19:34
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('bot', '0004_tgmessage_reply_markup'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='tgmessage',
+            name='claimed',
+            field=models.DateTimeField(blank=True, null=True, verbose_name='Дата захвата отправителем'),
+        ),
+        migrations.AlterField(
+            model_name='tgmessage',
+            name='status',
+            field=models.PositiveSmallIntegerField(choices=[(1, 'В очереди'), (2, 'Отправлено'), (3, 'Ошибка отправки'), (4, 'Отправляется')], default=1, verbose_name='Статус'),
+        ),
+        migrations.AddIndex(
+            model_name='tgmessage',
+            index=models.Index(condition=models.Q(('status', 4)), fields=['claimed'], name='tg_message_sending_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='tgmessage',
+            index=models.Index(fields=['created'], name='tg_message_created_idx'),
+        ),
+    ]
@@ -0,0 +1,41 @@
+# Generated by Django 4.1.4 on 2026-10-18 19:51
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('bot', '0005_tgmessage_claimed'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TgUpdate',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('update_id', models.BigIntegerField(unique=True, verbose_name='ID обновления в Telegram')),
+                ('chat_id', models.BigIntegerField(verbose_name='ID чата в Telegram')),
+                ('data', models.JSONField(verbose_name='Обновление')),
+                ('status', models.PositiveSmallIntegerField(choices=[(1, 'В очереди'), (2, 'Обрабатывается'), (3, 'Обработано'), (4, 'Ошибка обработки')], default=1, verbose_name='Статус')),
+                ('created', models.DateTimeField(auto_now_add=True, verbose_name='Дата получения')),
+                ('claimed', models.DateTimeField(blank=True, null=True, verbose_name='Дата захвата обработчиком')),
+            ],
+            options={
+                'verbose_name': 'Входящее обновление',
+                'verbose_name_plural': 'Входящие обновления',
+            },
+        ),
+        migrations.AddIndex(
+            model_name='tgupdate',
+            index=models.Index(condition=models.Q(('status', 1)), fields=['update_id'], name='tg_update_pending_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='tgupdate',
+            index=models.Index(condition=models.Q(('status', 2)), fields=['claimed'], name='tg_update_processing_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='tgupdate',
+            index=models.Index(fields=['created'], name='tg_update_created_idx'),
+        ),
+    ]
@@ -58,3 +58,72 @@ class TgChatState(models.Model):
 
     def __str__(self):
         return str(self.tg_user.tg_id)
+
+
+class TgMessage(models.Model):
+    """Модель исходящего сообщения Telegram бота
+
+    Очередь сообщений, отправляемых фоновым отправителем с ограничением частоты.
+    Перед отправкой сообщение захватывается отправителем (статус sending, дата захвата claimed),
+    чтобы несколько отправителей не отправили его дважды.
+    """
+
+    class Status(models.IntegerChoices):
+        pending = 1, 'В очереди'
+        sent = 2, 'Отправлено'
+        failed = 3, 'Ошибка отправки'
+        sending = 4, 'Отправляется'
+
+    chat_id = models.BigIntegerField(verbose_name='ID чата в Telegram')
+    text = models.TextField(verbose_name='Текст')
+    reply_markup = models.JSONField(verbose_name='Клавиатура', null=True, blank=True)
+    status = models.PositiveSmallIntegerField(verbose_name='Статус', choices=Status.choices, default=Status.pending)
+    attempts = models.PositiveSmallIntegerField(verbose_name='Попыток отправки', default=0)
+    created = models.DateTimeField(verbose_name='Дата создания', auto_now_add=True)
+    sent = models.DateTimeField(verbose_name='Дата отправки', null=True, blank=True)
+    claimed = models.DateTimeField(verbose_name='Дата захвата отправителем', null=True, blank=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['id'], name='tg_message_pending_idx', condition=models.Q(status=1)),
+            models.Index(fields=['claimed'], name='tg_message_sending_idx', condition=models.Q(status=4)),
+            models.Index(fields=['created'], name='tg_message_created_idx'),
+        ]
+        verbose_name = 'Исходящее сообщение'
+        verbose_name_plural = 'Исходящие сообщения'
+
+    def __str__(self):
+        return f'{self.chat_id}: {self.text[:20]}'
+
+
+class TgUpdate(models.Model):
+    """Модель входящего обновления Telegram, принятого через webhook
+
+    Обновление сохраняется до ответа на запрос Telegram и обрабатывается фоновым обработчиком
+    (команда runupdates), поэтому перезапуск процессов API не приводит к потере обновлений
+    """
+
+    class Status(models.IntegerChoices):
+        pending = 1, 'В очереди'
+        processing = 2, 'Обрабатывается'
+        processed = 3, 'Обработано'
+        failed = 4, 'Ошибка обработки'
+
+    update_id = models.BigIntegerField(verbose_name='ID обновления в Telegram', unique=True)
+    chat_id = models.BigIntegerField(verbose_name='ID чата в Telegram')
+    data = models.JSONField(verbose_name='Обновление')
+    status = models.PositiveSmallIntegerField(verbose_name='Статус', choices=Status.choices, default=Status.pending)
+    created = models.DateTimeField(verbose_name='Дата получения', auto_now_add=True)
+    claimed = models.DateTimeField(verbose_name='Дата захвата обработчиком', null=True, blank=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['update_id'], name='tg_update_pending_idx', condition=models.Q(status=1)),
+            models.Index(fields=['claimed'], name='tg_update_processing_idx', condition=models.Q(status=2)),
+            models.Index(fields=['created'], name='tg_update_created_idx'),
+        ]
+        verbose_name = 'Входящее обновление'
+        verbose_name_plural = 'Входящие обновления'
+
+    def __str__(self):
+        return f'{self.chat_id}: {self.update_id}'
@@ -0,0 +1,299 @@
+import logging
+import threading
+import time
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import close_old_connections, connection, transaction
+from django.utils import timezone
+from requests import exceptions
+
+from bot.models import TgMessage
+from bot.tg.client import TgClient
+from todolist.metrics import BOT_SEND_ERRORS
+
+#: Событие о появлении новых сообщений в очереди (для отправителя в том же процессе)
+_new_message = threading.Event()
+
+
+def enqueue_message(chat_id: int, text: str, reply_markup: dict | None = None) -> TgMessage:
+    """Ставит сообщение в очередь на отправку
+
+    Args:
+        chat_id (int): идентификатор чата
+        text (str): текст сообщения
+        reply_markup (dict): клавиатура сообщения
+    Returns:
+        объект класса TgMessage
+    """
+    message = TgMessage.objects.create(chat_id=chat_id, text=text, reply_markup=reply_markup)
+    _new_message.set()
+    return message
+
+
+def is_read_timeout(error: Exception) -> bool:
+    """Проверяет, что запрос завершился таймаутом ожидания ответа (запрос мог быть выполнен)
+
+    Таймаут установки соединения (ConnectTimeout) к ним не относится: запрос не был отправлен.
+    """
+    for exception in (error, error.__cause__):
+        if isinstance(exception, exceptions.Timeout) and not isinstance(exception, exceptions.ConnectTimeout):
+            return True
+    return False
+
+
+class TokenBucket:
+    """Ограничитель частоты по алгоритму token bucket
+
+    Args:
+        rate (float): количество токенов, добавляемых в секунду
+        capacity (float): максимальное количество накопленных токенов
+    """
+
+    def __init__(self, rate: float, capacity: float | None = None):
+        self.rate = rate
+        self.capacity = capacity or rate
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+
+    def try_acquire(self) -> bool:
+        """Забирает токен, если он доступен
+
+        Returns:
+            bool: токен получен
+        """
+        self._refill()
+        if self.tokens >= 1:
+            self.tokens -= 1
+            return True
+        return False
+
+    def acquire(self) -> None:
+        """Забирает токен, ожидая его появления"""
+        while not self.try_acquire():
+            time.sleep((1 - self.tokens) / self.rate)
+
+    def is_full(self) -> bool:
+        self._refill()
+        return self.tokens >= self.capacity
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+
+class SenderStats:
+    """Статистика отправителя сообщений"""
+
+    def __init__(self):
+        self.queue_depth = 0
+        self.sent = 0
+        self.failed = 0
+        self.errors = 0
+        self.latency_total = 0.0
+        self.latency_max = 0.0
+
+    @property
+    def latency_avg(self) -> float:
+        return self.latency_total / self.sent if self.sent else 0.0
+
+    def as_dict(self) -> dict:
+        return {
+            'queue_depth': self.queue_depth,
+            'sent': self.sent,
+            'failed': self.failed,
+            'errors': self.errors,
+            'latency_avg': round(self.latency_avg, 3),
+            'latency_max': round(self.latency_max, 3),
+        }
+
+
+class MessageSender:
+    """Фоновый отправитель сообщений из очереди TgMessage
+
+    Сообщения отправляются в порядке постановки в очередь с ограничениями частоты:
+    общим (settings.TG_SEND_RATE сообщений в секунду) и для каждого чата
+    (settings.TG_CHAT_SEND_RATE). Если чат исчерпал лимит, его сообщения откладываются
+    до следующего прохода, не задерживая остальные чаты. Ограничения действуют в пределах
+    процесса, поэтому отправитель должен быть запущен в единственном экземпляре: либо в runbot,
+    либо командой runsender (runbot с параметром --no-sender).
+
+    Сообщения прохода захватываются атомарно (SELECT ... FOR UPDATE SKIP LOCKED и статус sending),
+    чтобы сообщение не было отправлено дважды, если старый и новый отправители ненадолго
+    работают одновременно (например, при перезапуске).
+    Раз в stats_interval секунд в очередь возвращаются сообщения, захваченные дольше
+    settings.TG_SEND_CLAIM_TIMEOUT секунд назад, и удаляются обработанные сообщения
+    старше settings.TG_MESSAGE_RETENTION секунд.
+
+    Args:
+        tg_client: Telegram клиент
+        batch_size (int): количество сообщений, выбираемых из очереди за проход
+        max_attempts (int): количество попыток отправки сообщения
+        poll_interval (float): интервал опроса очереди в секундах при отсутствии сообщений
+        stats_interval (float): интервал записи статистики в журнал в секундах
+    """
+
+    def __init__(self, tg_client: TgClient, batch_size: int = 100, max_attempts: int = 3,
+                 poll_interval: float = 1, stats_interval: float = 60):
+        self.tg_client = tg_client
+        self.batch_size = batch_size
+        self.max_attempts = max_attempts
+        self.poll_interval = poll_interval
+        self.stats_interval = stats_interval
+
+        self.global_bucket = TokenBucket(rate=settings.TG_SEND_RATE)
+        self.chat_buckets: dict[int, TokenBucket] = {}
+        self.stats = SenderStats()
+        self.logger = logging.getLogger(__name__)
+
+        self.__stop = threading.Event()
+        self.__thread: threading.Thread | None = None
+
+    def start(self) -> None:
+        """Запускает отправку в отдельном потоке"""
+        self.__thread = threading.Thread(target=self.run, name='tg-sender', daemon=True)
+        self.__thread.start()
+
+    def stop(self) -> None:
+        """Останавливает отправку"""
+        self.__stop.set()
+        _new_message.set()
+        if self.__thread:
+            self.__thread.join()
+
+    def run(self) -> None:
+        """Отправляет сообщения до вызова stop()"""
+        stats_time = time.monotonic()
+        try:
+            while not self.__stop.is_set():
+                _new_message.clear()
+                try:
+                    sent = self.run_once()
+                finally:
+                    close_old_connections()
+
+                if time.monotonic() - stats_time >= self.stats_interval:
+                    stats_time = time.monotonic()
+                    self.log_stats()
+                    self.cleanup()
+
+                if not sent:
+                    _new_message.wait(self.poll_interval)
+        finally:
+            connection.close()
+
+    def run_once(self) -> int:
+        """Выполняет один проход по очереди
+
+        Returns:
+            int: количество обработанных сообщений
+        """
+        messages = self.claim()
+
+        processed = 0
+        #: Чаты, сообщения которых откладываются до следующего прохода (для сохранения порядка)
+        deferred_chats = set()
+        released = []
+        for message in messages:
+            if self.__stop.is_set() or message.chat_id in deferred_chats \
+                    or not self._get_chat_bucket(message.chat_id).try_acquire():
+                deferred_chats.add(message.chat_id)
+                released.append(message.id)
+                continue
+
+            self.global_bucket.acquire()
+            if not self.send(message):
+                deferred_chats.add(message.chat_id)
+            processed += 1
+
+        if released:
+            TgMessage.objects.filter(id__in=released, status=TgMessage.Status.sending).update(
+                status=TgMessage.Status.pending, claimed=None
+            )
+        self._cleanup_chat_buckets()
+        return processed
+
+    def claim(self) -> list[TgMessage]:
+        """Захватывает сообщения очереди для отправки
+
+        Строки, заблокированные другим отправителем, пропускаются.
+
+        Returns:
+            list[TgMessage]: захваченные сообщения в порядке постановки в очередь
+        """
+        now = timezone.now()
+        with transaction.atomic():
+            messages = list(
+                TgMessage.objects.filter(status=TgMessage.Status.pending)
+                .select_for_update(skip_locked=True).order_by('id')[:self.batch_size]
+            )
+            if messages:
+                TgMessage.objects.filter(id__in=[message.id for message in messages]).update(
+                    status=TgMessage.Status.sending, claimed=now
+                )
+        for message in messages:
+            message.status = TgMessage.Status.sending
+            message.claimed = now
+        return messages
+
+    def cleanup(self) -> None:
+        """Возвращает в очередь зависшие захваченные сообщения и удаляет устаревшие обработанные"""
+        now = timezone.now()
+        TgMessage.objects.filter(
+            status=TgMessage.Status.sending, claimed__lt=now - timedelta(seconds=settings.TG_SEND_CLAIM_TIMEOUT)
+        ).update(status=TgMessage.Status.pending, claimed=None)
+        if settings.TG_MESSAGE_RETENTION:
+            TgMessage.objects.filter(
+                status__in=(TgMessage.Status.sent, TgMessage.Status.failed),
+                created__lt=now - timedelta(seconds=settings.TG_MESSAGE_RETENTION),
+            ).delete()
+
+    def send(self, message: TgMessage) -> bool:
+        """Отправляет сообщение и сохраняет результат
+
+        Returns:
+            bool: сообщение отправлено
+        """
+        message.attempts += 1
+        try:
+            self.tg_client.send_message(chat_id=message.chat_id, text=message.text, reply_markup=message.reply_markup)
+        except (exceptions.RequestException, KeyError, TypeError) as error:
+            self.stats.errors += 1
+            BOT_SEND_ERRORS.inc(method='sendMessage')
+            self.logger.exception('Message %s sending failed', message.id)
+            #: При таймауте ожидания ответа сообщение могло быть доставлено - повторная отправка
+            #: привела бы к дублю в чате, поэтому сообщение помечается неотправленным
+            if message.attempts >= self.max_attempts or is_read_timeout(error):
+                message.status = TgMessage.Status.failed
+                self.stats.failed += 1
+            else:
+                message.status = TgMessage.Status.pending
+            message.claimed = None
+            message.save(update_fields=('attempts', 'status', 'claimed',))
+            return False
+
+        message.status = TgMessage.Status.sent
+        message.sent = timezone.now()
+        message.claimed = None
+        message.save(update_fields=('attempts', 'status', 'sent', 'claimed',))
+
+        latency = (message.sent - message.created).total_seconds()
+        self.stats.sent += 1
+        self.stats.latency_total += latency
+        self.stats.latency_max = max(self.stats.latency_max, latency)
+        return True
+
+    def log_stats(self) -> None:
+        self.stats.queue_depth = TgMessage.objects.filter(status=TgMessage.Status.pending).count()
+        self.logger.info('Sender stats: %s', self.stats.as_dict())
+
+    def _get_chat_bucket(self, chat_id: int) -> TokenBucket:
+        if (bucket := self.chat_buckets.get(chat_id)) is None:
+            bucket = self.chat_buckets[chat_id] = TokenBucket(rate=settings.TG_CHAT_SEND_RATE, capacity=1)
+        return bucket
+
+    def _cleanup_chat_buckets(self) -> None:
+        #: Заполненные ограничители эквивалентны новым - удаляем их, чтобы словарь не рос
+        for chat_id in [chat_id for chat_id, bucket in self.chat_buckets.items() if bucket.is_full()]:
+            del self.chat_buckets[chat_id]
@@ -0,0 +1,47 @@
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from bot.cache import get_chat_cache, invalidate_category_index
+from bot.models import TgChatState, TgUser
+from goals.models import Board, Category
+
+
+@receiver(post_save, sender=TgChatState)
+def cache_chat_state(sender, instance: TgChatState, **kwargs) -> None:
+    """Записывает сохраненное состояние чата в кэш"""
+    get_chat_cache().set(instance)
+
+
+@receiver(post_delete, sender=TgChatState)
+def reset_chat_state(sender, instance: TgChatState, **kwargs) -> None:
+    """Удаляет состояние чата из кэша при его удалении"""
+    try:
+        get_chat_cache().delete(instance.tg_user.tg_id)
+    except TgUser.DoesNotExist:
+        #: Состояние удалено вместе с Telegram пользователем - кэш сбрасывается сигналом TgUser
+        pass
+
+
+@receiver([post_save, post_delete], sender=TgUser)
+def reset_tg_user(sender, instance: TgUser, **kwargs) -> None:
+    """Удаляет состояние чата из кэша при изменении или удалении Telegram пользователя"""
+    get_chat_cache().delete(instance.tg_id)
+
+
+@receiver([post_save, post_delete], sender=Category)
+def reset_category_index(sender, instance: Category, **kwargs) -> None:
+    """Сбрасывает индекс категорий пользователя при изменении или удалении категории"""
+    transaction.on_commit(lambda: invalidate_category_index(instance.user_id))
+
+
+@receiver(post_save, sender=Board)
+def reset_board_category_index(sender, instance: Board, **kwargs) -> None:
+    """Сбрасывает индексы категорий при удалении доски
+
+    Категории удаленной доски помечаются удаленными обновлением queryset без сигналов моделей.
+    """
+    if instance.is_deleted:
+        transaction.on_commit(lambda: invalidate_category_index(
+            *Category.objects.filter(board_id=instance.id).values_list('user_id', flat=True).distinct()
+        ))
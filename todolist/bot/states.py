@@ -0,0 +1,260 @@
+import random
+import string
+
+from django.conf import settings
+
+from bot import goal_pages
+from bot.cache import get_category_index, get_chat_cache
+from bot.models import TgUser, TgChatState
+from bot.sender import enqueue_message
+from goals.models import Category, Goal
+
+#: Максимальное количество кнопок клавиатуры выбора категории.
+#: Остальные категории выбираются отправкой названия
+CATEGORY_KEYBOARD_SIZE = 50
+
+
+class BaseStateClass:
+    """Базовый класс для классов состояний чата
+
+    Args:
+        tg_user: Telegram пользователь. Предоставляет доступ к атрибутам
+            пользователя.
+    """
+
+    def __init__(self, tg_user: TgUser):
+        self._tg_user = tg_user
+
+        #: str: Текст приветствия бота
+        self._text: str | None = None
+
+        #: list of string: Список разрешенных в чате команд
+        self._allowed_commands: list = [
+            '/start', '/goals', '/create', '/cancel'
+        ]
+
+        #: dict: Словарь с вариантами сообщений бота
+        self._messages = {
+            'allowed_commands': 'Для продолжения отправьте одну из команд:\n'
+                                '/goals - просмотреть все цели '
+                                '(фильтры: status=1..3, priority=1..4);\n'
+                                '/create - создать цель;\n'
+                                '/cancel - отменить создание цели.',
+            'unknown_command': '[unknown command]\n',
+            'goals_filters': '[unknown filter]\n'
+                             'Фильтры команды /goals: status=1..3, priority=1..4.\n'
+                             'Например: /goals status=2 priority=4',
+            'verification_required': 'Необходимо пройти верификацию.',
+            'select_category': 'Выберите категорию, в которой будет создана цель, '
+                               'или отправьте ее название.',
+            'goal_title': 'Отправьте название цели.',
+            'successful': '[successful]',
+            'failure': '[failure]',
+        }
+
+    @staticmethod
+    def __generate_verification_code(length: int = 16) -> str:
+        symbols = string.ascii_letters + string.digits
+        code = ''.join(random.sample(symbols, length))
+        return code
+
+    def get_verification_code(self) -> str:
+        """Возвращает строку из случайных чисел и букв
+
+        Returns:
+             str: последовательность из чисел и букв
+        """
+        code = self.__generate_verification_code()
+
+        tg_user = self._tg_user
+        tg_user.verification_code = code
+        tg_user.save(update_fields=('verification_code',))
+        return code
+
+    #: Сообщения отправляются через очередь с ограничением частоты (bot.sender)
+    def _send_message(self, text: str, reply_markup: dict | None = None) -> None:
+        enqueue_message(chat_id=self._tg_user.tg_id, text=text, reply_markup=reply_markup)
+
+    def run_actions(self) -> None:
+        """Выполняет характерные для определенного состояния действия"""
+
+        self._send_message(text=self._text)
+        self._send_message(text=self.get_verification_code())
+
+
+class NewState(BaseStateClass):
+    """Класс состояния чата: пользователь не известен
+
+    Args:
+        tg_user: Telegram пользователь. Предоставляет доступ к атрибутам
+            пользователя.
+    """
+
+    def __init__(self, tg_user: TgUser):
+        super().__init__(tg_user)
+
+        #: str: Текст приветствия бота
+        self._text = 'Привет! Я Telegram бот проекта \"TodoList\"\n' \
+                     + self._messages['verification_required']
+
+
+class NotVerifiedState(BaseStateClass):
+    """Класс состояния чата: пользователь не верифицирован
+
+    Args:
+        tg_user: Telegram пользователь. Предоставляет доступ к атрибутам
+            пользователя.
+    """
+
+    def __init__(self, tg_user: TgUser):
+        super().__init__(tg_user)
+
+        #: str: Текст приветствия бота
+        self._text = 'С возвращением!\n' + self._messages[
+            'verification_required']
+
+
+class VerifiedState(BaseStateClass):
+    """Класс состояния чата: пользователь прошел верификацию
+
+    Args:
+        tg_user: Telegram пользователь. Предоставляет доступ к атрибутам
+            пользователя.
+        chat_msg (str): текст сообщения
+        chat_state: состояние чата из кэша. Если не передано - загружается из базы данных
+        callback_data (str): данные нажатой кнопки встроенной клавиатуры
+    """
+
+    #: Префикс данных кнопок выбора категории
+    category_callback_prefix = 'category:'
+
+    def __init__(self, tg_user: TgUser, chat_msg: str = None, chat_state: TgChatState | None = None,
+                 callback_data: str | None = None):
+        super().__init__(tg_user)
+        self.__chat_msg = chat_msg
+        self.__callback_data = callback_data
+        if chat_state is None:
+            chat_state, created = TgChatState.objects.get_or_create(tg_user=tg_user)
+            if not created:
+                chat_state.tg_user = tg_user
+                get_chat_cache().set(chat_state)
+        self.__chat_state = chat_state
+
+    def run_actions(self) -> None:
+        """Выполняет характерные для определенного состояния действия"""
+
+        #: bool: Флаг выполнения команды /create
+        is_create_command = self.__chat_state.is_create_command
+
+        if self.__chat_msg == '/create':
+            self.__chat_state.is_create_command = True
+            self.__chat_state.category = None
+            self.__chat_state.save(update_fields=('is_create_command', 'category',))
+            self._send_categories()
+
+        elif not is_create_command:
+            command = self.__chat_msg.split(maxsplit=1)[0] if self.__chat_msg else None
+
+            if self.__callback_data and self.__callback_data.startswith(goal_pages.CALLBACK_PREFIX):
+                try:
+                    self._send_goals(goal_pages.GoalsQuery.from_callback(self.__callback_data))
+                except ValueError:
+                    self._send_message(text=self._messages['allowed_commands'])
+
+            elif command not in self._allowed_commands:
+                self._send_message(
+                    text=self._messages['unknown_command'] + self._messages[
+                        'allowed_commands'])
+
+            elif command == '/start':
+                self._send_message(text=self._messages['allowed_commands'])
+
+            elif command == '/goals':
+                try:
+                    self._send_goals(goal_pages.GoalsQuery.from_command(self.__chat_msg))
+                except ValueError:
+                    self._send_message(text=self._messages['goals_filters'])
+
+        elif self.__chat_msg == '/cancel':
+            self.__chat_state.set_default()
+            self._send_message(text=self._messages['successful'])
+
+        elif not self.__chat_state.category_id:
+            category_id = self._select_category()
+            if category_id is None:
+                self._send_categories()
+            else:
+                self.__chat_state.category_id = category_id
+                self.__chat_state.save(update_fields=('category_id',))
+                self._send_message(text=self._messages['goal_title'])
+
+        elif not self.__chat_msg:
+            self._send_message(text=self._messages['goal_title'])
+
+        elif not self._category_exists(self.__chat_state.category_id):
+            #: Категория удалена после выбора - выбор повторяется
+            self.__chat_state.category_id = None
+            self.__chat_state.save(update_fields=('category_id',))
+            self._send_categories()
+
+        else:
+            goal = Goal.objects.create(
+                user_id=self._tg_user.user_id,
+                category_id=self.__chat_state.category_id,
+                title=self.__chat_msg
+            )
+            if goal.id:
+                self.__chat_state.set_default()
+                self._send_message(text=self._messages['successful'])
+            else:
+                self._send_message(text=self._messages['failure'])
+
+    def _send_goals(self, query: goal_pages.GoalsQuery) -> None:
+        """Отправляет страницу списка целей с кнопками перехода по страницам"""
+        text, reply_markup = goal_pages.get_goals_page(
+            user_id=self._tg_user.user_id, query=query, size=settings.TG_GOALS_PAGE_SIZE
+        )
+        self._send_message(text=text, reply_markup=reply_markup)
+
+    def _select_category(self) -> int | None:
+        """Возвращает идентификатор выбранной категории
+
+        Категория выбирается кнопкой встроенной клавиатуры или названием по индексу
+        категорий пользователя и проверяется по базе данных: индекс в кэше может
+        содержать категории, удаленные в другом процессе.
+
+        Returns:
+            идентификатор категории или None, если категория не найдена
+        """
+        index = get_category_index(self._tg_user.user_id)
+
+        if self.__callback_data:
+            category_id = self.__callback_data.removeprefix(self.category_callback_prefix)
+            category_id = int(category_id) if category_id.isdigit() and int(category_id) in index.ids else None
+        else:
+            category_id = index.titles.get(self.__chat_msg)
+
+        if category_id is None or not self._category_exists(category_id):
+            return None
+        return category_id
+
+    def _category_exists(self, category_id: int) -> bool:
+        """Проверяет, что категория пользователя и ее доска не удалены"""
+        return Category.objects.filter(
+            id=category_id, user_id=self._tg_user.user_id, is_deleted=False, board__is_deleted=False
+        ).exists()
+
+    def _send_categories(self) -> None:
+        """Отправляет клавиатуру выбора категории"""
+        index = get_category_index(self._tg_user.user_id)
+        if not index.items:
+            self._send_message(text='[categories not found]')
+            return
+
+        self._send_message(
+            text=self._messages['select_category'],
+            reply_markup={'inline_keyboard': [
+                [{'text': title, 'callback_data': f'{self.category_callback_prefix}{category_id}'}]
+                for category_id, title in index.items[:CATEGORY_KEYBOARD_SIZE]
+            ]}
+        )
@@ -1,10 +1,31 @@
+import json
+import threading
+import time
+
 import requests
 from requests import exceptions
+from requests.adapters import HTTPAdapter
+
+from bot.tg.dc import AnswerCallbackQueryResponse, GetUpdatesResponse, SendMessageResponse, SetWebhookResponse
+
+#: Общий для процесса пул соединений к Telegram API (keep-alive)
+POOL_MAXSIZE = 10
+_adapter = HTTPAdapter(pool_connections=1, pool_maxsize=POOL_MAXSIZE)
+
+#: Сессии requests не потокобезопасны, поэтому у каждого потока своя сессия с общим пулом соединений
+_local = threading.local()
 
-from bot.tg.dc import (
-    GetUpdatesResponse, SendMessageResponse,
-    SendMessageResponseSchema, GetUpdatesResponseSchema
-)
+
+def get_session() -> requests.Session:
+    """Возвращает сессию requests текущего потока, использующую общий пул соединений
+
+    Returns:
+        requests.Session
+    """
+    if (session := getattr(_local, 'session', None)) is None:
+        session = _local.session = requests.Session()
+        session.mount('https://', _adapter)
+    return session
 
 
 class TgClient:
@@ -12,9 +33,22 @@ class TgClient:
 
     Args:
         token (str): токен для доступа к Telegram API
+        connect_timeout (float): таймаут установки соединения в секундах
+        read_timeout (float): таймаут ожидания ответа в секундах (для getUpdates
+            добавляется к таймауту long polling)
+        retries (int): количество повторов запроса при ошибке соединения,
+            ответе 429 (Too Many Requests) или 5xx. Неидемпотентные методы (sendMessage)
+            не повторяются при таймауте ожидания ответа: запрос мог быть уже выполнен
+        backoff (float): начальная задержка между повторами в секундах, удваивается с каждой попыткой.
+            Для ответа 429 используется значение retry_after из ответа API
     """
-    def __init__(self, token: str):
+    def __init__(self, token: str, connect_timeout: float = 5, read_timeout: float = 10,
+                 retries: int = 3, backoff: float = 0.5):
         self.token = token
+        self.connect_timeout = connect_timeout
+        self.read_timeout = read_timeout
+        self.retries = retries
+        self.backoff = backoff
 
     def get_url(self, method: str) -> str:
         """Возвращает URL для доступа к Telegram API
@@ -38,18 +72,14 @@ class TgClient:
         Returns:
              массив объектов класса Update, содержащий атрибуты принятого сообщения
         """
-        url = self.get_url(method='getUpdates')
-        try:
-            response = requests.get(
-                url=url,
-                params={'offset': offset, 'timeout': timeout}
-            )
-        except exceptions.RequestException:
-            raise exceptions.RequestException
-        else:
-            return GetUpdatesResponseSchema.load(response.json())
-
-    def send_message(self, chat_id: int, text: str) -> SendMessageResponse:
+        data = self._request(
+            method='getUpdates',
+            params={'offset': offset, 'timeout': timeout},
+            read_timeout=timeout + self.read_timeout
+        )
+        return GetUpdatesResponse.from_dict(data)
+
+    def send_message(self, chat_id: int, text: str, reply_markup: dict | None = None) -> SendMessageResponse:
         """Реализует метод 'sendMessage' API
 
         Для отправки сообщения участникам чата
@@ -57,16 +87,87 @@ class TgClient:
         Args:
             chat_id (int): идентификатор чата или имя пользователя целевого чата
             text (str): текст сообщения
+            reply_markup (dict): клавиатура сообщения (например, {'inline_keyboard': [[...]]})
         Returns:
              объект класса Message, содержащий атрибуты отправленного сообщения
         """
-        url = self.get_url(method='sendMessage')
+        params = {'chat_id': chat_id, 'text': text}
+        if reply_markup:
+            params['reply_markup'] = json.dumps(reply_markup)
+        data = self._request(method='sendMessage', params=params, idempotent=False)
+        return SendMessageResponse.from_dict(data)
+
+    def answer_callback_query(self, callback_query_id: str) -> AnswerCallbackQueryResponse:
+        """Реализует метод 'answerCallbackQuery' API
+
+        Для подтверждения нажатия кнопки встроенной клавиатуры
+
+        Args:
+            callback_query_id (str): идентификатор запроса обратного вызова
+        Returns:
+             объект класса AnswerCallbackQueryResponse
+        """
+        data = self._request(method='answerCallbackQuery', params={'callback_query_id': callback_query_id})
+        return AnswerCallbackQueryResponse.from_dict(data)
+
+    def set_webhook(self, url: str, secret_token: str, max_connections: int = 40) -> SetWebhookResponse:
+        """Реализует метод 'setWebhook' API
+
+        Для получения входящих обновлений через HTTPS запросы на указанный URL
+
+        Args:
+            url (str): HTTPS URL эндпоинта приема обновлений
+            secret_token (str): значение заголовка X-Telegram-Bot-Api-Secret-Token в запросах Telegram
+            max_connections (int): максимальное количество одновременных запросов к эндпоинту
+        Returns:
+             объект класса SetWebhookResponse
+        """
+        data = self._request(
+            method='setWebhook',
+            params={'url': url, 'secret_token': secret_token, 'max_connections': max_connections}
+        )
+        return SetWebhookResponse.from_dict(data)
+
+    def delete_webhook(self) -> SetWebhookResponse:
+        """Реализует метод 'deleteWebhook' API
+
+        Для возврата к получению обновлений методом 'getUpdates'
+
+        Returns:
+             объект класса SetWebhookResponse
+        """
+        return SetWebhookResponse.from_dict(self._request(method='deleteWebhook', params={}))
+
+    def _request(self, method: str, params: dict, read_timeout: float | None = None,
+                 idempotent: bool = True) -> dict:
+        url = self.get_url(method=method)
+        timeout = (self.connect_timeout, read_timeout or self.read_timeout)
+        #: ConnectTimeout является подклассом ConnectionError, ReadTimeout - нет
+        retryable = (exceptions.ConnectionError, exceptions.Timeout) if idempotent else exceptions.ConnectionError
+
+        for attempt in range(self.retries + 1):
+            delay = self.backoff * 2 ** attempt
+            try:
+                response = get_session().get(url=url, params=params, timeout=timeout)
+            except retryable as error:
+                if attempt == self.retries:
+                    raise exceptions.RequestException(f'{method} failed after {attempt + 1} attempts') from error
+            except exceptions.RequestException as error:
+                raise exceptions.RequestException(f'{method} failed') from error
+            else:
+                if attempt == self.retries or not self._is_retryable(response):
+                    return response.json()
+                if response.status_code == 429:
+                    delay = self._get_retry_after(response) or delay
+            time.sleep(delay)
+
+    @staticmethod
+    def _is_retryable(response: requests.Response) -> bool:
+        return response.status_code == 429 or response.status_code >= 500
+
+    @staticmethod
+    def _get_retry_after(response: requests.Response) -> float | None:
         try:
-            response = requests.get(
-                url=url,
-                params={'chat_id': chat_id, 'text': text}
-            )
-        except exceptions.RequestException:
-            raise exceptions.RequestException
-        else:
-            return SendMessageResponseSchema.load(response.json())
+            return float(response.json()['parameters']['retry_after'])
+        except (ValueError, KeyError, TypeError):
+            return None
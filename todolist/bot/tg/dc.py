@@ -1,10 +1,12 @@
-from dataclasses import dataclass, field
-from dataclasses_json import dataclass_json, config, Undefined
+from dataclasses import dataclass
 from typing import Optional
 
+# Объекты создаются из JSON ответов API методом from_dict: поля читаются напрямую из словаря,
+# без промежуточных схем, неизвестные поля игнорируются. Типы значений не проверяются,
+# при отсутствии обязательного поля возбуждается KeyError.
 
-@dataclass_json(undefined=Undefined.EXCLUDE)
-@dataclass
+
+@dataclass(slots=True)
 class MessageFrom:
     """Отправитель сообщения"""
 
@@ -17,9 +19,16 @@ class MessageFrom:
     is_premium: Optional[bool] = None
     added_to_attachment_menu: Optional[bool] = None
 
+    @classmethod
+    def from_dict(cls, data: dict) -> 'MessageFrom':
+        get = data.get
+        return cls(
+            data['id'], data['is_bot'], data['first_name'], get('last_name'), get('username'),
+            get('language_code'), get('is_premium'), get('added_to_attachment_menu')
+        )
+
 
-@dataclass_json(undefined=Undefined.EXCLUDE)
-@dataclass
+@dataclass(slots=True)
 class Chat:
     """Чат"""
 
@@ -30,46 +39,116 @@ class Chat:
     first_name: Optional[str] = None
     last_name: Optional[str] = None
 
+    @classmethod
+    def from_dict(cls, data: dict) -> 'Chat':
+        get = data.get
+        return cls(data['id'], data['type'], get('title'), get('username'), get('first_name'), get('last_name'))
+
 
-@dataclass_json(undefined=Undefined.EXCLUDE)
-@dataclass
+@dataclass(slots=True)
 class Message:
     """Сообщение"""
 
     message_id: int
-    message_from: MessageFrom = field(metadata=config(field_name='from'))
+    message_from: MessageFrom
     date: int
     chat: Chat
     text: Optional[str] = None
 
+    @classmethod
+    def from_dict(cls, data: dict) -> 'Message':
+        return cls(
+            data['message_id'], MessageFrom.from_dict(data['from']), data['date'],
+            Chat.from_dict(data['chat']), data.get('text')
+        )
+
+
+@dataclass(slots=True)
+class CallbackQuery:
+    """Нажатие кнопки встроенной клавиатуры
 
-@dataclass_json(undefined=Undefined.EXCLUDE)
-@dataclass
+    Из сообщения с клавиатурой используется только идентификатор чата.
+    """
+
+    id: str
+    message_from: MessageFrom
+    chat_id: int
+    data: Optional[str] = None
+
+    @classmethod
+    def from_dict(cls, data: dict) -> 'CallbackQuery':
+        message_from = MessageFrom.from_dict(data['from'])
+        message = data.get('message')
+        return cls(
+            data['id'], message_from, message['chat']['id'] if message else message_from.id, data.get('data')
+        )
+
+
+@dataclass(slots=True)
 class Update:
     """Входящее обновление"""
 
     update_id: int
     message: Optional[Message] = None
+    callback_query: Optional[CallbackQuery] = None
     edited_message: Optional[Message] = None
 
+    @classmethod
+    def from_dict(cls, data: dict) -> 'Update':
+        message = data.get('message')
+        callback_query = data.get('callback_query')
+        edited_message = data.get('edited_message')
+        return cls(
+            data['update_id'], Message.from_dict(message) if message is not None else None,
+            CallbackQuery.from_dict(callback_query) if callback_query is not None else None,
+            Message.from_dict(edited_message) if edited_message is not None else None,
+        )
+
 
-@dataclass_json(undefined=Undefined.EXCLUDE)
-@dataclass
+@dataclass(slots=True)
 class GetUpdatesResponse:
     """Ответ API на метод 'getUpdates'"""
 
     ok: bool
     result: list[Update]
 
+    @classmethod
+    def from_dict(cls, data: dict) -> 'GetUpdatesResponse':
+        return cls(data['ok'], [Update.from_dict(item) for item in data['result']])
 
-@dataclass_json(undefined=Undefined.EXCLUDE)
-@dataclass
+
+@dataclass(slots=True)
 class SendMessageResponse:
     """Ответ API на метод 'sendMessage'"""
 
     ok: bool
     result: Message
 
+    @classmethod
+    def from_dict(cls, data: dict) -> 'SendMessageResponse':
+        return cls(data['ok'], Message.from_dict(data['result']))
+
+
+@dataclass(slots=True)
+class SetWebhookResponse:
+    """Ответ API на методы 'setWebhook' и 'deleteWebhook'"""
+
+    ok: bool
+    result: Optional[bool] = None
+    description: Optional[str] = None
+
+    @classmethod
+    def from_dict(cls, data: dict) -> 'SetWebhookResponse':
+        return cls(data['ok'], data.get('result'), data.get('description'))
+
+
+@dataclass(slots=True)
+class AnswerCallbackQueryResponse:
+    """Ответ API на метод 'answerCallbackQuery'"""
+
+    ok: bool
+    result: Optional[bool] = None
 
-GetUpdatesResponseSchema = GetUpdatesResponse.schema()
-SendMessageResponseSchema = SendMessageResponse.schema()
+    @classmethod
+    def from_dict(cls, data: dict) -> 'AnswerCallbackQueryResponse':
+        return cls(data['ok'], data.get('result'))
@@ -0,0 +1,123 @@
+import logging
+import threading
+import time
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import close_old_connections, connection, transaction
+from django.utils import timezone
+
+from bot.chat import process_message
+from bot.dispatcher import ChatDispatcher
+from bot.models import TgUpdate
+from bot.tg.dc import Update
+
+
+def store_update(update: Update, data: dict) -> None:
+    """Сохраняет обновление, принятое через webhook, для обработки фоновым обработчиком
+
+    Повторно доставленное обновление (с тем же update_id) не сохраняется.
+
+    Args:
+        update: объект класса Update
+        data (dict): JSON обновления
+    """
+    chat_id = update.message.chat.id if update.message else update.callback_query.chat_id
+    TgUpdate.objects.bulk_create(
+        [TgUpdate(update_id=update.update_id, chat_id=chat_id, data=data)], ignore_conflicts=True
+    )
+
+
+class UpdateProcessor:
+    """Фоновый обработчик обновлений Telegram, сохраненных webhook (TgUpdate)
+
+    Обновления захватываются в порядке update_id (SELECT ... FOR UPDATE SKIP LOCKED и статус processing)
+    и распределяются по потокам ChatDispatcher: обновления одного чата обрабатываются по порядку.
+    Порядок сохраняется в пределах процесса, поэтому обработчик должен быть запущен в единственном
+    экземпляре. Раз в cleanup_interval секунд в очередь возвращаются обновления, захваченные дольше
+    settings.TG_SEND_CLAIM_TIMEOUT секунд назад (обработчик завершился аварийно), и удаляются
+    обработанные обновления старше settings.TG_MESSAGE_RETENTION секунд.
+
+    Args:
+        workers (int): количество потоков-обработчиков
+        batch_size (int): количество обновлений, выбираемых из очереди за проход
+        poll_interval (float): интервал опроса очереди в секундах при отсутствии обновлений
+        cleanup_interval (float): интервал очистки очереди в секундах
+    """
+
+    def __init__(self, workers: int = 1, batch_size: int = 100, poll_interval: float = 1,
+                 cleanup_interval: float = 60):
+        self.dispatcher = ChatDispatcher(handler=self.process, workers=workers)
+        self.batch_size = batch_size
+        self.poll_interval = poll_interval
+        self.cleanup_interval = cleanup_interval
+        self.logger = logging.getLogger(__name__)
+
+        self.__stop = threading.Event()
+
+    def stop(self) -> None:
+        """Останавливает обработку"""
+        self.__stop.set()
+
+    def run(self) -> None:
+        """Обрабатывает обновления до вызова stop()"""
+        self.dispatcher.start()
+        cleanup_time = None
+        try:
+            while not self.__stop.is_set():
+                try:
+                    if cleanup_time is None or time.monotonic() - cleanup_time >= self.cleanup_interval:
+                        cleanup_time = time.monotonic()
+                        self.cleanup()
+                    claimed = self.run_once()
+                finally:
+                    close_old_connections()
+
+                if not claimed:
+                    self.__stop.wait(self.poll_interval)
+        finally:
+            self.dispatcher.stop()
+            connection.close()
+
+    def run_once(self) -> int:
+        """Захватывает обновления очереди и передает их потокам-обработчикам
+
+        Returns:
+            int: количество захваченных обновлений
+        """
+        with transaction.atomic():
+            updates = list(
+                TgUpdate.objects.filter(status=TgUpdate.Status.pending)
+                .select_for_update(skip_locked=True).order_by('update_id')[:self.batch_size]
+            )
+            if updates:
+                TgUpdate.objects.filter(id__in=[update.id for update in updates]).update(
+                    status=TgUpdate.Status.processing, claimed=timezone.now()
+                )
+
+        for update in updates:
+            self.dispatcher.put(chat_id=update.chat_id, message=update)
+        return len(updates)
+
+    def process(self, update: TgUpdate) -> None:
+        """Обрабатывает обновление и сохраняет результат"""
+        status = TgUpdate.Status.processed
+        try:
+            data = Update.from_dict(update.data)
+            process_message(data.message or data.callback_query)
+        except Exception:
+            status = TgUpdate.Status.failed
+            self.logger.exception('Update %s processing failed', update.update_id)
+        TgUpdate.objects.filter(id=update.id).update(status=status, claimed=None)
+
+    def cleanup(self) -> None:
+        """Возвращает в очередь зависшие захваченные обновления и удаляет устаревшие обработанные"""
+        now = timezone.now()
+        TgUpdate.objects.filter(
+            status=TgUpdate.Status.processing, claimed__lt=now - timedelta(seconds=settings.TG_SEND_CLAIM_TIMEOUT)
+        ).update(status=TgUpdate.Status.pending, claimed=None)
+        if settings.TG_MESSAGE_RETENTION:
+            TgUpdate.objects.filter(
+                status__in=(TgUpdate.Status.processed, TgUpdate.Status.failed),
+                created__lt=now - timedelta(seconds=settings.TG_MESSAGE_RETENTION),
+            ).delete()
@@ -4,4 +4,5 @@ from bot import views
 
 urlpatterns = [
     path('verify', views.TgUserUpdateView.as_view(), name='update-tguser'),
+    path('webhook', views.TgWebhookView.as_view(), name='tg-webhook'),
 ]
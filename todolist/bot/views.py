@@ -1,9 +1,17 @@
-from rest_framework import permissions, generics, mixins
+import hmac
+import time
+
+from django.conf import settings
+from rest_framework import permissions, generics, mixins, exceptions, status
+from rest_framework.response import Response
+from rest_framework.views import APIView
 
 from bot.models import TgUser
+from bot.sender import enqueue_message
 from bot.serializers import TgUserSerializer
-from bot.tg.client import TgClient
-from todolist import settings
+from bot.tg.dc import Update
+from bot.updates import store_update
+from todolist.metrics import BOT_UPDATE_LAG
 
 
 class TgUserUpdateView(mixins.UpdateModelMixin, generics.GenericAPIView):
@@ -32,7 +40,54 @@ class TgUserUpdateView(mixins.UpdateModelMixin, generics.GenericAPIView):
     #: Переопределяем метод для реализации отправки сообщения об удачной верификации Telegram пользователя
     def perform_update(self, serializer):
         tg_user: TgUser = serializer.save()
-        TgClient(token=settings.TG_TOKEN).send_message(
+        enqueue_message(
             chat_id=tg_user.tg_id,
             text='[verification was successful]'
         )
+
+
+class TgWebhookView(APIView):
+    """Представление для обработки запросов на эндпоинт POST: /bot/webhook
+
+    Прием обновлений Telegram в режиме webhook. Запрос проверяется по секретному токену
+    (settings.TG_WEBHOOK_SECRET), обновление сохраняется в базе данных (TgUpdate) для обработки
+    командой runupdates и ответ возвращается сразу, не дожидаясь обработки. Если обновление
+    не удалось сохранить, Telegram получает ответ 5xx и доставляет его повторно.
+    """
+
+    authentication_classes = []
+    permission_classes = [permissions.AllowAny]
+
+    #: Заголовок с секретным токеном, заданным при регистрации webhook
+    secret_header = 'HTTP_X_TELEGRAM_BOT_API_SECRET_TOKEN'
+
+    def post(self, request, *args, **kwargs):
+        if not settings.TG_WEBHOOK_SECRET:
+            raise exceptions.NotFound
+
+        if not hmac.compare_digest(
+            request.META.get(self.secret_header, '').encode(), settings.TG_WEBHOOK_SECRET.encode()
+        ):
+            raise exceptions.PermissionDenied
+
+        try:
+            update = Update.from_dict(request.data)
+        except (KeyError, TypeError, AttributeError):
+            raise exceptions.ValidationError('Invalid update')
+
+        if not update.message and not update.callback_query:
+            #: Остальные типы обновлений ботом не обрабатываются
+            return Response(status=status.HTTP_200_OK)
+
+        store_update(update, request.data)
+        if update.message:
+            BOT_UPDATE_LAG.observe(time.time() - update.message.date, source='webhook')
+
+        if callback_query := update.callback_query:
+            #: Нажатие кнопки подтверждается ответом на запрос webhook, без отдельного запроса к API
+            return Response(
+                {'method': 'answerCallbackQuery', 'callback_query_id': callback_query.id},
+                status=status.HTTP_200_OK
+            )
+
+        return Response(status=status.HTTP_200_OK)
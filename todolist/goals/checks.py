@@ -0,0 +1,47 @@
+from django.conf import settings
+from django.core import checks
+
+#: Бэкенды кэша, хранящие данные в памяти процесса (сброс кэша не доходит до других процессов)
+LOCAL_CACHE_BACKENDS = (
+    'django.core.cache.backends.locmem.LocMemCache',
+    'django.core.cache.backends.dummy.DummyCache',
+)
+
+
+def is_local_cache(alias: str) -> bool:
+    """Проверяет, что кэш CACHES с именем alias не является общим для процессов"""
+    return settings.CACHES.get(alias, {}).get('BACKEND') in LOCAL_CACHE_BACKENDS
+
+
+def check_shared_cache(cache_settings: dict[str, str], error_id: str) -> list[checks.Error]:
+    """Возвращает ошибки для включенных настроек кэширования, использующих кэш процесса
+
+    В режиме DEBUG (один процесс runserver) кэш процесса допустим.
+
+    Args:
+        cache_settings (dict): {имя включенной настройки: имя кэша в CACHES}
+        error_id (str): идентификатор ошибки
+    Returns:
+        list: ошибки проверки
+    """
+    if settings.DEBUG:
+        return []
+    return [
+        checks.Error(
+            f'{name} requires a cache shared between processes, but CACHES["{alias}"] is local to the process',
+            hint='Set CACHE_URL (Redis) or disable the setting.',
+            id=error_id,
+        )
+        for name, alias in cache_settings.items() if is_local_cache(alias)
+    ]
+
+
+@checks.register(checks.Tags.caches)
+def check_goals_caches(app_configs, **kwargs) -> list[checks.Error]:
+    """Кэш ролей участников и кэш ответов списков сбрасываются из любого процесса API"""
+    cache_settings = {}
+    if settings.BOARD_ROLE_CACHE_TIMEOUT:
+        cache_settings['BOARD_ROLE_CACHE_TIMEOUT'] = 'default'
+    if settings.LIST_CACHE_TIMEOUT:
+        cache_settings['LIST_CACHE_TIMEOUT'] = settings.LIST_CACHE
+    return check_shared_cache(cache_settings, error_id='goals.E001')
@@ -0,0 +1,131 @@
+import logging
+import threading
+from datetime import timedelta
+
+from django.db import close_old_connections, connection, transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from goals.list_cache import invalidate_boards
+from goals.models import Board, Category, DeletionJob, Goal
+
+
+def schedule_board_deletion(board: Board, user) -> DeletionJob:
+    """Скрывает доску и ставит в очередь удаление ее категорий и архивацию целей"""
+    with transaction.atomic():
+        board.is_deleted = True
+        board.save(update_fields=('is_deleted',))
+        return DeletionJob.objects.create(user=user, board=board)
+
+
+def schedule_category_deletion(category: Category, user) -> DeletionJob:
+    """Скрывает категорию и ставит в очередь архивацию ее целей"""
+    with transaction.atomic():
+        category.is_deleted = True
+        category.save(update_fields=('is_deleted',))
+        return DeletionJob.objects.create(user=user, category=category)
+
+
+class DeletionWorker:
+    """Фоновый обработчик задач удаления DeletionJob
+
+    Каждый пакет (не более batch_size категорий или целей) изменяется в отдельной короткой
+    транзакции, а прогресс задачи сохраняется после пакета. Задача, не обновлявшаяся дольше
+    lease секунд (обработчик остановлен во время выполнения), выполняется повторно - обработка
+    идемпотентна, поэтому допускается запуск нескольких обработчиков.
+
+    Args:
+        batch_size (int): количество объектов, изменяемых в одной транзакции
+        poll_interval (float): интервал опроса очереди в секундах при отсутствии задач
+        lease (float): время в секундах, после которого выполняющаяся задача считается прерванной
+    """
+
+    def __init__(self, batch_size: int = 500, poll_interval: float = 1, lease: float = 300):
+        self.batch_size = batch_size
+        self.poll_interval = poll_interval
+        self.lease = lease
+        self.logger = logging.getLogger(__name__)
+
+        self.__stop = threading.Event()
+
+    def stop(self) -> None:
+        """Останавливает обработку после текущего пакета"""
+        self.__stop.set()
+
+    def run(self) -> None:
+        """Обрабатывает задачи до вызова stop()"""
+        try:
+            while not self.__stop.is_set():
+                try:
+                    processed = self.run_once()
+                finally:
+                    close_old_connections()
+
+                if not processed:
+                    self.__stop.wait(self.poll_interval)
+        finally:
+            connection.close()
+
+    def run_once(self) -> bool:
+        """Выполняет одну задачу из очереди
+
+        Returns:
+            bool: задача найдена
+        """
+        if (job := self.claim()) is None:
+            return False
+
+        try:
+            self.process(job)
+        except Exception as error:
+            self.logger.exception('Deletion job %s failed', job.id)
+            job.status, job.error = DeletionJob.Status.failed, str(error)
+            job.save(update_fields=('status', 'error', 'updated',))
+        return True
+
+    def claim(self) -> DeletionJob | None:
+        """Забирает задачу из очереди (задачи, заблокированные другими обработчиками, пропускаются)"""
+        expired = timezone.now() - timedelta(seconds=self.lease)
+        with transaction.atomic():
+            job = DeletionJob.objects.filter(
+                Q(status=DeletionJob.Status.pending) | Q(status=DeletionJob.Status.running, updated__lt=expired)
+            ).select_for_update(skip_locked=True).order_by('id').first()
+            if job is not None:
+                job.status = DeletionJob.Status.running
+                job.save(update_fields=('status', 'updated',))
+        return job
+
+    def process(self, job: DeletionJob) -> None:
+        """Помечает удаленными категории доски и архивирует цели пакетами по batch_size"""
+        if job.board_id is not None:
+            categories = Category.objects.filter(board_id=job.board_id, is_deleted=False)
+            goals = Goal.objects.filter(board_id=job.board_id)
+        else:
+            categories = Category.objects.none()
+            goals = Goal.objects.filter(category_id=job.category_id)
+        goals = goals.exclude(status=Goal.Status.archived)
+
+        for queryset in (categories, goals):
+            while not self.__stop.is_set():
+                ids = list(queryset.order_by('id').values_list('id', flat=True)[:self.batch_size])
+                if not ids:
+                    break
+                with transaction.atomic():
+                    if queryset.model is Category:
+                        #: Обновление queryset не отправляет сигналы моделей - кэш ответов списков сбрасывается явно
+                        Category.objects.filter(id__in=ids).update(is_deleted=True, updated=timezone.now())
+                        invalidate_boards(job.board_id)
+                    else:
+                        Goal.objects.filter(id__in=ids).archive()
+                    job.processed += len(ids)
+                    job.save(update_fields=('processed', 'updated',))
+
+        if self.__stop.is_set():
+            #: Остановленная задача возвращается в очередь
+            job.status = DeletionJob.Status.pending
+            job.save(update_fields=('status', 'updated',))
+            return
+
+        job.status = DeletionJob.Status.done
+        job.save(update_fields=('status', 'updated',))
+        self.logger.info('Deletion job %s done: %s objects', job.id, job.processed)
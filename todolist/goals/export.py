@@ -0,0 +1,131 @@
+import csv
+import zlib
+from collections.abc import Iterator
+from datetime import date
+
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import connection, transaction
+
+from goals.models import Board, BoardParticipant, Category, Comment, Goal
+
+#: Форматы экспорта: тип содержимого и расширение файла
+EXPORT_FORMATS = {
+    'ndjson': ('application/x-ndjson', 'ndjson'),
+    'csv': ('text/csv; charset=utf-8', 'csv'),
+}
+
+#: Поля записей экспорта по типам (в порядке выгрузки)
+RECORD_FIELDS = {
+    'board': ('id', 'title', 'created', 'updated'),
+    'participant': ('user', 'role'),
+    'category': ('id', 'user', 'title', 'is_deleted', 'created', 'updated'),
+    'goal': ('id', 'category', 'user', 'title', 'description', 'status', 'priority', 'due_date', 'created', 'updated'),
+    'comment': ('id', 'goal', 'user', 'text', 'created', 'updated'),
+}
+
+#: Заголовок CSV: тип записи и объединение полей всех типов
+CSV_HEADER = ('type', *dict.fromkeys(name for fields in RECORD_FIELDS.values() for name in fields))
+
+#: Размер блока данных, передаваемого клиенту (байты)
+BUFFER_SIZE = 64 * 1024
+
+
+def iter_board_export(board_id: int, file_format: str, compress: bool = False,
+                      chunk_size: int = 2000) -> Iterator[bytes]:
+    """Возвращает итератор содержимого файла экспорта доски
+
+    Файл содержит доску, участников, категории, цели и комментарии доски.
+    Таблицы читаются в одной транзакции REPEATABLE READ, поэтому файл является согласованным
+    снимком доски (без комментариев к целям, созданным во время выгрузки).
+    Строки каждой таблицы читаются серверным курсором блоками по chunk_size,
+    а данные передаются клиенту блоками по BUFFER_SIZE байт, поэтому объем памяти
+    не зависит от размера доски.
+
+    Args:
+        board_id (int): идентификатор доски
+        file_format (str): формат файла (EXPORT_FORMATS)
+        compress (bool): сжатие gzip
+        chunk_size (int): количество строк, читаемых из базы данных за один раз
+    Returns:
+        итератор блоков файла
+    """
+    lines = _iter_csv(board_id, chunk_size) if file_format == 'csv' else _iter_ndjson(board_id, chunk_size)
+    chunks = _iter_buffered(lines)
+    return _iter_gzip(chunks) if compress else chunks
+
+
+def _iter_records(board_id: int, chunk_size: int) -> Iterator[tuple[str, tuple]]:
+    #: Автор и участник выгружаются по имени пользователя - идентификаторы пользователей не переносимы
+    querysets = {
+        'board': Board.objects.filter(id=board_id).values_list('id', 'title', 'created', 'updated'),
+        'participant': BoardParticipant.objects.filter(board_id=board_id).values_list(
+            'user__username', 'role'
+        ).order_by('id'),
+        'category': Category.objects.filter(board_id=board_id).values_list(
+            'id', 'user__username', 'title', 'is_deleted', 'created', 'updated'
+        ).order_by('id'),
+        'goal': Goal.objects.filter(board_id=board_id).values_list(
+            'id', 'category_id', 'user__username', 'title', 'description', 'status', 'priority', 'due_date',
+            'created', 'updated'
+        ).order_by('id'),
+        'comment': Comment.objects.filter(board_id=board_id).values_list(
+            'id', 'goal_id', 'user__username', 'text', 'created', 'updated'
+        ).order_by('id'),
+    }
+    #: Уровень изоляции задается только для собственной транзакции (не для вложенного atomic блока)
+    snapshot = not connection.in_atomic_block
+    with transaction.atomic(savepoint=False):
+        if snapshot:
+            with connection.cursor() as cursor:
+                cursor.execute('SET TRANSACTION ISOLATION LEVEL REPEATABLE READ READ ONLY')
+        for record_type, queryset in querysets.items():
+            for row in queryset.iterator(chunk_size=chunk_size):
+                yield record_type, row
+
+
+def _iter_ndjson(board_id: int, chunk_size: int) -> Iterator[str]:
+    encoder = DjangoJSONEncoder(ensure_ascii=False)
+    for record_type, row in _iter_records(board_id, chunk_size):
+        yield encoder.encode({'type': record_type, **dict(zip(RECORD_FIELDS[record_type], row))}) + '\n'
+
+
+def _iter_csv(board_id: int, chunk_size: int) -> Iterator[str]:
+    writer = csv.writer(_Echo())
+    encoder = DjangoJSONEncoder()
+    positions = {name: position for position, name in enumerate(CSV_HEADER)}
+
+    yield writer.writerow(CSV_HEADER)
+    for record_type, row in _iter_records(board_id, chunk_size):
+        values = [''] * len(CSV_HEADER)
+        values[0] = record_type
+        for name, value in zip(RECORD_FIELDS[record_type], row):
+            values[positions[name]] = encoder.default(value) if isinstance(value, date) else value
+        yield writer.writerow(values)
+
+
+def _iter_buffered(lines: Iterator[str]) -> Iterator[bytes]:
+    buffer, size = [], 0
+    for line in lines:
+        data = line.encode()
+        buffer.append(data)
+        size += len(data)
+        if size >= BUFFER_SIZE:
+            yield b''.join(buffer)
+            buffer, size = [], 0
+    if buffer:
+        yield b''.join(buffer)
+
+
+def _iter_gzip(chunks: Iterator[bytes]) -> Iterator[bytes]:
+    compressor = zlib.compressobj(wbits=zlib.MAX_WBITS | 16)
+    for chunk in chunks:
+        if data := compressor.compress(chunk):
+            yield data
+    yield compressor.flush()
+
+
+class _Echo:
+    """Псевдо-файл для csv.writer: writerow возвращает сформированную строку"""
+
+    def write(self, value: str) -> str:
+        return value
@@ -1,8 +1,16 @@
+import re
+
 import django_filters
+from django.contrib.postgres.search import SearchQuery, SearchRank
 from django.db import models
+from rest_framework import filters
+from rest_framework.settings import api_settings
 
 from goals.models import Goal
 
+#: Конфигурация полнотекстового поиска Postgres. Должна совпадать с триггерами миграции goals.0008
+SEARCH_CONFIG = 'russian'
+
 
 class GoalsFilter(django_filters.rest_framework.FilterSet):
     """Фильтр для целей
@@ -21,3 +29,29 @@ class GoalsFilter(django_filters.rest_framework.FilterSet):
     filter_overrides = {
         models.DateTimeField: {'filter_class': django_filters.IsoDateTimeFilter},
     }
+
+
+class FullTextSearchFilter(filters.SearchFilter):
+    """Полнотекстовый поиск Postgres по полю tsvector
+
+    Используется представлениями, в которых задан атрибут search_vector_field,
+    остальные представления работают как SearchFilter (ILIKE по search_fields).
+    Каждое слово запроса ищется как префикс лексемы ('цел' найдет 'цели'), результаты
+    упорядочиваются по релевантности, если не передан параметр сортировки.
+    """
+
+    def filter_queryset(self, request, queryset, view):
+        vector_field = getattr(view, 'search_vector_field', None)
+        terms = re.findall(r'\w+', request.query_params.get(self.search_param, ''))
+        if not vector_field or not terms:
+            return super().filter_queryset(request, queryset, view)
+
+        query = SearchQuery(' & '.join(f'{term}:*' for term in terms), config=SEARCH_CONFIG, search_type='raw')
+        queryset = queryset.filter(**{vector_field: query}).annotate(
+            search_rank=SearchRank(models.F(vector_field), query)
+        )
+
+        if api_settings.ORDERING_PARAM not in request.query_params:
+            queryset = queryset.order_by('-search_rank', *queryset.query.order_by)
+
+        return queryset
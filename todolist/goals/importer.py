@@ -0,0 +1,266 @@
+import json
+from collections import Counter
+from collections.abc import Callable, Iterable
+
+from django.core.exceptions import ValidationError
+from django.db import transaction
+
+from core.models import User
+from goals.list_cache import invalidate_boards
+from goals.membership import invalidate_board_roles
+from goals.models import (
+    Board, BoardGoalCounter, BoardImport, BoardImportItem, BoardParticipant, Category, Comment, Goal
+)
+
+#: Типы записей файла импорта (формат экспорта goals.export)
+RECORD_TYPES = ('board', 'participant', 'category', 'goal', 'comment')
+
+#: Типы записей, идентификаторы которых сохраняются для ссылок из последующих записей
+REFERENCED_TYPES = ('category', 'goal')
+
+
+class BoardImportError(ValueError):
+    """Некорректная запись файла импорта"""
+
+    def __init__(self, line: int, message: str):
+        super().__init__(f'Line {line}: {message}')
+        self.line = line
+
+
+class BoardImporter:
+    """Импорт доски из файла NDJSON
+
+    Файл читается построчно, подряд идущие записи одного типа сохраняются через bulk_create
+    пакетами по batch_size записей. Каждый пакет сохраняется в отдельной транзакции вместе
+    с позицией в файле (BoardImport.position) и соответствием идентификаторов категорий и целей,
+    поэтому прерванный импорт продолжается с первой несохраненной строки того же файла.
+
+    Доска создается первой записью файла, импортирующий пользователь становится ее владельцем.
+    При map_users (импорт администратором, команда import_board) авторы и участники
+    сопоставляются по имени пользователя: неизвестные участники пропускаются, автором записей
+    неизвестных пользователей становится импортирующий пользователь. Без map_users (импорт через
+    API) участники не добавляются, а автором всех записей становится импортирующий пользователь -
+    файл не может добавить на доску или указать автором другого пользователя.
+
+    Args:
+        board_import (BoardImport): импорт (новый или прерванный)
+        batch_size (int): количество записей, сохраняемых одним запросом
+        progress: функция, вызываемая после сохранения каждого пакета
+        map_users (bool): сопоставлять авторов и участников с пользователями по имени
+    """
+
+    def __init__(self, board_import: BoardImport, batch_size: int = 1000,
+                 progress: Callable[[BoardImport], None] | None = None, map_users: bool = False):
+        self.board_import = board_import
+        self.batch_size = batch_size
+        self.progress = progress
+        self.map_users = map_users
+
+        self._users = {board_import.user.username: board_import.user.id}
+        self._ids = {record_type: {} for record_type in REFERENCED_TYPES}
+        for record_type, source_id, target_id in board_import.items.values_list(
+            'record_type', 'source_id', 'target_id'
+        ):
+            self._ids[record_type][source_id] = target_id
+
+        self._batch: list[tuple[int, dict]] = []
+        self._creators = {
+            'board': self._create_board,
+            'participant': self._create_participants,
+            'category': self._create_categories,
+            'goal': self._create_goals,
+            'comment': self._create_comments,
+        }
+
+    def run(self, lines: Iterable[str | bytes]) -> BoardImport:
+        """Импортирует строки файла, начиная с первой несохраненной
+
+        Raises:
+            BoardImportError: некорректная запись (сохраненные ранее пакеты остаются в базе данных)
+        """
+        number = 0
+        try:
+            for number, line in enumerate(lines, start=1):
+                if number <= self.board_import.position or not line.strip():
+                    continue
+                record = self._parse(number, line)
+                if self._batch and (
+                    self._batch[-1][1]['type'] != record['type'] or len(self._batch) >= self.batch_size
+                ):
+                    self._flush()
+                self._batch.append((number, record))
+            self._flush()
+        except BoardImportError as error:
+            self.board_import.status, self.board_import.error = BoardImport.Status.failed, str(error)
+            self.board_import.save(update_fields=('status', 'error', 'updated',))
+            raise
+
+        with transaction.atomic():
+            self.board_import.status, self.board_import.error = BoardImport.Status.done, ''
+            self.board_import.position = max(self.board_import.position, number)
+            self.board_import.save(update_fields=('status', 'error', 'position', 'updated',))
+            self.board_import.items.all().delete()
+        return self.board_import
+
+    def _parse(self, number: int, line: str | bytes) -> dict:
+        try:
+            record = json.loads(line)
+        except ValueError:
+            raise BoardImportError(number, 'Invalid JSON')
+        if not isinstance(record, dict) or record.get('type') not in RECORD_TYPES:
+            raise BoardImportError(number, f'Record type must be one of: {", ".join(RECORD_TYPES)}')
+
+        has_board = self.board_import.board_id is not None or any(
+            pending['type'] == 'board' for _, pending in self._batch
+        )
+        if record['type'] == 'board' and has_board:
+            raise BoardImportError(number, 'Only one board record allowed')
+        if record['type'] != 'board' and not has_board:
+            raise BoardImportError(number, 'Board record must be the first record')
+        return record
+
+    def _flush(self) -> None:
+        if not self._batch:
+            return
+
+        record_type = self._batch[0][1]['type']
+        with transaction.atomic():
+            self._creators[record_type](self._batch)
+            self.board_import.position = self._batch[-1][0]
+            self.board_import.save(update_fields=('board', 'position', 'stats', 'updated',))
+            #: bulk_create не отправляет сигналы моделей - кэш ответов списков сбрасывается явно
+            invalidate_boards(self.board_import.board_id)
+
+        self._batch = []
+        if self.progress:
+            self.progress(self.board_import)
+
+    def _create_board(self, batch: list) -> None:
+        number, record = batch[0]
+        board = Board.objects.create(title=_clean(number, Board, 'title', record.get('title')))
+        BoardParticipant.objects.create(
+            board=board, user_id=self.board_import.user_id, role=BoardParticipant.Role.owner
+        )
+        self.board_import.board = board
+        self._count('board', 1)
+
+    def _create_participants(self, batch: list) -> None:
+        users = self._get_user_ids(record.get('user') for _, record in batch)
+        participants, skipped = {}, 0
+        for number, record in batch:
+            user_id = self._get_user_id(users, record)
+            if user_id is None:
+                skipped += 1
+                continue
+            if user_id == self.board_import.user_id:
+                #: Импортирующий пользователь уже является владельцем доски
+                continue
+            participants[user_id] = BoardParticipant(
+                board_id=self.board_import.board_id, user_id=user_id,
+                role=_clean(number, BoardParticipant, 'role', record.get('role')),
+            )
+
+        BoardParticipant.objects.bulk_create(participants.values(), ignore_conflicts=True)
+        invalidate_board_roles(board_id=self.board_import.board_id, user_ids=participants.keys())
+        self._count('participant', len(participants), skipped=skipped)
+
+    def _create_categories(self, batch: list) -> None:
+        users = self._get_user_ids(record.get('user') for _, record in batch)
+        categories = [
+            Category(
+                board_id=self.board_import.board_id,
+                user_id=self._get_user_id(users, record) or self.board_import.user_id,
+                title=_clean(number, Category, 'title', record.get('title')),
+                is_deleted=_clean(number, Category, 'is_deleted', record.get('is_deleted', False)),
+            )
+            for number, record in batch
+        ]
+        Category.objects.bulk_create(categories)
+        self._save_ids('category', batch, categories)
+        self._count('category', len(categories))
+
+    def _create_goals(self, batch: list) -> None:
+        users = self._get_user_ids(record.get('user') for _, record in batch)
+        goals = [
+            Goal(
+                board_id=self.board_import.board_id,
+                category_id=self._get_id(number, 'category', record.get('category')),
+                user_id=self._get_user_id(users, record) or self.board_import.user_id,
+                title=_clean(number, Goal, 'title', record.get('title')),
+                description=_clean(number, Goal, 'description', record.get('description') or ''),
+                **{
+                    name: _clean(number, Goal, name, record[name])
+                    for name in ('status', 'priority', 'due_date') if name in record
+                },
+            )
+            for number, record in batch
+        ]
+        Goal.objects.bulk_create(goals)
+        #: bulk_create не вызывает Goal.save(), поэтому счетчики доски изменяются явно
+        BoardGoalCounter.objects.add(Counter(goal.get_counter_key() for goal in goals))
+        self._save_ids('goal', batch, goals)
+        self._count('goal', len(goals))
+
+    def _create_comments(self, batch: list) -> None:
+        users = self._get_user_ids(record.get('user') for _, record in batch)
+        comments = [
+            Comment(
+                board_id=self.board_import.board_id,
+                goal_id=self._get_id(number, 'goal', record.get('goal')),
+                user_id=self._get_user_id(users, record) or self.board_import.user_id,
+                text=_clean(number, Comment, 'text', record.get('text')),
+            )
+            for number, record in batch
+        ]
+        Comment.objects.bulk_create(comments)
+        self._count('comment', len(comments))
+
+    def _get_user_ids(self, usernames: Iterable) -> dict[str, int | None]:
+        #: Пользователи загружаются одним запросом на пакет, неизвестные имена запоминаются как None
+        if self.map_users and (missing := {
+            username for username in usernames if isinstance(username, str) and username not in self._users
+        }):
+            found = dict(User.objects.filter(username__in=missing).values_list('username', 'id'))
+            self._users.update({username: found.get(username) for username in missing})
+        return self._users
+
+    def _get_user_id(self, users: dict, record: dict) -> int | None:
+        username = record.get('user')
+        return users.get(username) if self.map_users and isinstance(username, str) else None
+
+    def _get_id(self, number: int, record_type: str, source_id) -> int:
+        if not isinstance(source_id, int) or (target_id := self._ids[record_type].get(source_id)) is None:
+            raise BoardImportError(number, f'Unknown {record_type}: {source_id}')
+        return target_id
+
+    def _save_ids(self, record_type: str, batch: list, objects: list) -> None:
+        ids = {}
+        for (number, record), obj in zip(batch, objects):
+            source_id = record.get('id')
+            if not isinstance(source_id, int) or source_id in ids or source_id in self._ids[record_type]:
+                raise BoardImportError(number, f'Invalid or duplicate {record_type} id: {record.get("id")}')
+            ids[source_id] = obj.id
+
+        BoardImportItem.objects.bulk_create(
+            BoardImportItem(board_import=self.board_import, record_type=record_type, source_id=source_id,
+                            target_id=target_id)
+            for source_id, target_id in ids.items()
+        )
+        self._ids[record_type].update(ids)
+
+    def _count(self, record_type: str, imported: int, skipped: int = 0) -> None:
+        stats = self.board_import.stats
+        stats[record_type] = stats.get(record_type, 0) + imported
+        if skipped:
+            stats['skipped'] = stats.get('skipped', 0) + skipped
+
+
+def _clean(number: int, model, name: str, value):
+    """Проверяет и преобразует значение поля модели"""
+    field = model._meta.get_field(name)
+    if value is None and field.null:
+        return None
+    try:
+        return field.clean(value, None)
+    except ValidationError as error:
+        raise BoardImportError(number, f'{name}: {" ".join(error.messages)}')
@@ -0,0 +1,69 @@
+import hashlib
+import uuid
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import transaction
+
+#: Шаблон ключа кэша ответа списка
+CACHE_KEY = 'goals:list:{digest}'
+
+#: Шаблон ключа версии данных доски
+VERSION_KEY = 'goals:list-version:{board_id}'
+
+
+def get_list_cache():
+    """Возвращает кэш ответов списков (LIST_CACHE - имя кэша в CACHES)"""
+    return caches[getattr(settings, 'LIST_CACHE', 'default')]
+
+
+def get_cache_key(user_id: int, path: str, version: str) -> str:
+    """Возвращает ключ кэша ответа списка
+
+    Ключ включает версии всех досок пользователя, поэтому изменение данных любой из досок
+    (или набора досок пользователя) приводит к новому ключу без перебора сохраненных ответов.
+
+    Args:
+        user_id (int): идентификатор пользователя
+        path (str): путь запроса с параметрами
+        version (str): версии досок пользователя (goals.mixins.get_boards_version)
+    Returns:
+        str
+    """
+    key = f'{user_id}:{path}:{version}'
+    return CACHE_KEY.format(digest=hashlib.sha1(key.encode()).hexdigest())
+
+
+def get_board_versions(board_ids) -> dict[int, str]:
+    """Возвращает версии данных досок
+
+    Отсутствующая в кэше версия создается заново (случайным значением), чтобы после вытеснения
+    ключа версии не использовались ответы, сохраненные до изменения данных доски.
+    """
+    cache = get_list_cache()
+    keys = {board_id: VERSION_KEY.format(board_id=board_id) for board_id in board_ids}
+    cached = cache.get_many(keys.values())
+    versions = {board_id: cached[key] for board_id, key in keys.items() if key in cached}
+
+    for board_id in keys.keys() - versions.keys():
+        cache.add(keys[board_id], uuid.uuid4().hex, None)
+        versions[board_id] = cache.get(keys[board_id])
+
+    return versions
+
+
+def invalidate_boards(*board_ids) -> None:
+    """Сбрасывает кэш ответов списков с данными досок
+
+    Версии досок изменяются после фиксации транзакции, чтобы параллельный запрос
+    не сохранил в кэше ответ с данными до фиксации под новой версией.
+    """
+    if not (board_ids := {board_id for board_id in board_ids if board_id is not None}):
+        return
+
+    def bump() -> None:
+        get_list_cache().set_many(
+            {VERSION_KEY.format(board_id=board_id): uuid.uuid4().hex for board_id in board_ids}, None
+        )
+
+    transaction.on_commit(bump)
@@ -0,0 +1,61 @@
+from django.core.management import BaseCommand, CommandError
+
+from core.models import User
+from goals.importer import BoardImporter, BoardImportError
+from goals.models import BoardImport
+from todolist import settings
+
+
+class Command(BaseCommand):
+    """Класс команды для импорта доски из файла NDJSON (формат экспорта /goals/board/<id>/export)
+
+    Прерванный импорт продолжается повторным запуском с параметром --resume
+    """
+
+    help = 'Imports a board with categories, goals and comments from an NDJSON file'
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', help='Path to the NDJSON file')
+        parser.add_argument('--user', required=True, help='Username of the board owner')
+        parser.add_argument(
+            '--batch-size', type=int, default=settings.IMPORT_BATCH_SIZE, help='Number of records per bulk insert'
+        )
+        parser.add_argument('--resume', type=int, metavar='IMPORT_ID', help='Continue an interrupted import')
+
+    def handle(self, *args, **options):
+        try:
+            user = User.objects.get(username=options['user'])
+        except User.DoesNotExist:
+            raise CommandError(f'User {options["user"]} does not exist')
+
+        if options['resume']:
+            try:
+                board_import = BoardImport.objects.exclude(status=BoardImport.Status.done).get(
+                    id=options['resume'], user=user
+                )
+            except BoardImport.DoesNotExist:
+                raise CommandError(f'Unfinished import {options["resume"]} of user {user.username} does not exist')
+        else:
+            board_import = BoardImport.objects.create(user=user)
+
+        importer = BoardImporter(
+            board_import, batch_size=options['batch_size'], progress=self._report, map_users=True
+        )
+        try:
+            with open(options['path'], 'rb') as file:
+                importer.run(file)
+        except BoardImportError as error:
+            raise CommandError(f'Import {board_import.id} failed: {error}. Fix the file and run with --resume')
+
+        self.stdout.write(self.style.SUCCESS(
+            f'Import {board_import.id} finished: board {board_import.board_id}, {self._format_stats(board_import)}'
+        ))
+
+    def _report(self, board_import: BoardImport) -> None:
+        self.stdout.write(
+            f'Import {board_import.id}: line {board_import.position}, {self._format_stats(board_import)}'
+        )
+
+    @staticmethod
+    def _format_stats(board_import: BoardImport) -> str:
+        return ', '.join(f'{name}: {count}' for name, count in board_import.stats.items())
@@ -0,0 +1,22 @@
+import logging
+import signal
+
+from django.core.management import BaseCommand
+
+from goals.deletion import DeletionWorker
+from todolist import settings
+
+
+class Command(BaseCommand):
+    """Класс команды для запуска фоновой обработки удаления досок и категорий"""
+
+    help = 'Processes queued board and category deletions'
+
+    def handle(self, *args, **options):
+        logging.getLogger(__name__).info('Deletion worker start')
+        worker = DeletionWorker(batch_size=settings.DELETION_BATCH_SIZE)
+        signal.signal(signal.SIGTERM, lambda *args: worker.stop())
+        try:
+            worker.run()
+        except KeyboardInterrupt:
+            worker.stop()
@@ -0,0 +1,125 @@
+from django.conf import settings
+from django.core.cache import cache
+
+from goals.models import BoardParticipant
+
+#: Шаблон ключа кэша роли пользователя на доске
+CACHE_KEY = 'goals:board-role:{board_id}:{user_id}'
+
+#: Значение в кэше для пользователя, не являющегося участником доски (роли начинаются с 1)
+NOT_PARTICIPANT = 0
+
+
+def get_board_role(request, board_id: int) -> int | None:
+    """Возвращает роль текущего пользователя на доске
+
+    Роль определяется не более одного раза за запрос. Если задан параметр
+    BOARD_ROLE_CACHE_TIMEOUT, результат также сохраняется в кэше Django между запросами
+    (сброс выполняется сигналами при изменении модели BoardParticipant).
+
+    Args:
+        request: текущий запрос
+        board_id (int): идентификатор доски
+    Returns:
+        роль пользователя (BoardParticipant.Role) или None, если пользователь не участник доски
+    """
+    roles: dict = getattr(request, '_board_roles', None)
+    if roles is None:
+        roles = request._board_roles = {}
+
+    if board_id not in roles:
+        roles[board_id] = _get_role(board_id=board_id, user_id=request.user.id)
+
+    return roles[board_id]
+
+
+def get_board_roles(request, board_ids) -> dict[int, int | None]:
+    """Возвращает роли текущего пользователя на нескольких досках
+
+    Роли, не определенные ранее в этом запросе, загружаются одним запросом
+    (с учетом кэша Django, см. get_board_role).
+
+    Args:
+        request: текущий запрос
+        board_ids: идентификаторы досок
+    Returns:
+        словарь {идентификатор доски: роль или None}
+    """
+    roles: dict = getattr(request, '_board_roles', None)
+    if roles is None:
+        roles = request._board_roles = {}
+
+    if missing := {board_id for board_id in board_ids if board_id not in roles}:
+        roles.update(_get_roles(board_ids=missing, user_id=request.user.id))
+
+    return {board_id: roles[board_id] for board_id in board_ids}
+
+
+def has_board_role(request, board_id: int, roles: tuple | None = None) -> bool:
+    """Проверяет, что пользователь является участником доски с одной из ролей
+
+    Args:
+        request: текущий запрос
+        board_id (int): идентификатор доски
+        roles (tuple): допустимые роли. Если не заданы - достаточно быть участником
+    Returns:
+        bool
+    """
+    role = get_board_role(request, board_id)
+    if role is None:
+        return False
+    return roles is None or role in roles
+
+
+def invalidate_board_role(board_id: int, user_id: int) -> None:
+    """Удаляет роль пользователя на доске из кэша"""
+    cache.delete(CACHE_KEY.format(board_id=board_id, user_id=user_id))
+
+
+def invalidate_board_roles(board_id: int, user_ids) -> None:
+    """Удаляет роли пользователей на доске из кэша"""
+    if user_ids:
+        cache.delete_many([CACHE_KEY.format(board_id=board_id, user_id=user_id) for user_id in user_ids])
+
+
+def _get_role(board_id: int, user_id: int) -> int | None:
+    timeout = getattr(settings, 'BOARD_ROLE_CACHE_TIMEOUT', 0)
+    if not timeout:
+        return _fetch_role(board_id=board_id, user_id=user_id)
+
+    key = CACHE_KEY.format(board_id=board_id, user_id=user_id)
+    if (role := cache.get(key)) is None:
+        role = _fetch_role(board_id=board_id, user_id=user_id) or NOT_PARTICIPANT
+        cache.set(key, role, timeout)
+
+    return role or None
+
+
+def _get_roles(board_ids: set, user_id: int) -> dict[int, int | None]:
+    timeout = getattr(settings, 'BOARD_ROLE_CACHE_TIMEOUT', 0)
+    if not timeout:
+        return _fetch_roles(board_ids=board_ids, user_id=user_id)
+
+    keys = {board_id: CACHE_KEY.format(board_id=board_id, user_id=user_id) for board_id in board_ids}
+    cached = cache.get_many(keys.values())
+    roles = {board_id: cached[key] for board_id, key in keys.items() if key in cached}
+
+    if missing := board_ids - roles.keys():
+        fetched = _fetch_roles(board_ids=missing, user_id=user_id)
+        cache.set_many({keys[board_id]: role or NOT_PARTICIPANT for board_id, role in fetched.items()}, timeout)
+        roles.update(fetched)
+
+    return {board_id: role or None for board_id, role in roles.items()}
+
+
+def _fetch_roles(board_ids: set, user_id: int) -> dict[int, int | None]:
+    roles = dict(BoardParticipant.objects.filter(
+        board_id__in=board_ids, user_id=user_id
+    ).values_list('board_id', 'role'))
+    return {board_id: roles.get(board_id) for board_id in board_ids}
+
+
+def _fetch_role(board_id: int, user_id: int) -> int | None:
+    return BoardParticipant.objects.filter(
+        board_id=board_id, user_id=user_id
+    ).values_list('role', flat=True).first()
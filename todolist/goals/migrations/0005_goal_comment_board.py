@@ -0,0 +1,40 @@
+# Generated by Django 4.1.4 on 2026-10-18 10:00
+
+from django.db import migrations, models
+from django.db.models import OuterRef, Subquery
+import django.db.models.deletion
+
+
+def fill_board(apps, schema_editor):
+    # Заполнение денормализованного поля board у существующих целей и комментариев
+    Category = apps.get_model('goals', 'Category')
+    Goal = apps.get_model('goals', 'Goal')
+    Comment = apps.get_model('goals', 'Comment')
+
+    Goal.objects.update(
+        board_id=Subquery(Category.objects.filter(id=OuterRef('category_id')).values('board_id')[:1])
+    )
+    Comment.objects.update(
+        board_id=Subquery(Goal.objects.filter(id=OuterRef('goal_id')).values('board_id')[:1])
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('goals', '0004_alter_boardparticipant_options_and_more'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='goal',
+            name='board',
+            field=models.ForeignKey(editable=False, null=True, on_delete=django.db.models.deletion.PROTECT, related_name='goals', to='goals.board', verbose_name='Доска'),
+        ),
+        migrations.AddField(
+            model_name='comment',
+            name='board',
+            field=models.ForeignKey(editable=False, null=True, on_delete=django.db.models.deletion.PROTECT, related_name='comments', to='goals.board', verbose_name='Доска'),
+        ),
+        migrations.RunPython(fill_board, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,81 @@
+# Generated by Django 4.1.4 on 2026-10-18 17:50
+
+import django.contrib.postgres.indexes
+import django.contrib.postgres.search
+from django.db import migrations
+
+# Поисковые векторы поддерживаются триггерами БД, поэтому остаются актуальными
+# и при массовых операциях (bulk_create, QuerySet.update).
+# Конфигурация russian: русские слова - russian_stem, латиница - english_stem.
+# Должна совпадать с goals.filters.SEARCH_CONFIG
+GOAL_TRIGGER_SQL = '''
+CREATE FUNCTION goals_goal_search_vector_update() RETURNS trigger AS $$
+BEGIN
+    NEW.search_vector :=
+        setweight(to_tsvector('pg_catalog.russian', coalesce(NEW.title, '')), 'A') ||
+        setweight(to_tsvector('pg_catalog.russian', coalesce(NEW.description, '')), 'B');
+    RETURN NEW;
+END
+$$ LANGUAGE plpgsql;
+
+CREATE TRIGGER goals_goal_search_vector_trigger
+    BEFORE INSERT OR UPDATE OF title, description ON goals_goal
+    FOR EACH ROW EXECUTE FUNCTION goals_goal_search_vector_update();
+
+UPDATE goals_goal SET title = title;
+'''
+
+GOAL_TRIGGER_REVERSE_SQL = '''
+DROP TRIGGER goals_goal_search_vector_trigger ON goals_goal;
+DROP FUNCTION goals_goal_search_vector_update();
+'''
+
+CATEGORY_TRIGGER_SQL = '''
+CREATE FUNCTION goals_category_search_vector_update() RETURNS trigger AS $$
+BEGIN
+    NEW.search_vector := setweight(to_tsvector('pg_catalog.russian', coalesce(NEW.title, '')), 'A');
+    RETURN NEW;
+END
+$$ LANGUAGE plpgsql;
+
+CREATE TRIGGER goals_category_search_vector_trigger
+    BEFORE INSERT OR UPDATE OF title ON goals_category
+    FOR EACH ROW EXECUTE FUNCTION goals_category_search_vector_update();
+
+UPDATE goals_category SET title = title;
+'''
+
+CATEGORY_TRIGGER_REVERSE_SQL = '''
+DROP TRIGGER goals_category_search_vector_trigger ON goals_category;
+DROP FUNCTION goals_category_search_vector_update();
+'''
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('goals', '0007_list_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='category',
+            name='search_vector',
+            field=django.contrib.postgres.search.SearchVectorField(editable=False, null=True, verbose_name='Поисковый вектор'),
+        ),
+        migrations.AddField(
+            model_name='goal',
+            name='search_vector',
+            field=django.contrib.postgres.search.SearchVectorField(editable=False, null=True, verbose_name='Поисковый вектор'),
+        ),
+        migrations.RunSQL(CATEGORY_TRIGGER_SQL, CATEGORY_TRIGGER_REVERSE_SQL),
+        migrations.RunSQL(GOAL_TRIGGER_SQL, GOAL_TRIGGER_REVERSE_SQL),
+        migrations.AddIndex(
+            model_name='category',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['search_vector'], name='category_search_vector_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='goal',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['search_vector'], name='goal_search_vector_idx'),
+        ),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 4.1.4 on 2026-10-18 18:09
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('goals', '0008_search_vector'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='category',
+            index=models.Index(condition=models.Q(('is_deleted', False)), fields=['user', 'title'], name='category_user_title_idx'),
+        ),
+    ]
@@ -0,0 +1,39 @@
+# Generated by Django 4.1.4 on 2026-10-18 18:15
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+# Начальные значения счетчиков по существующим целям
+BACKFILL_SQL = '''
+INSERT INTO goals_boardgoalcounter (board_id, status, priority, count)
+SELECT board_id, status, priority, count(*) FROM goals_goal GROUP BY board_id, status, priority;
+'''
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('goals', '0009_category_user_title_idx'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='BoardGoalCounter',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('status', models.PositiveSmallIntegerField(choices=[(1, 'К выполнению'), (2, 'В процессе'), (3, 'Выполнено'), (4, 'Архив')], verbose_name='Статус')),
+                ('priority', models.PositiveSmallIntegerField(choices=[(1, 'Низкий'), (2, 'Средний'), (3, 'Высокий'), (4, 'Критический')], verbose_name='Приоритет')),
+                ('count', models.IntegerField(default=0, verbose_name='Количество целей')),
+                ('board', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='goal_counters', to='goals.board', verbose_name='Доска')),
+            ],
+            options={
+                'verbose_name': 'Счетчик целей доски',
+                'verbose_name_plural': 'Счетчики целей досок',
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='boardgoalcounter',
+            constraint=models.UniqueConstraint(fields=('board', 'status', 'priority'), name='board_goal_counter_unique'),
+        ),
+        migrations.RunSQL(BACKFILL_SQL, migrations.RunSQL.noop),
+    ]
@@ -0,0 +1,52 @@
+# Generated by Django 4.1.4 on 2026-10-18 18:54
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('goals', '0010_boardgoalcounter'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='BoardImport',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created', models.DateTimeField(auto_now_add=True, verbose_name='Дата создания')),
+                ('updated', models.DateTimeField(auto_now=True, verbose_name='Дата последнего обновления')),
+                ('status', models.PositiveSmallIntegerField(choices=[(1, 'Выполняется'), (2, 'Завершен'), (3, 'Ошибка')], default=1, verbose_name='Статус')),
+                ('position', models.PositiveIntegerField(default=0, verbose_name='Позиция')),
+                ('stats', models.JSONField(default=dict, verbose_name='Статистика')),
+                ('error', models.TextField(blank=True, verbose_name='Ошибка')),
+                ('board', models.ForeignKey(null=True, on_delete=django.db.models.deletion.CASCADE, related_name='imports', to='goals.board', verbose_name='Доска')),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='board_imports', to=settings.AUTH_USER_MODEL, verbose_name='Пользователь')),
+            ],
+            options={
+                'verbose_name': 'Импорт доски',
+                'verbose_name_plural': 'Импорт досок',
+            },
+        ),
+        migrations.CreateModel(
+            name='BoardImportItem',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('record_type', models.CharField(max_length=10, verbose_name='Тип записи')),
+                ('source_id', models.BigIntegerField(verbose_name='Идентификатор в файле')),
+                ('target_id', models.BigIntegerField(verbose_name='Идентификатор объекта')),
+                ('board_import', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='items', to='goals.boardimport', verbose_name='Импорт')),
+            ],
+            options={
+                'verbose_name': 'Объект импорта',
+                'verbose_name_plural': 'Объекты импорта',
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='boardimportitem',
+            constraint=models.UniqueConstraint(fields=('board_import', 'record_type', 'source_id'), name='board_import_item_unique'),
+        ),
+    ]
@@ -0,0 +1,147 @@
+import hashlib
+
+from django.conf import settings
+from django.db.models import Count, Max
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.http import http_date, quote_etag
+from rest_framework import status
+from rest_framework.response import Response
+
+from goals.list_cache import get_board_versions, get_cache_key, get_list_cache
+from goals.models import BoardParticipant
+from goals.pagination import KeysetPagination
+
+
+def get_boards_version(request) -> str:
+    """Возвращает версию данных всех досок пользователя запроса (goals.list_cache)
+
+    Версия вычисляется один раз за запрос и используется кэшем ответов и условными запросами списков.
+    """
+    if (version := getattr(request, '_boards_version', None)) is None:
+        board_ids = BoardParticipant.objects.filter(user_id=request.user.id).values_list('board_id', flat=True)
+        versions = get_board_versions(board_ids)
+        version = request._boards_version = ','.join(
+            f'{board_id}.{versions[board_id]}' for board_id in sorted(versions)
+        )
+    return version
+
+
+class ConditionalGetMixin:
+    """Условные GET запросы (ETag, Last-Modified) для действий list и retrieve
+
+    Версия объекта определяется датой его обновления (ETag и Last-Modified). Для списков
+    передается только ETag: дата обновления не изменяется при исключении строк из выборки
+    (архивация, удаление участника). При включенном кэше ответов списков (LIST_CACHE_TIMEOUT)
+    версия списка составляется из версий досок пользователя без запросов к данным, иначе -
+    из количества строк и максимальной даты обновления queryset; в режиме keyset пагинации
+    такой агрегат (COUNT) не выполняется и условный запрос не поддерживается.
+    Если версия не изменилась, возвращается ответ 304 Not Modified без сериализации данных.
+    """
+
+    #: Поле даты последнего обновления модели
+    updated_field = 'updated'
+
+    def list(self, request, *args, **kwargs):
+        if (version := self.get_list_version(request)) is None:
+            return super().list(request, *args, **kwargs)
+
+        if not_modified := self._get_not_modified(request, version):
+            return not_modified
+
+        response = super().list(request, *args, **kwargs)
+        return self._set_validators(response)
+
+    def retrieve(self, request, *args, **kwargs):
+        instance = self.get_object()
+
+        count, updated = self.get_object_version(instance)
+        if not_modified := self._get_not_modified(
+            request, f'{count}:{updated.isoformat() if updated else ""}', updated=updated
+        ):
+            return not_modified
+
+        serializer = self.get_serializer(instance)
+        return self._set_validators(Response(serializer.data))
+
+    def get_list_version(self, request) -> str | None:
+        """Возвращает версию списка или None, если условный запрос не поддерживается"""
+        if getattr(settings, 'LIST_CACHE_TIMEOUT', 0):
+            return get_boards_version(request)
+
+        if isinstance(self.paginator, KeysetPagination) and self.paginator.get_keyset(request, self):
+            return None
+
+        queryset = self.filter_queryset(self.get_queryset())
+        version = queryset.order_by().aggregate(count=Count('pk'), updated=Max(self.updated_field))
+        return f'{version["count"]}:{version["updated"].isoformat() if version["updated"] else ""}'
+
+    def get_object_version(self, instance) -> tuple:
+        """Возвращает версию объекта: количество связанных строк и дату последнего обновления"""
+        return 1, getattr(instance, self.updated_field)
+
+    def _get_not_modified(self, request, version: str, updated=None) -> Response | None:
+        #: Версия учитывает пользователя и параметры запроса (фильтры, страница)
+        key = f'{request.user.id}:{request.get_full_path()}:{version}'
+        self._etag = quote_etag(hashlib.sha1(key.encode()).hexdigest())
+        self._last_modified = int(updated.timestamp()) if updated else None
+
+        conditional = get_conditional_response(request, etag=self._etag, last_modified=self._last_modified)
+        if conditional is None:
+            return None
+
+        #: 304 Not Modified (или 412 Precondition Failed для заголовков If-Match, If-Unmodified-Since)
+        return self._set_validators(Response(status=conditional.status_code))
+
+    def _set_validators(self, response: Response) -> Response:
+        response['ETag'] = self._etag
+        if self._last_modified is not None:
+            response['Last-Modified'] = http_date(self._last_modified)
+        #: Клиент должен проверять актуальность ответа при каждом запросе
+        patch_cache_control(response, private=True, no_cache=True)
+        return response
+
+
+class ListCacheMixin:
+    """Кэширование ответов действия list для каждого пользователя
+
+    Включается параметром LIST_CACHE_TIMEOUT. Ключ ответа зависит от пользователя, параметров запроса
+    и версий досок пользователя, которые изменяются сигналами моделей (см. goals.list_cache),
+    поэтому при попадании в кэш не выполняются выборка данных и сериализация.
+    """
+
+    def list(self, request, *args, **kwargs):
+        timeout = getattr(settings, 'LIST_CACHE_TIMEOUT', 0)
+        if not timeout:
+            return super().list(request, *args, **kwargs)
+
+        key = get_cache_key(
+            user_id=request.user.id, path=request.get_full_path(), version=get_boards_version(request)
+        )
+        cache = get_list_cache()
+        if (data := cache.get(key)) is not None:
+            return Response(data)
+
+        response = super().list(request, *args, **kwargs)
+        if response.status_code == status.HTTP_200_OK:
+            cache.set(key, response.data, timeout)
+        return response
+
+
+class ValuesListMixin:
+    """Действие list без создания объектов моделей и ModelSerializer
+
+    Строки выбираются через QuerySet.values() и преобразуются сериализатором values_serializer
+    (goals.serializers.ValuesSerializer), ответ совпадает с ответом сериализатора представления.
+    """
+
+    #: Сериализатор строк QuerySet.values()
+    values_serializer = None
+
+    def list(self, request, *args, **kwargs):
+        queryset = self.filter_queryset(self.get_queryset()).values(*self.values_serializer.columns)
+
+        page = self.paginate_queryset(queryset)
+        if page is not None:
+            return self.get_paginated_response(self.values_serializer.to_representation(page))
+
+        return Response(self.values_serializer.to_representation(queryset))
@@ -1,6 +1,12 @@
-from django.db import models
+from collections import Counter
+
+from django.contrib.postgres.indexes import GinIndex
+from django.contrib.postgres.search import SearchVectorField
+from django.db import connection, models, transaction
+from django.utils import timezone
 
 from core.models import User
+from goals.list_cache import invalidate_boards
 
 
 class BaseModel(models.Model):
@@ -44,6 +50,10 @@ class BoardParticipant(BaseModel):
 
     class Meta:
         unique_together = ('board', 'user')
+        indexes = [
+            #: Доски пользователя (фильтр по участникам во всех списках)
+            models.Index(fields=['user', 'board', 'role'], name='participant_user_board_idx'),
+        ]
         verbose_name = 'Участник'
         verbose_name_plural = 'Участники'
 
@@ -58,14 +68,100 @@ class Category(BaseModel):
     user = models.ForeignKey(User, verbose_name='Автор', related_name='categories', on_delete=models.PROTECT)
     board = models.ForeignKey(Board, verbose_name='Доска', related_name='categories', on_delete=models.PROTECT)
     is_deleted = models.BooleanField(verbose_name='Удалена', default=False)
+    #: Поисковый вектор по названию. Заполняется триггером БД (миграция 0008)
+    search_vector = SearchVectorField(verbose_name='Поисковый вектор', null=True, editable=False)
 
     class Meta:
+        indexes = [
+            #: Не удаленные категории доски, сортировка по названию
+            models.Index(
+                fields=['board', 'title'], name='category_board_title_idx', condition=models.Q(is_deleted=False)
+            ),
+            #: Не удаленные категории автора по названию (команда /create бота)
+            models.Index(
+                fields=['user', 'title'], name='category_user_title_idx', condition=models.Q(is_deleted=False)
+            ),
+            GinIndex(fields=['search_vector'], name='category_search_vector_idx'),
+        ]
         verbose_name = 'Категория'
         verbose_name_plural = 'Категории'
 
     def __str__(self):
         return self.title
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        #: Исходная доска категории - для синхронизации поля board целей и комментариев
+        instance._loaded_board_id = instance.__dict__.get('board_id')
+        return instance
+
+    def save(self, *args, **kwargs):
+        super().save(*args, **kwargs)
+
+        loaded_board_id = getattr(self, '_loaded_board_id', None)
+        if loaded_board_id is not None and loaded_board_id != self.board_id:
+            Goal.objects.filter(category_id=self.id).set_board(self.board_id)
+            Comment.objects.filter(goal__category_id=self.id).update(board_id=self.board_id)
+        self._loaded_board_id = self.board_id
+
+
+class GoalQuerySet(models.QuerySet):
+    """Групповые изменения целей с обновлением счетчиков досок (BoardGoalCounter)
+
+    Обновление queryset не вызывает save(), поэтому счетчики изменяются по заблокированным
+    (SELECT ... FOR UPDATE) значениям изменяемых целей в той же транзакции,
+    а кэш ответов списков досок сбрасывается явно.
+    """
+
+    def archive(self) -> int:
+        """Переносит цели в архив
+
+        Returns:
+            int: количество архивированных целей
+        """
+        with transaction.atomic():
+            goals = self.exclude(status=Goal.Status.archived)
+            deltas = Counter()
+            for board_id, status, priority in goals.select_for_update().values_list('board_id', 'status', 'priority'):
+                deltas[board_id, status, priority] -= 1
+                deltas[board_id, Goal.Status.archived, priority] += 1
+
+            updated = goals.update(status=Goal.Status.archived, updated=timezone.now())
+            BoardGoalCounter.objects.add(deltas)
+            invalidate_boards(*{key[0] for key in deltas})
+        return updated
+
+    def set_board(self, board_id: int) -> int:
+        """Переносит цели на доску
+
+        Returns:
+            int: количество перенесенных целей
+        """
+        with transaction.atomic():
+            goals = self.exclude(board_id=board_id)
+            deltas = Counter()
+            for old_board_id, status, priority in goals.select_for_update().values_list('board_id', 'status', 'priority'):
+                deltas[old_board_id, status, priority] -= 1
+                deltas[board_id, status, priority] += 1
+
+            updated = goals.update(board_id=board_id, updated=timezone.now())
+            BoardGoalCounter.objects.add(deltas)
+            invalidate_boards(*{key[0] for key in deltas})
+        return updated
+
+    def lock_counter_fields(self) -> dict[int, dict]:
+        """Блокирует цели (SELECT ... FOR UPDATE) и возвращает их текущие категории и ключи счетчиков
+
+        Вызывается в транзакции перед изменением целей: значения загруженных ранее объектов могли
+        быть изменены параллельной транзакцией. Строки блокируются в порядке идентификаторов.
+
+        Returns:
+            dict: {идентификатор цели: {'category_id', 'board_id', 'status', 'priority'}}
+        """
+        rows = self.select_for_update().order_by('id').values('id', 'category_id', 'board_id', 'status', 'priority')
+        return {row.pop('id'): row for row in rows}
+
 
 class Goal(BaseModel):
     """Модель цели"""
@@ -84,6 +180,10 @@ class Goal(BaseModel):
 
     user = models.ForeignKey(User, verbose_name='Автор', related_name='goals', on_delete=models.PROTECT)
     category = models.ForeignKey(Category, verbose_name='Категория', related_name='goals', on_delete=models.CASCADE)
+    #: Денормализованная доска категории - для фильтрации по участникам доски одним JOIN
+    board = models.ForeignKey(
+        Board, verbose_name='Доска', related_name='goals', on_delete=models.PROTECT, editable=False
+    )
     title = models.CharField(verbose_name='Заголовок', max_length=255)
     description = models.TextField(verbose_name='Описание', max_length=1000, blank=True)
     status = models.PositiveSmallIntegerField(verbose_name='Статус', choices=Status.choices, default=Status.to_do)
@@ -91,26 +191,285 @@ class Goal(BaseModel):
         verbose_name='Приоритет', choices=Priority.choices, default=Priority.medium
     )
     due_date = models.DateTimeField(verbose_name='Дедлайн', null=True)
+    #: Поисковый вектор по заголовку и описанию. Заполняется триггером БД (миграция 0008)
+    search_vector = SearchVectorField(verbose_name='Поисковый вектор', null=True, editable=False)
+
+    objects = GoalQuerySet.as_manager()
 
     class Meta:
+        #: Частичные индексы по активным целям: status < 4 (Status.archived)
+        indexes = [
+            models.Index(
+                fields=['board', 'priority', 'due_date', 'id'], name='goal_board_priority_idx',
+                condition=models.Q(status__lt=4)
+            ),
+            models.Index(
+                fields=['category', 'priority'], name='goal_category_priority_idx',
+                condition=models.Q(status__lt=4)
+            ),
+            models.Index(
+                fields=['board', 'due_date'], name='goal_board_due_date_idx',
+                condition=models.Q(status__lt=4)
+            ),
+            GinIndex(fields=['search_vector'], name='goal_search_vector_idx'),
+        ]
         verbose_name = 'Цель'
         verbose_name_plural = 'Цели'
 
     def __str__(self):
         return self.title
 
+    def get_counter_key(self) -> tuple | None:
+        """Возвращает ключ счетчика целей доски (board_id, status, priority) по значениям объекта"""
+        key = tuple(self.__dict__.get(name) for name in ('board_id', 'status', 'priority'))
+        return None if None in key else key
+
+    def save(self, *args, **kwargs):
+        #: Синхронизация поля board с доской категории (в т.ч. при смене категории)
+        update_fields = kwargs.get('update_fields')
+        board_changed = False
+        if update_fields is None or 'category' in update_fields:
+            board_changed = self.board_id is not None and self.board_id != self.category.board_id
+            self.board_id = self.category.board_id
+            if update_fields is not None:
+                kwargs['update_fields'] = {*update_fields, 'board'}
+
+        update_fields = kwargs.get('update_fields')
+        counted = update_fields is None or not {'board', 'board_id', 'status', 'priority'}.isdisjoint(update_fields)
+
+        with transaction.atomic():
+            adding = self._state.adding
+            #: Ключ счетчика до сохранения читается из заблокированной строки (None для новой цели),
+            #: чтобы параллельные изменения цели не вычитали один и тот же исходный ключ
+            loaded_key = None
+            if counted and not adding and (row := Goal.objects.filter(pk=self.pk).lock_counter_fields().get(self.pk)):
+                loaded_key = (row['board_id'], row['status'], row['priority'])
+                #: Исходная доска - для сброса кэша ответов списков (goals.signals)
+                self._loaded_board_id = row['board_id']
+            super().save(*args, **kwargs)
+
+            key = self.get_counter_key()
+            if loaded_key is not None and update_fields is not None:
+                #: Поля, не входящие в update_fields, не сохраняются - их значения берутся из базы данных
+                key = tuple(
+                    getattr(self, attname) if {name, attname} & set(update_fields) else loaded
+                    for name, attname, loaded in zip(
+                        ('board', 'status', 'priority'), ('board_id', 'status', 'priority'), loaded_key
+                    )
+                )
+            if counted and key != loaded_key and (adding or loaded_key is not None):
+                deltas = Counter({key: 1})
+                if loaded_key is not None:
+                    deltas[loaded_key] -= 1
+                BoardGoalCounter.objects.add(deltas)
+            self._loaded_board_id = self.board_id
+
+            if board_changed:
+                self.comments.update(board_id=self.board_id)
+
+
+class BoardGoalCounterManager(models.Manager):
+
+    def add(self, deltas: dict) -> None:
+        """Изменяет счетчики целей досок
+
+        Args:
+            deltas (dict): изменения счетчиков по ключам (board_id, status, priority)
+        """
+        #: Ключи сортируются, чтобы параллельные транзакции блокировали строки в одном порядке
+        rows = [(*key, count) for key, count in sorted(deltas.items()) if count]
+        if not rows:
+            return
+
+        table = self.model._meta.db_table
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f'INSERT INTO {table} (board_id, status, priority, count) '
+                f'VALUES {", ".join(["(%s, %s, %s, %s)"] * len(rows))} '
+                f'ON CONFLICT (board_id, status, priority) DO UPDATE SET count = {table}.count + EXCLUDED.count',
+                [value for row in rows for value in row]
+            )
+
+    def get_summary(self, board_id: int) -> dict:
+        """Возвращает сводку по целям доски
+
+        Количество целей по статусам и приоритетам берется из счетчиков,
+        количество просроченных целей определяется запросом по индексу (board, due_date).
+
+        Args:
+            board_id (int): идентификатор доски
+        Returns:
+            dict
+        """
+        by_status = dict.fromkeys(Goal.Status.names, 0)
+        by_priority = dict.fromkeys(Goal.Priority.names, 0)
+
+        for status, priority, count in self.filter(board_id=board_id).values_list('status', 'priority', 'count'):
+            by_status[Goal.Status(status).name] += count
+            #: Приоритеты - только по активным (не архивным) целям
+            if status != Goal.Status.archived:
+                by_priority[Goal.Priority(priority).name] += count
+
+        overdue = Goal.objects.filter(
+            board_id=board_id,
+            status__lt=Goal.Status.done,
+            due_date__lt=timezone.now(),
+        ).count()
+
+        return {
+            'total': sum(by_status.values()) - by_status[Goal.Status.archived.name],
+            'by_status': by_status,
+            'by_priority': by_priority,
+            'overdue': overdue,
+        }
+
+
+class BoardGoalCounter(models.Model):
+    """Модель счетчика целей доски по статусу и приоритету
+
+    Изменяется при сохранении и удалении целей, а также групповых изменениях GoalQuerySet
+    """
+
+    board = models.ForeignKey(Board, verbose_name='Доска', related_name='goal_counters', on_delete=models.CASCADE)
+    status = models.PositiveSmallIntegerField(verbose_name='Статус', choices=Goal.Status.choices)
+    priority = models.PositiveSmallIntegerField(verbose_name='Приоритет', choices=Goal.Priority.choices)
+    count = models.IntegerField(verbose_name='Количество целей', default=0)
+
+    objects = BoardGoalCounterManager()
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['board', 'status', 'priority'], name='board_goal_counter_unique'),
+        ]
+        verbose_name = 'Счетчик целей доски'
+        verbose_name_plural = 'Счетчики целей досок'
+
+    def __str__(self):
+        return f'{self.board_id}: {self.status}/{self.priority} - {self.count}'
+
 
 class Comment(BaseModel):
     """Модель комментария"""
 
     user = models.ForeignKey(User, verbose_name='Автор', related_name='comments', on_delete=models.PROTECT)
     goal = models.ForeignKey(Goal, verbose_name='Цель', related_name='comments', on_delete=models.CASCADE)
+    #: Денормализованная доска цели - для фильтрации по участникам доски одним JOIN
+    board = models.ForeignKey(
+        Board, verbose_name='Доска', related_name='comments', on_delete=models.PROTECT, editable=False
+    )
     text = models.TextField(verbose_name='Комментарий', max_length=1000)
 
     class Meta:
+        indexes = [
+            models.Index(fields=['goal', '-created'], name='comment_goal_created_idx'),
+            models.Index(fields=['board', '-created'], name='comment_board_created_idx'),
+        ]
         verbose_name = 'Комментарий'
         verbose_name_plural = 'Комментарии'
 
     def __str__(self):
         text = str(self.text)
         return text if len(text) <= 20 else text[:20] + "..."
+
+    def save(self, *args, **kwargs):
+        #: Синхронизация поля board с доской цели
+        update_fields = kwargs.get('update_fields')
+        if update_fields is None or 'goal' in update_fields:
+            self.board_id = self.goal.board_id
+            if update_fields is not None:
+                kwargs['update_fields'] = {*update_fields, 'board'}
+
+        super().save(*args, **kwargs)
+
+
+class BoardImport(BaseModel):
+    """Модель импорта доски из файла NDJSON
+
+    Хранит позицию последней сохраненной строки файла для продолжения прерванного импорта
+    """
+
+    class Status(models.IntegerChoices):
+        in_progress = 1, 'Выполняется'
+        done = 2, 'Завершен'
+        failed = 3, 'Ошибка'
+
+    user = models.ForeignKey(User, verbose_name='Пользователь', related_name='board_imports', on_delete=models.CASCADE)
+    board = models.ForeignKey(
+        Board, verbose_name='Доска', related_name='imports', on_delete=models.CASCADE, null=True
+    )
+    status = models.PositiveSmallIntegerField(verbose_name='Статус', choices=Status.choices, default=Status.in_progress)
+    #: Количество обработанных строк файла (сохраненных в базе данных)
+    position = models.PositiveIntegerField(verbose_name='Позиция', default=0)
+    #: Количество импортированных и пропущенных записей по типам
+    stats = models.JSONField(verbose_name='Статистика', default=dict)
+    error = models.TextField(verbose_name='Ошибка', blank=True)
+
+    class Meta:
+        verbose_name = 'Импорт доски'
+        verbose_name_plural = 'Импорт досок'
+
+    def __str__(self):
+        return f'{self.id}: {self.get_status_display()}'
+
+
+class BoardImportItem(models.Model):
+    """Соответствие идентификаторов записей файла импорта созданным объектам
+
+    Сохраняется для категорий и целей (на них ссылаются цели и комментарии) и удаляется по завершении импорта
+    """
+
+    board_import = models.ForeignKey(
+        BoardImport, verbose_name='Импорт', related_name='items', on_delete=models.CASCADE
+    )
+    record_type = models.CharField(verbose_name='Тип записи', max_length=10)
+    source_id = models.BigIntegerField(verbose_name='Идентификатор в файле')
+    target_id = models.BigIntegerField(verbose_name='Идентификатор объекта')
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=['board_import', 'record_type', 'source_id'], name='board_import_item_unique'
+            ),
+        ]
+        verbose_name = 'Объект импорта'
+        verbose_name_plural = 'Объекты импорта'
+
+    def __str__(self):
+        return f'{self.record_type} {self.source_id} -> {self.target_id}'
+
+
+class DeletionJob(BaseModel):
+    """Модель фоновой задачи удаления доски или категории
+
+    Доска (категория) скрывается сразу при удалении, а категории и цели помечаются удаленными
+    фоновым обработчиком (goals.deletion.DeletionWorker) пакетами в коротких транзакциях
+    """
+
+    class Status(models.IntegerChoices):
+        pending = 1, 'В очереди'
+        running = 2, 'Выполняется'
+        done = 3, 'Завершена'
+        failed = 4, 'Ошибка'
+
+    user = models.ForeignKey(User, verbose_name='Пользователь', related_name='deletion_jobs', on_delete=models.CASCADE)
+    board = models.ForeignKey(
+        Board, verbose_name='Доска', related_name='deletion_jobs', on_delete=models.CASCADE, null=True, blank=True
+    )
+    category = models.ForeignKey(
+        Category, verbose_name='Категория', related_name='deletion_jobs', on_delete=models.CASCADE,
+        null=True, blank=True
+    )
+    status = models.PositiveSmallIntegerField(verbose_name='Статус', choices=Status.choices, default=Status.pending)
+    #: Количество обработанных категорий и целей
+    processed = models.PositiveIntegerField(verbose_name='Обработано объектов', default=0)
+    error = models.TextField(verbose_name='Ошибка', blank=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['id'], name='deletion_job_active_idx', condition=models.Q(status__lt=3)),
+        ]
+        verbose_name = 'Задача удаления'
+        verbose_name_plural = 'Задачи удаления'
+
+    def __str__(self):
+        return f'{self.id}: {self.get_status_display()}'
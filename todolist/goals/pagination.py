@@ -0,0 +1,172 @@
+import base64
+import binascii
+import json
+
+from django.core.exceptions import ValidationError
+from django.db.models import F, Q
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import LimitOffsetPagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+
+class KeysetPagination(LimitOffsetPagination):
+    """Пагинация списков с опциональным режимом keyset (cursor)
+
+    По умолчанию работает как LimitOffsetPagination. Режим keyset включается
+    параметром запроса ?pagination=cursor (либо наличием параметра cursor) для
+    представлений, в которых задан атрибут keyset_ordering - уникальный ключ сортировки,
+    например ('priority', 'due_date', 'id'). В этом режиме страница выбирается
+    условием по ключу последней записи предыдущей страницы: без OFFSET и без COUNT(*),
+    поэтому стоимость запроса не зависит от глубины страницы.
+
+    Значение NULL в полях ключа считается наибольшим. Страница может состоять из строк
+    QuerySet.values(), если они содержат поля ключа сортировки.
+    """
+    mode_query_param = 'pagination'
+    mode_query_value = 'cursor'
+    cursor_query_param = 'cursor'
+    keyset_default_limit = 100
+    invalid_cursor_message = 'Invalid cursor'
+
+    keyset = None
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.keyset = self.get_keyset(request, view)
+        if not self.keyset:
+            return super().paginate_queryset(queryset, request, view)
+
+        return self.paginate_keyset(queryset, request)
+
+    def get_paginated_response(self, data):
+        if not self.keyset:
+            return super().get_paginated_response(data)
+
+        return Response({
+            'next': self.get_next_link(),
+            'previous': self.get_previous_link(),
+            'results': data,
+        })
+
+    def get_next_link(self):
+        if not self.keyset:
+            return super().get_next_link()
+        if not self.has_next:
+            return None
+        return self.encode_cursor(self.page[-1], reverse=False)
+
+    def get_previous_link(self):
+        if not self.keyset:
+            return super().get_previous_link()
+        if not self.has_previous:
+            return None
+        return self.encode_cursor(self.page[0], reverse=True)
+
+    def get_keyset(self, request, view) -> tuple | None:
+        """Возвращает ключ сортировки представления, если запрошен режим keyset
+
+        Returns:
+            кортеж имен полей (с префиксом '-' для сортировки по убыванию) или None
+        """
+        if not (keyset := getattr(view, 'keyset_ordering', None)):
+            return None
+        if any((
+            request.query_params.get(self.mode_query_param) == self.mode_query_value,
+            self.cursor_query_param in request.query_params,
+        )):
+            return tuple(keyset)
+        return None
+
+    def paginate_keyset(self, queryset, request) -> list:
+        self.request = request
+        self.limit = self.get_limit(request) or self.keyset_default_limit
+        self.display_page_controls = False
+        self.model = queryset.model
+        self.fields = [
+            (queryset.model._meta.get_field(name.lstrip('-')), name.startswith('-'))
+            for name in self.keyset
+        ]
+
+        position, reverse = self.decode_cursor(request)
+
+        queryset = queryset.order_by(*self._get_ordering(reverse))
+        if position is not None:
+            queryset = queryset.filter(self._get_filter(position, reverse))
+
+        #: Одна лишняя запись позволяет определить наличие следующей страницы без COUNT(*)
+        page = list(queryset[:self.limit + 1])
+        has_more = len(page) > self.limit
+        self.page = page[:self.limit]
+
+        if reverse:
+            self.page.reverse()
+            self.has_next, self.has_previous = position is not None, has_more
+        else:
+            self.has_next, self.has_previous = has_more, position is not None
+
+        return self.page
+
+    def encode_cursor(self, obj, reverse: bool) -> str:
+        if isinstance(obj, dict):
+            #: Строка QuerySet.values() - значения ключа переносятся в модель для преобразования в строку
+            obj = self.model(**{field.attname: obj[field.name] for field, _ in self.fields})
+        position = [
+            None if getattr(obj, field.attname) is None else field.value_to_string(obj)
+            for field, _ in self.fields
+        ]
+        token = base64.urlsafe_b64encode(json.dumps({'p': position, 'r': reverse}).encode()).decode()
+
+        url = self.request.build_absolute_uri()
+        url = replace_query_param(url, self.limit_query_param, self.limit)
+        url = remove_query_param(url, self.offset_query_param)
+        return replace_query_param(url, self.cursor_query_param, token)
+
+    def decode_cursor(self, request) -> tuple[list | None, bool]:
+        """Разбирает параметр cursor запроса
+
+        Returns:
+            значения полей ключа последней записи и флаг обратного направления
+        """
+        if not (token := request.query_params.get(self.cursor_query_param)):
+            return None, False
+        try:
+            cursor = json.loads(base64.urlsafe_b64decode(token.encode()))
+            position = [
+                None if value is None else field.to_python(value)
+                for (field, _), value in zip(self.fields, cursor['p'], strict=True)
+            ]
+            reverse = bool(cursor['r'])
+        except (binascii.Error, ValueError, TypeError, KeyError, ValidationError):
+            raise NotFound(self.invalid_cursor_message)
+
+        return position, reverse
+
+    def _get_ordering(self, reverse: bool) -> list:
+        ordering = []
+        for field, descending in self.fields:
+            if descending != reverse:
+                ordering.append(F(field.name).desc(nulls_first=True))
+            else:
+                ordering.append(F(field.name).asc(nulls_last=True))
+        return ordering
+
+    def _get_filter(self, position: list, reverse: bool) -> Q:
+        #: (f1 > v1) OR (f1 = v1 AND f2 > v2) OR ... с учетом направления и NULL
+        condition = Q(pk__in=[])
+        equal = Q()
+        for (field, descending), value in zip(self.fields, position):
+            name = field.name
+            if descending != reverse:
+                after = Q(**{f'{name}__isnull': False}) if value is None else Q(**{f'{name}__lt': value})
+            elif value is None:
+                after = None
+            else:
+                after = Q(**{f'{name}__gt': value})
+                if field.null:
+                    after |= Q(**{f'{name}__isnull': True})
+
+            if after is not None:
+                condition |= equal & after
+            equal &= Q(**{f'{name}__isnull': True}) if value is None else Q(**{name: value})
+
+        return condition
@@ -1,5 +1,6 @@
 from rest_framework.permissions import SAFE_METHODS, IsAuthenticated
 
+from goals.membership import has_board_role
 from goals.models import BoardParticipant, Category, Board, Goal, Comment
 
 
@@ -12,12 +13,12 @@ class BoardPermissions(IsAuthenticated):
     message = 'Delete or edit boards can owners only.'
 
     def has_object_permission(self, request, view, obj: Board) -> bool:
-        _filters: dict = {'user_id': request.user.id}
+        roles = None
 
         if request.method not in SAFE_METHODS:
-            _filters['role'] = BoardParticipant.Role.owner
+            roles = (BoardParticipant.Role.owner,)
 
-        return obj.participants.filter(**_filters).exists()
+        return has_board_role(request, obj.id, roles)
 
 
 class IsOwnerOrWriter(IsAuthenticated):
@@ -27,24 +28,19 @@ class IsOwnerOrWriter(IsAuthenticated):
         - редактирование: только владелец или редактор
     """
     message = 'Delete or edit object can owners or writers only.'
-    board = None
 
     def has_object_permission(self, request, view, obj) -> bool:
-        _filters: dict = {'user_id': request.user.id}
-
-        if isinstance(obj, Category):
-            self.board = obj.board
-        elif isinstance(obj, Goal):
-            self.board = obj.category.board
-        elif isinstance(obj, Comment):
-            self.board = obj.goal.category.board
+        roles = None
+
+        if isinstance(obj, (Category, Goal, Comment)):
+            board_id = obj.board_id
         else:
             return False
 
         if request.method not in SAFE_METHODS:
-            _filters['role__in'] = (BoardParticipant.Role.owner, BoardParticipant.Role.writer,)
+            roles = (BoardParticipant.Role.owner, BoardParticipant.Role.writer,)
 
-        return self.board.participants.filter(**_filters).exists()
+        return has_board_role(request, board_id, roles)
 
 
 class IsCommentOwner(IsAuthenticated):
@@ -58,5 +54,5 @@ class IsCommentOwner(IsAuthenticated):
     def has_object_permission(self, request, view, obj: Comment) -> bool:
         return any((
             request.method in SAFE_METHODS,
-            obj.user.id == request.user.id
+            obj.user_id == request.user.id
         ))
@@ -1,4 +1,4 @@
-from rest_framework.routers import Route, SimpleRouter
+from rest_framework.routers import DynamicRoute, Route, SimpleRouter
 
 
 class CustomAPIRouter(SimpleRouter):
@@ -21,6 +21,13 @@ class CustomAPIRouter(SimpleRouter):
             detail=False,
             initkwargs={'suffix': 'List'}
         ),
+        #: Dynamically generated list routes (@action(detail=False)).
+        DynamicRoute(
+            url=r'^{prefix}/{url_path}{trailing_slash}$',
+            name='{basename}-{url_name}',
+            detail=False,
+            initkwargs={}
+        ),
         #: Detail route.
         Route(
             url=r'^{prefix}/{lookup}{trailing_slash}$',
@@ -34,4 +41,11 @@ class CustomAPIRouter(SimpleRouter):
             detail=True,
             initkwargs={'suffix': 'Instance'}
         ),
+        #: Dynamically generated detail routes (@action(detail=True)).
+        DynamicRoute(
+            url=r'^{prefix}/{lookup}/{url_path}{trailing_slash}$',
+            name='{basename}-{url_name}',
+            detail=True,
+            initkwargs={}
+        ),
     ]
@@ -1,9 +1,17 @@
-from django.db import transaction
-from rest_framework import serializers, exceptions
+from collections import Counter, defaultdict
+from functools import partial
+
+from django.conf import settings
+from django.db import models, transaction
+from django.utils import timezone
+from rest_framework import ISO_8601, serializers, exceptions
+from rest_framework.settings import api_settings
 
 from core.models import User
 from core.serializers import ProfileSerializer
-from goals.models import Category, Goal, Comment, Board, BoardParticipant
+from goals.list_cache import invalidate_boards
+from goals.membership import get_board_roles, has_board_role, invalidate_board_roles
+from goals.models import Category, Goal, Comment, Board, BoardParticipant, BoardGoalCounter, BoardImport, DeletionJob
 
 
 class BoardCreateSerializer(serializers.ModelSerializer):
@@ -26,18 +34,66 @@ class BoardCreateSerializer(serializers.ModelSerializer):
         fields = '__all__'
 
 
+class ParticipantUserField(serializers.SlugRelatedField):
+    """Поле пользователя участника доски по username
+
+    При валидации списка участников пользователи берутся из словаря, загруженного
+    BoardParticipantListSerializer, без запроса к базе данных
+    """
+
+    def to_internal_value(self, data):
+        users: dict | None = getattr(self.parent, 'users', None)
+        if users is None:
+            return super().to_internal_value(data)
+        try:
+            return users[str(data)]
+        except KeyError:
+            self.fail('does_not_exist', slug_name=self.slug_field, value=str(data))
+
+
+class BoardParticipantListSerializer(serializers.ListSerializer):
+    """Сериализатор списка участников доски
+
+    Пользователи всех участников загружаются одним запросом по списку username,
+    неизвестные имена пользователей возвращаются одной ошибкой
+    """
+    default_error_messages = {
+        'unknown_users': 'Users do not exist: {usernames}.',
+    }
+
+    def to_internal_value(self, data):
+        if isinstance(data, list):
+            self.child.users = self._resolve_users(data)
+        return super().to_internal_value(data)
+
+    def _resolve_users(self, data: list) -> dict:
+        usernames = {str(item['user']) for item in data if isinstance(item, dict) and item.get('user') is not None}
+        users = User.objects.filter(username__in=usernames).in_bulk(field_name='username')
+        if unknown := usernames - users.keys():
+            self.fail('unknown_users', usernames=', '.join(sorted(unknown)))
+        return users
+
+    def to_representation(self, data):
+        iterable = data.all() if isinstance(data, models.Manager) else data
+        #: Участники, не загруженные заранее (prefetch_related), загружаются вместе с пользователями
+        if isinstance(iterable, models.QuerySet) and iterable._result_cache is None:
+            iterable = iterable.select_related('user')
+        return super().to_representation(iterable)
+
+
 class BoardParticipantSerializer(serializers.ModelSerializer):
     """Сериализатор модели BoardParticipant
 
     Для преобразования данных об участниках доски
     """
     role = serializers.ChoiceField(required=True, choices=BoardParticipant.Role.choices[1:])
-    user = serializers.SlugRelatedField(slug_field='username', queryset=User.objects.all())
+    user = ParticipantUserField(slug_field='username', queryset=User.objects.all())
 
     class Meta:
         model = BoardParticipant
         fields = '__all__'
         read_only_fields = ('id', 'created', 'updated', 'board',)
+        list_serializer_class = BoardParticipantListSerializer
 
 
 class BoardUpdateSerializer(serializers.ModelSerializer):
@@ -57,21 +113,8 @@ class BoardUpdateSerializer(serializers.ModelSerializer):
     def update(self, instance: Board, validated_data: dict) -> Board:
         owner = validated_data.pop('user')
         if new_participants := validated_data.get('participants'):
-            new_by_id = {part['user'].id: part for part in new_participants}
-            old_participants = instance.participants.exclude(user=owner)
-            with transaction.atomic():
-                for old_participant in old_participants:
-                    if old_participant.user_id not in new_by_id:
-                        old_participant.delete()
-                    else:
-                        if old_participant.role != new_by_id[old_participant.user_id]['role']:
-                            old_participant.role = new_by_id[old_participant.user_id]['role']
-                            old_participant.save()
-                        new_by_id.pop(old_participant.user_id)
-                for new_part in new_by_id.values():
-                    BoardParticipant.objects.create(
-                        user=new_part['user'], board=instance, role=new_part['role']
-                    )
+            self._sync_participants(instance, owner, new_participants)
+
         if title := validated_data.get('title'):
             instance.title = title
 
@@ -79,6 +122,45 @@ class BoardUpdateSerializer(serializers.ModelSerializer):
 
         return instance
 
+    #: Синхронизация участников доски (кроме владельца) фиксированным количеством запросов
+    @staticmethod
+    def _sync_participants(instance: Board, owner: User, new_participants: list) -> None:
+        new_roles = {part['user'].id: part['role'] for part in new_participants if part['user'].id != owner.id}
+
+        with transaction.atomic():
+            old_participants = {
+                participant.user_id: participant
+                for participant in instance.participants.exclude(user=owner).select_for_update()
+            }
+
+            removed = old_participants.keys() - new_roles.keys()
+            if removed:
+                #: Удаление одним запросом без сигналов модели (у участников нет зависимых моделей):
+                #: QuerySet.delete() при наличии сигналов читает строки и удаляет их пакетами по 100
+                BoardParticipant.objects.filter(
+                    id__in=[old_participants[user_id].id for user_id in removed]
+                )._raw_delete(BoardParticipant.objects.db)
+
+            now = timezone.now()
+            changed = []
+            for user_id, participant in old_participants.items():
+                if user_id in new_roles and participant.role != new_roles[user_id]:
+                    participant.role, participant.updated = new_roles[user_id], now
+                    changed.append(participant)
+            BoardParticipant.objects.bulk_update(changed, fields=('role', 'updated',))
+
+            added = new_roles.keys() - old_participants.keys()
+            BoardParticipant.objects.bulk_create(
+                BoardParticipant(board=instance, user_id=user_id, role=new_roles[user_id]) for user_id in added
+            )
+
+            #: Удаление, bulk_update и bulk_create не отправляют сигналы модели - кэш ролей сбрасывается явно
+            #: после фиксации транзакции, чтобы параллельный запрос не сохранил в кэше прежнюю роль
+            user_ids = [*removed, *added, *(part.user_id for part in changed)]
+            if user_ids:
+                transaction.on_commit(lambda: invalidate_board_roles(board_id=instance.id, user_ids=user_ids))
+                invalidate_boards(instance.id)
+
 
 class BoardListSerializer(serializers.ModelSerializer):
     """Сериализатор представления BoardViewSet
@@ -90,6 +172,47 @@ class BoardListSerializer(serializers.ModelSerializer):
         fields = '__all__'
 
 
+class BoardImportCreateSerializer(serializers.Serializer):
+    """Сериализатор представления BoardViewSet
+
+    Action import_board: файл NDJSON и идентификатор прерванного импорта для продолжения
+    """
+    file = serializers.FileField()
+    board_import = serializers.PrimaryKeyRelatedField(
+        queryset=BoardImport.objects.exclude(status=BoardImport.Status.done), required=False
+    )
+
+    def validate_file(self, value):
+        #: Импорт выполняется в запросе - размер файла ограничен (большие файлы импортируются командой import_board)
+        if value.size > settings.IMPORT_MAX_SIZE:
+            raise serializers.ValidationError(f'File size must not exceed {settings.IMPORT_MAX_SIZE} bytes')
+        return value
+
+    def validate_board_import(self, value: BoardImport) -> BoardImport:
+        #: Продолжить можно только собственный импорт
+        if value.user_id != self.context['request'].user.id:
+            raise serializers.ValidationError('Invalid import')
+        return value
+
+
+class BoardImportSerializer(serializers.ModelSerializer):
+    """Сериализатор результата импорта доски"""
+
+    class Meta:
+        model = BoardImport
+        fields = ('id', 'board', 'status', 'position', 'stats', 'error', 'created', 'updated',)
+        read_only_fields = fields
+
+
+class DeletionJobSerializer(serializers.ModelSerializer):
+    """Сериализатор задачи удаления доски или категории"""
+
+    class Meta:
+        model = DeletionJob
+        fields = ('id', 'board', 'category', 'status', 'processed', 'error', 'created', 'updated',)
+        read_only_fields = fields
+
+
 class CategoryCreateSerializer(serializers.ModelSerializer):
     """Сериализатор представления CategoryViewSet
 
@@ -102,17 +225,17 @@ class CategoryCreateSerializer(serializers.ModelSerializer):
         if value.is_deleted:
             raise serializers.ValidationError('Not allowed in deleted category')
         #: Проверка роли пользователя
-        if not value.participants.filter(
-            user_id=self.context['request'].user.id,
-            role__in=(BoardParticipant.Role.owner, BoardParticipant.Role.writer,)
-        ).exists():
+        if not has_board_role(
+            self.context['request'], value.id,
+            roles=(BoardParticipant.Role.owner, BoardParticipant.Role.writer,)
+        ):
             raise exceptions.PermissionDenied
 
         return value
 
     class Meta:
         model = Category
-        fields = '__all__'
+        exclude = ('search_vector',)
         read_only_fields = ('id', 'created', 'updated', 'user', 'is_deleted',)
 
 
@@ -125,7 +248,7 @@ class CategoryListSerializer(serializers.ModelSerializer):
 
     class Meta:
         model = Category
-        fields = '__all__'
+        exclude = ('search_vector',)
         read_only_fields = ('id', 'created', 'updated', 'user', 'board',)
 
 
@@ -135,23 +258,24 @@ class GoalCreateSerializer(serializers.ModelSerializer):
     Action create
     """
     user = serializers.HiddenField(default='user')
+    category = serializers.PrimaryKeyRelatedField(queryset=Category.objects.select_related('board'))
 
     def validate_category(self, value: Category) -> Category:
-        #: Проверка статуса категории
-        if value.is_deleted:
+        #: Проверка статуса категории (и доски, категории которой удаляются фоновой задачей)
+        if value.is_deleted or value.board.is_deleted:
             raise serializers.ValidationError('Not allowed in deleted category')
         #: Проверка роли пользователя
-        if not value.board.participants.filter(
-                user_id=self.context['request'].user.id,
-                role__in=(BoardParticipant.Role.owner, BoardParticipant.Role.writer,)
-        ).exists():
+        if not has_board_role(
+            self.context['request'], value.board_id,
+            roles=(BoardParticipant.Role.owner, BoardParticipant.Role.writer,)
+        ):
             raise exceptions.PermissionDenied
 
         return value
 
     class Meta:
         model = Goal
-        fields = '__all__'
+        exclude = ('board', 'search_vector',)
         read_only_fields = ('id', 'created', 'updated', 'user',)
 
 
@@ -164,33 +288,179 @@ class GoalListSerializer(serializers.ModelSerializer):
 
     class Meta:
         model = Goal
-        fields = '__all__'
+        exclude = ('board', 'search_vector',)
         read_only_fields = ('id', 'created', 'updated', 'user',)
 
 
+class GoalBulkCreateSerializer(serializers.ModelSerializer):
+    """Сериализатор создаваемой цели в GoalBulkSerializer
+
+    Категория проверяется в GoalBulkSerializer одним запросом для всех целей
+    """
+    category = serializers.IntegerField()
+
+    class Meta:
+        model = Goal
+        fields = ('category', 'title', 'description', 'status', 'priority', 'due_date',)
+
+
+class GoalBulkUpdateSerializer(GoalBulkCreateSerializer):
+    """Сериализатор изменяемой цели в GoalBulkSerializer
+
+    Передаются идентификатор цели и изменяемые поля
+    """
+    id = serializers.IntegerField()
+    category = serializers.IntegerField(required=False)
+
+    class Meta(GoalBulkCreateSerializer.Meta):
+        fields = ('id', *GoalBulkCreateSerializer.Meta.fields)
+        extra_kwargs = {'title': {'required': False}}
+
+
+class GoalBulkSerializer(serializers.Serializer):
+    """Сериализатор представления GoalViewSet
+
+    Action bulk: создание (create), частичное изменение (update) и архивация (archive) целей.
+    Категории, цели и роли пользователя на досках загружаются одним запросом каждые,
+    изменения сохраняются через bulk_create/bulk_update в одной транзакции.
+    """
+    #: Максимальное количество целей в одном запросе
+    max_items = 1000
+
+    #: Поля create и update совпадают с именами методов сериализатора, поэтому объявлены здесь
+    def get_fields(self) -> dict:
+        return {
+            'create': GoalBulkCreateSerializer(many=True, required=False),
+            'update': GoalBulkUpdateSerializer(many=True, required=False),
+            'archive': serializers.ListField(child=serializers.IntegerField(), required=False),
+        }
+
+    def validate(self, attrs: dict) -> dict:
+        creates, updates, archives = attrs.get('create', []), attrs.get('update', []), attrs.get('archive', [])
+        if len(creates) + len(updates) + len(archives) > self.max_items:
+            raise serializers.ValidationError(f'No more than {self.max_items} goals allowed')
+
+        goal_ids = [item['id'] for item in updates] + archives
+        if len(goal_ids) != len(set(goal_ids)):
+            raise serializers.ValidationError('Each goal can be changed only once')
+
+        #: Категории и цели загружаются одним запросом каждые
+        category_ids = {item['category'] for item in creates + updates if 'category' in item}
+        categories = Category.objects.filter(
+            id__in=category_ids, is_deleted=False, board__is_deleted=False
+        ).only('id', 'board_id').in_bulk()
+        if missing := category_ids - categories.keys():
+            raise serializers.ValidationError({'category': [f'Invalid categories: {sorted(missing)}']})
+
+        goals = Goal.objects.filter(
+            id__in=goal_ids, category__is_deleted=False, board__is_deleted=False
+        ).exclude(status=Goal.Status.archived).select_related('user').defer('search_vector').in_bulk()
+        if missing := set(goal_ids) - goals.keys():
+            raise serializers.ValidationError({'goal': [f'Invalid goals: {sorted(missing)}']})
+
+        #: Роль пользователя проверяется один раз для каждой доски
+        board_ids = {category.board_id for category in categories.values()} | {
+            goal.board_id for goal in goals.values()
+        }
+        roles = get_board_roles(self.context['request'], board_ids)
+        if any(role not in (BoardParticipant.Role.owner, BoardParticipant.Role.writer) for role in roles.values()):
+            raise exceptions.PermissionDenied
+
+        attrs['categories'], attrs['goals'] = categories, goals
+        return attrs
+
+    def create(self, validated_data: dict) -> dict:
+        user, categories, goals = validated_data['user'], validated_data['categories'], validated_data['goals']
+        now = timezone.now()
+
+        new_goals = []
+        for item in validated_data.get('create', []):
+            category = categories[item.pop('category')]
+            #: bulk_create не вызывает Goal.save(), поэтому доска задается явно
+            new_goals.append(Goal(**item, category_id=category.id, board_id=category.board_id, user=user))
+
+        with transaction.atomic():
+            #: Исходные ключи счетчиков читаются из заблокированных строк: загруженные при проверке
+            #: объекты могли быть изменены параллельной транзакцией
+            locked = Goal.objects.filter(id__in=goals.keys()).lock_counter_fields()
+            deltas = Counter()
+            for goal_id, row in locked.items():
+                goal = goals[goal_id]
+                goal.category_id, goal.board_id, goal.status, goal.priority = (
+                    row['category_id'], row['board_id'], row['status'], row['priority']
+                )
+                deltas[goal.get_counter_key()] -= 1
+
+            changed_goals, fields = [], {'updated'}
+            moved_goals = defaultdict(list)
+            for item in validated_data.get('update', []):
+                goal = goals[item.pop('id')]
+                if 'category' in item:
+                    category = categories[item.pop('category')]
+                    if category.board_id != goal.board_id:
+                        moved_goals[category.board_id].append(goal.id)
+                    goal.category_id, goal.board_id = category.id, category.board_id
+                    fields |= {'category', 'board'}
+                for name, value in item.items():
+                    setattr(goal, name, value)
+                fields |= item.keys()
+                changed_goals.append(goal)
+
+            archived_goals = [goals[goal_id] for goal_id in validated_data.get('archive', [])]
+            for goal in archived_goals:
+                goal.status = Goal.Status.archived
+                fields.add('status')
+
+            for goal_id in locked:
+                goals[goal_id].updated = now
+                deltas[goals[goal_id].get_counter_key()] += 1
+
+            if new_goals:
+                Goal.objects.bulk_create(new_goals)
+                deltas.update(goal.get_counter_key() for goal in new_goals)
+            if changed_goals or archived_goals:
+                Goal.objects.bulk_update(changed_goals + archived_goals, fields=sorted(fields))
+            for board_id, goal_ids in moved_goals.items():
+                Comment.objects.filter(goal_id__in=goal_ids).update(board_id=board_id)
+            #: bulk_create и bulk_update не вызывают Goal.save() и сигналы моделей,
+            #: поэтому счетчики досок и кэш ответов списков (доски до и после изменения) обновляются явно
+            BoardGoalCounter.objects.add(deltas)
+            invalidate_boards(*{key[0] for key in deltas})
+
+        return {'create': new_goals, 'update': changed_goals, 'archive': archived_goals}
+
+    def to_representation(self, instance: dict) -> dict:
+        return {
+            'create': GoalListSerializer(instance['create'], many=True).data,
+            'update': GoalListSerializer(instance['update'], many=True).data,
+            'archive': [goal.id for goal in instance['archive']],
+        }
+
+
 class CommentCreateSerializer(serializers.ModelSerializer):
     """Сериализатор представления CommentViewSet
 
     Action create
     """
     user = serializers.HiddenField(default='user')
+    goal = serializers.PrimaryKeyRelatedField(queryset=Goal.objects.select_related('category', 'board'))
 
     def validate_goal(self, value: Goal) -> Goal:
-        #: Проверка статуса цели
-        if value.status == Goal.Status.archived:
+        #: Проверка статуса цели (и категории, доски, цели которых архивируются фоновой задачей)
+        if value.status == Goal.Status.archived or value.category.is_deleted or value.board.is_deleted:
             raise serializers.ValidationError('Not allowed in archived goal')
         #: Проверка роли пользователя
-        if not value.category.board.participants.filter(
-                user_id=self.context['request'].user.id,
-                role__in=(BoardParticipant.Role.owner, BoardParticipant.Role.writer,)
-        ).exists():
+        if not has_board_role(
+            self.context['request'], value.board_id,
+            roles=(BoardParticipant.Role.owner, BoardParticipant.Role.writer,)
+        ):
             raise exceptions.PermissionDenied
 
         return value
 
     class Meta:
         model = Comment
-        fields = '__all__'
+        exclude = ('board',)
         read_only_fields = ('id', 'created', 'updated',)
 
 
@@ -203,5 +473,95 @@ class CommentListSerializer(serializers.ModelSerializer):
 
     class Meta:
         model = Comment
-        fields = '__all__'
+        exclude = ('board',)
         read_only_fields = ('id', 'created', 'updated', 'user', 'goal',)
+
+
+class ValuesSerializer:
+    """Быстрый сериализатор списков по строкам QuerySet.values()
+
+    Соответствие полей ответа столбцам .values() и функции преобразования значений
+    вычисляются один раз по полям исходного ModelSerializer (включая вложенные сериализаторы),
+    поэтому ответ совпадает с ответом исходного сериализатора. Числа и строки выводятся
+    без преобразования, даты форматируются по DATETIME_FORMAT в текущем часовом поясе,
+    который определяется один раз для всего списка.
+    """
+
+    #: Поля, значения которых выводятся без преобразования
+    plain_fields = (
+        serializers.IntegerField, serializers.CharField, serializers.BooleanField,
+        serializers.ChoiceField, serializers.PrimaryKeyRelatedField,
+    )
+
+    def __init__(self, serializer_class: type[serializers.ModelSerializer]):
+        self.serializer_class = serializer_class
+        self._mapping = None
+
+    @property
+    def columns(self) -> list[str]:
+        """Столбцы для QuerySet.values()"""
+        return self._get_mapping()[0]
+
+    def to_representation(self, rows) -> list[dict]:
+        """Преобразует строки QuerySet.values(*columns) в данные ответа"""
+        _, fields = self._get_mapping()
+        tz = timezone.get_current_timezone() if settings.USE_TZ else None
+        return [self._build(row, fields, tz) for row in rows]
+
+    def _build(self, row: dict, fields: list, tz) -> dict:
+        data = {}
+        for name, column, convert in fields:
+            if isinstance(column, list):
+                #: Вложенный объект: column - поля объекта, convert - столбец первичного ключа
+                data[name] = None if row[convert] is None else self._build(row, column, tz)
+                continue
+            value = row[column]
+            data[name] = value if value is None or convert is None else convert(value, tz)
+        return data
+
+    def _get_mapping(self) -> tuple[list, list]:
+        #: Поля сериализатора определяются после загрузки моделей, поэтому соответствие вычисляется при первом вызове
+        if self._mapping is None:
+            columns = []
+            fields = self._compile(self.serializer_class(), prefix='', columns=columns)
+            self._mapping = list(dict.fromkeys(columns)), fields
+        return self._mapping
+
+    def _compile(self, serializer: serializers.ModelSerializer, prefix: str, columns: list) -> list:
+        fields = []
+        for name, field in serializer.fields.items():
+            if field.write_only:
+                continue
+            column = prefix + '__'.join(field.source_attrs)
+            if isinstance(field, serializers.ModelSerializer):
+                pk_column = f'{column}__{field.Meta.model._meta.pk.name}'
+                columns.append(pk_column)
+                fields.append((name, self._compile(field, prefix=f'{column}__', columns=columns), pk_column))
+                continue
+            if not field.source_attrs or (
+                isinstance(field, (serializers.RelatedField, serializers.BaseSerializer))
+                and not isinstance(field, self.plain_fields)
+            ):
+                raise TypeError(f'{type(field).__name__} is not supported by {type(self).__name__}')
+
+            columns.append(column)
+            fields.append((name, column, self._get_converter(field)))
+        return fields
+
+    def _get_converter(self, field: serializers.Field):
+        if isinstance(field, self.plain_fields):
+            return None
+
+        output_format = getattr(field, 'format', api_settings.DATETIME_FORMAT)
+        if isinstance(field, serializers.DateTimeField) and not hasattr(field, 'timezone') \
+                and isinstance(output_format, str) and output_format.lower() != ISO_8601:
+            return partial(self._format_datetime, field, output_format)
+
+        return lambda value, tz: field.to_representation(value)
+
+    @staticmethod
+    def _format_datetime(field: serializers.DateTimeField, output_format: str, value, tz) -> str:
+        #: Аналог DateTimeField.to_representation с часовым поясом, определенным для всего списка
+        if tz is None or not timezone.is_aware(value):
+            return field.to_representation(value)
+        return value.astimezone(tz).strftime(output_format)
@@ -0,0 +1,59 @@
+from collections import Counter
+
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from core.models import User
+from goals.list_cache import invalidate_boards
+from goals.membership import invalidate_board_role
+from goals.models import Board, BoardGoalCounter, BoardParticipant, Category, Comment, Goal
+
+
+@receiver([post_save, post_delete], sender=BoardParticipant)
+def reset_board_role(sender, instance: BoardParticipant, **kwargs) -> None:
+    """Сбрасывает кэш роли участника доски при ее изменении или удалении"""
+    invalidate_board_role(board_id=instance.board_id, user_id=instance.user_id)
+
+
+@receiver(post_delete, sender=Goal)
+def decrement_goal_counter(sender, instance: Goal, **kwargs) -> None:
+    """Уменьшает счетчик целей доски при удалении цели"""
+    if (key := instance.get_counter_key()) is not None:
+        BoardGoalCounter.objects.add(Counter({key: -1}))
+
+
+@receiver([post_save, post_delete], sender=Board)
+def reset_board_lists(sender, instance: Board, **kwargs) -> None:
+    """Сбрасывает кэш ответов списков при изменении или удалении доски"""
+    invalidate_boards(instance.id)
+
+
+@receiver([post_save, post_delete], sender=BoardParticipant)
+@receiver([post_save, post_delete], sender=Comment)
+def reset_related_board_lists(sender, instance: BoardParticipant | Comment, **kwargs) -> None:
+    """Сбрасывает кэш ответов списков доски при изменении или удалении участника или комментария"""
+    invalidate_boards(instance.board_id)
+
+
+@receiver([post_save, post_delete], sender=Category)
+def reset_category_board_lists(sender, instance: Category, **kwargs) -> None:
+    """Сбрасывает кэш ответов списков доски категории (и исходной доски при переносе категории)"""
+    invalidate_boards(instance.board_id, getattr(instance, '_loaded_board_id', None))
+
+
+@receiver([post_save, post_delete], sender=Goal)
+def reset_goal_board_lists(sender, instance: Goal, **kwargs) -> None:
+    """Сбрасывает кэш ответов списков доски цели (и исходной доски при смене категории)"""
+    invalidate_boards(instance.board_id, getattr(instance, '_loaded_board_id', None))
+
+
+@receiver(post_save, sender=User)
+def reset_user_board_lists(sender, instance: User, created: bool, update_fields=None, **kwargs) -> None:
+    """Сбрасывает кэш ответов списков досок пользователя при изменении профиля
+
+    Профиль автора входит в ответы списков категорий, целей и комментариев.
+    Создание пользователя и обновление даты последнего входа кэш не сбрасывают.
+    """
+    if created or update_fields is not None and set(update_fields) <= {'last_login'}:
+        return
+    invalidate_boards(*BoardParticipant.objects.filter(user_id=instance.id).values_list('board_id', flat=True))
@@ -1,7 +1,7 @@
 from django.urls import path, include
 
 from goals.routers import CustomAPIRouter
-from goals.views import BoardViewSet, CategoryViewSet, GoalViewSet, CommentViewSet
+from goals.views import BoardViewSet, CategoryViewSet, GoalViewSet, CommentViewSet, DeletionJobViewSet
 
 board_router = CustomAPIRouter(trailing_slash=False)
 board_router.register('board', BoardViewSet)
@@ -15,10 +15,14 @@ goal_router.register('goal', GoalViewSet)
 comment_router = CustomAPIRouter(trailing_slash=False)
 comment_router.register('goal_comment', CommentViewSet)
 
+deletion_router = CustomAPIRouter(trailing_slash=False)
+deletion_router.register('deletion', DeletionJobViewSet, basename='deletion')
+
 app_name = 'goals'
 urlpatterns = [
     path('', include(board_router.urls)),
     path('', include(category_router.urls)),
     path('', include(goal_router.urls)),
     path('', include(comment_router.urls)),
+    path('', include(deletion_router.urls)),
 ]
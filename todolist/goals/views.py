@@ -1,17 +1,27 @@
+from django.conf import settings
 from django.db import transaction
+from django.http import StreamingHttpResponse
 from django_filters.rest_framework import DjangoFilterBackend
-from rest_framework import viewsets, filters, permissions
-
-from goals.filters import GoalsFilter
-from goals.models import Category, Goal, Comment, Board
+from rest_framework import viewsets, filters, mixins, permissions, status
+from rest_framework.decorators import action
+from rest_framework.exceptions import ValidationError
+from rest_framework.response import Response
+
+from goals.deletion import schedule_board_deletion, schedule_category_deletion
+from goals.export import EXPORT_FORMATS, iter_board_export
+from goals.importer import BoardImporter, BoardImportError
+from goals.filters import FullTextSearchFilter, GoalsFilter
+from goals.mixins import ConditionalGetMixin, ListCacheMixin, ValuesListMixin
+from goals.models import Category, Goal, Comment, Board, BoardGoalCounter, BoardImport, DeletionJob
 from goals.permissions import BoardPermissions, IsOwnerOrWriter, IsCommentOwner
 from goals.serializers import (
-    CategoryCreateSerializer, CategoryListSerializer, GoalCreateSerializer, GoalListSerializer,
-    CommentCreateSerializer, CommentListSerializer, BoardCreateSerializer, BoardUpdateSerializer, BoardListSerializer
+    CategoryCreateSerializer, CategoryListSerializer, GoalCreateSerializer, GoalListSerializer, GoalBulkSerializer,
+    CommentCreateSerializer, CommentListSerializer, BoardCreateSerializer, BoardUpdateSerializer, BoardListSerializer,
+    BoardImportCreateSerializer, BoardImportSerializer, DeletionJobSerializer, ValuesSerializer
 )
 
 
-class BoardViewSet(viewsets.ModelViewSet):
+class BoardViewSet(ConditionalGetMixin, ListCacheMixin, viewsets.ModelViewSet):
     """Представление для обработки запроса на эндпоинт /goals/board{/<id>}
 
     Действия над доской
@@ -22,22 +32,78 @@ class BoardViewSet(viewsets.ModelViewSet):
     filter_backends = [filters.OrderingFilter]
     ordering_fields = ['title', 'created']
     ordering = ['title']
+    keyset_ordering = ('title', 'id')
 
     _serializers = {
         'create': BoardCreateSerializer,
         'list': BoardListSerializer,
+        'import_board': BoardImportCreateSerializer,
     }
     _default_serializer = BoardUpdateSerializer
 
+    #: Бюджет SQL запросов действий (с учетом запросов сессии и пользователя), см. QueryBudgetMiddleware
+    query_budgets = {'list': 7, 'retrieve': 6, 'summary': 6, 'export': 4, 'create': 4}
+
     #: Получение сериализатора
     def get_serializer_class(self):
         return self._serializers.get(self.action, self._default_serializer)
 
     #: Переопределяем метод для отображения досок с учетом полей user и is_deleted.
     def get_queryset(self):
-        return super().get_queryset().prefetch_related('participants__user').filter(
-            participants__user_id=self.request.user.id,
+        queryset = super().get_queryset()
+        if self.action not in ('summary', 'export'):
+            queryset = queryset.prefetch_related('participants__user')
+        return queryset.filter(participants__user_id=self.request.user.id)
+
+    #: Версия доски учитывает список участников (загружены prefetch_related)
+    def get_object_version(self, instance: Board) -> tuple:
+        participants = instance.participants.all()
+        return len(participants), max([instance.updated, *(participant.updated for participant in participants)])
+
+    #: Сводка по целям доски: GET /goals/board/<id>/summary
+    @action(detail=True, methods=['get'])
+    def summary(self, request, *args, **kwargs):
+        board: Board = self.get_object()
+        return Response({'board': board.id, **BoardGoalCounter.objects.get_summary(board_id=board.id)})
+
+    #: Потоковый экспорт доски: GET /goals/board/<id>/export?type=ndjson|csv[&gzip=1]
+    #: (параметр format зарезервирован DRF для выбора рендерера)
+    @action(detail=True, methods=['get'])
+    def export(self, request, *args, **kwargs):
+        board: Board = self.get_object()
+
+        file_format = request.query_params.get('type', 'ndjson')
+        if file_format not in EXPORT_FORMATS:
+            raise ValidationError({'type': [f'Available formats: {", ".join(EXPORT_FORMATS)}.']})
+        compress = request.query_params.get('gzip') in ('1', 'true')
+
+        content_type, extension = EXPORT_FORMATS[file_format]
+        filename = f'board-{board.id}.{extension}'
+        if compress:
+            content_type, filename = 'application/gzip', f'{filename}.gz'
+
+        response = StreamingHttpResponse(
+            iter_board_export(board.id, file_format, compress=compress, chunk_size=settings.EXPORT_CHUNK_SIZE),
+            content_type=content_type,
         )
+        response['Content-Disposition'] = f'attachment; filename="{filename}"'
+        return response
+
+    #: Импорт доски из файла NDJSON (формат экспорта): POST /goals/board/import
+    #: Прерванный импорт продолжается повторной отправкой файла с параметром board_import
+    @action(detail=False, methods=['post'], url_path='import', url_name='import')
+    def import_board(self, request, *args, **kwargs):
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+
+        board_import = serializer.validated_data.get('board_import') or BoardImport.objects.create(user=request.user)
+        importer = BoardImporter(board_import, batch_size=settings.IMPORT_BATCH_SIZE)
+        try:
+            importer.run(serializer.validated_data['file'])
+        except BoardImportError:
+            return Response(BoardImportSerializer(board_import).data, status=status.HTTP_400_BAD_REQUEST)
+
+        return Response(BoardImportSerializer(board_import).data, status=status.HTTP_201_CREATED)
 
     #: Переопределяем метод для добавления в serializer поля user (create).
     def perform_create(self, serializer):
@@ -47,35 +113,41 @@ class BoardViewSet(viewsets.ModelViewSet):
     def perform_update(self, serializer):
         serializer.save(user=self.request.user)
 
+    #: Удаление доски: доска скрывается сразу, категории и цели обрабатываются фоновой задачей.
+    #: Ответ 202 содержит задачу, статус которой доступен по GET /goals/deletion/<id>
+    def destroy(self, request, *args, **kwargs):
+        job = self.perform_destroy(self.get_object())
+        return Response(DeletionJobSerializer(job).data, status=status.HTTP_202_ACCEPTED)
+
     #: Переопределяем метод для исключения удаления доски из базы.
-    def perform_destroy(self, instance: Board) -> Board:
-        with transaction.atomic():
-            instance.is_deleted = True
-            instance.save(update_fields=('is_deleted',))
-            instance.categories.update(is_deleted=True)
-            Goal.objects.filter(category__board_id=instance.id).update(status=Goal.Status.archived)
-        return instance
+    def perform_destroy(self, instance: Board) -> DeletionJob:
+        return schedule_board_deletion(instance, user=self.request.user)
 
 
-class CategoryViewSet(viewsets.ModelViewSet):
+class CategoryViewSet(ConditionalGetMixin, ListCacheMixin, ValuesListMixin, viewsets.ModelViewSet):
     """Представление для обработки запроса на эндпоинт /goals/goal_category{/<id>}
 
     Действия над категориями.
     """
-    queryset = Category.objects.all().filter(is_deleted=False)
+    queryset = Category.objects.all().filter(is_deleted=False).defer('search_vector')
 
-    filter_backends = [filters.OrderingFilter, filters.SearchFilter, DjangoFilterBackend]
+    filter_backends = [filters.OrderingFilter, FullTextSearchFilter, DjangoFilterBackend]
     filterset_fields = ['board']
     ordering_fields = ['title', 'created']
     ordering = ['title']
+    keyset_ordering = ('title', 'id')
     search_fields = ['title']
+    search_vector_field = 'search_vector'
 
     _serializers = {'create': CategoryCreateSerializer}
     _default_serializer = CategoryListSerializer
+    values_serializer = ValuesSerializer(CategoryListSerializer)
 
     _permissions = {'create': [permissions.IsAuthenticated()]}
     _default_permissions = [IsOwnerOrWriter()]
 
+    query_budgets = {'list': 5, 'retrieve': 4, 'create': 5}
+
     def get_serializer_class(self):
         return self._serializers.get(self.action, self._default_serializer)
 
@@ -85,41 +157,49 @@ class CategoryViewSet(viewsets.ModelViewSet):
     #: Переопределяем метод для отображения категорий с учетом полей user и is_deleted.
     def get_queryset(self):
         return super().get_queryset().select_related('user', 'board').filter(
-            board__participants__user_id=self.request.user.id
+            board__participants__user_id=self.request.user.id,
+            board__is_deleted=False,
         )
 
     #: Переопределяем метод для добавления в serializer поля user.
     def perform_create(self, serializer):
         serializer.save(user=self.request.user)
 
+    #: Удаление категории: категория скрывается сразу, цели архивируются фоновой задачей.
+    #: Ответ 202 содержит задачу, статус которой доступен по GET /goals/deletion/<id>
+    def destroy(self, request, *args, **kwargs):
+        job = self.perform_destroy(self.get_object())
+        return Response(DeletionJobSerializer(job).data, status=status.HTTP_202_ACCEPTED)
+
     #: Переопределяем метод для исключения удаления категории из базы.
-    def perform_destroy(self, instance: Category) -> Category:
-        with transaction.atomic():
-            instance.is_deleted = True
-            instance.save(update_fields=('is_deleted',))
-            instance.goals.update(status=Goal.Status.archived)
-        return instance
+    def perform_destroy(self, instance: Category) -> DeletionJob:
+        return schedule_category_deletion(instance, user=self.request.user)
 
 
-class GoalViewSet(viewsets.ModelViewSet):
+class GoalViewSet(ConditionalGetMixin, ListCacheMixin, ValuesListMixin, viewsets.ModelViewSet):
     """Представление для обработки запроса на эндпоинт /goals/goal{/<id>}
 
     Действия над целями.
     """
-    queryset = Goal.objects.all().select_related('user', 'category')
+    queryset = Goal.objects.all().select_related('user', 'category').defer('search_vector', 'category__search_vector')
 
-    filter_backends = [filters.OrderingFilter, filters.SearchFilter, DjangoFilterBackend]
+    filter_backends = [filters.OrderingFilter, FullTextSearchFilter, DjangoFilterBackend]
     filterset_class = GoalsFilter
     ordering_fields = ['priority', 'due_date']
     ordering = ['priority']
+    keyset_ordering = ('priority', 'due_date', 'id')
     search_fields = ['title', 'description']
+    search_vector_field = 'search_vector'
 
-    _serializers = {'create': GoalCreateSerializer}
+    _serializers = {'create': GoalCreateSerializer, 'bulk': GoalBulkSerializer}
     _default_serializer = GoalListSerializer
+    values_serializer = ValuesSerializer(GoalListSerializer)
 
-    _permissions = {'create': [permissions.IsAuthenticated()]}
+    _permissions = {'create': [permissions.IsAuthenticated()], 'bulk': [permissions.IsAuthenticated()]}
     _default_permissions = [IsOwnerOrWriter()]
 
+    query_budgets = {'list': 5, 'retrieve': 4, 'create': 8}
+
     def get_serializer_class(self):
         return self._serializers.get(self.action, self._default_serializer)
 
@@ -129,7 +209,8 @@ class GoalViewSet(viewsets.ModelViewSet):
     #: Переопределяем метод для отображения целей с учетом полей user и status.
     def get_queryset(self):
         return super().get_queryset().filter(
-            category__board__participants__user_id=self.request.user.id,
+            board__participants__user_id=self.request.user.id,
+            board__is_deleted=False,
             category__is_deleted=False,
             status__lt=Goal.Status.archived,
         )
@@ -138,6 +219,14 @@ class GoalViewSet(viewsets.ModelViewSet):
     def perform_create(self, serializer):
         serializer.save(user=self.request.user)
 
+    #: Массовое изменение целей: POST /goals/goal/bulk
+    @action(detail=False, methods=['post'])
+    def bulk(self, request, *args, **kwargs):
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        serializer.save(user=request.user)
+        return Response(serializer.data, status=status.HTTP_200_OK)
+
     #: Переопределяем метод для исключения удаления целей из базы.
     def perform_destroy(self, instance: Goal) -> Goal:
         with transaction.atomic():
@@ -146,24 +235,28 @@ class GoalViewSet(viewsets.ModelViewSet):
         return instance
 
 
-class CommentViewSet(viewsets.ModelViewSet):
+class CommentViewSet(ConditionalGetMixin, ListCacheMixin, ValuesListMixin, viewsets.ModelViewSet):
     """Представление для обработки запроса на эндпоинт /goals/goal_comment{/<id>}
 
     Действия над комментариями.
     """
-    queryset = Comment.objects.all().select_related('goal')
+    queryset = Comment.objects.all().select_related('user', 'goal')
 
     filter_backends = [filters.OrderingFilter, DjangoFilterBackend]
     filterset_fields = ['goal']
     ordering_fields = ['created']
     ordering = ['-created']
+    keyset_ordering = ('-created', '-id')
 
     _serializers = {'create': CommentCreateSerializer}
     _default_serializer = CommentListSerializer
+    values_serializer = ValuesSerializer(CommentListSerializer)
 
     _permissions = {'create': [permissions.IsAuthenticated()]}
     _default_permissions = [IsCommentOwner()]
 
+    query_budgets = {'list': 5, 'retrieve': 3, 'create': 5}
+
     def get_serializer_class(self):
         return self._serializers.get(self.action, self._default_serializer)
 
@@ -173,10 +266,27 @@ class CommentViewSet(viewsets.ModelViewSet):
     #: Переопределяем метод для отображения комментариев с учетом полей user и status.
     def get_queryset(self):
         return super().get_queryset().filter(
-            goal__category__board__participants__user_id=self.request.user.id,
+            board__participants__user_id=self.request.user.id,
+            board__is_deleted=False,
+            goal__category__is_deleted=False,
             goal__status__lt=Goal.Status.archived,
         )
 
     #: Переопределяем метод для добавления в serializer поля user.
     def perform_create(self, serializer):
         serializer.save(user=self.request.user)
+
+
+class DeletionJobViewSet(mixins.RetrieveModelMixin, viewsets.GenericViewSet):
+    """Представление для обработки запроса на эндпоинт /goals/deletion/<id>
+
+    Статус фоновой задачи удаления доски или категории.
+    """
+    queryset = DeletionJob.objects.all()
+    serializer_class = DeletionJobSerializer
+    permission_classes = [permissions.IsAuthenticated]
+    query_budget = 3
+
+    #: Задачи доступны только создавшему их пользователю
+    def get_queryset(self):
+        return super().get_queryset().filter(user_id=self.request.user.id)
@@ -0,0 +1,221 @@
+import pytest
+from django.core.cache import cache
+
+from bot import cache as bot_cache
+from bot.cache import ChatStateCache, get_category_index, get_chat_cache
+from bot.chat import process_message
+from bot.models import TgChatState, TgMessage
+from bot.tg.dc import CallbackQuery, Message
+from goals.models import Board, Category, Goal
+
+
+def make_message(tg_user, text: str) -> Message:
+    return Message.from_dict({
+        'message_id': 1,
+        'from': {'id': tg_user.tg_id, 'is_bot': False, 'first_name': 'name', 'username': tg_user.tg_username},
+        'date': 1,
+        'chat': {'id': tg_user.tg_id, 'type': 'private'},
+        'text': text,
+    })
+
+
+@pytest.fixture(autouse=True)
+def chat_cache(settings, monkeypatch):
+    settings.TG_CHAT_CACHE = 'default'
+    monkeypatch.setattr(bot_cache, '_chat_cache', ChatStateCache())
+    cache.clear()
+    yield get_chat_cache()
+    cache.clear()
+
+
+@pytest.mark.django_db()
+class TestChatStateCache:
+
+    def test_verified_user_without_reads(self, tg_user, django_assert_num_queries):
+        """Проверяет обработку сообщений известного пользователя без чтения из базы данных"""
+        process_message(make_message(tg_user, '/start'))
+
+        #: Только запись исходящего сообщения в очередь
+        with django_assert_num_queries(1):
+            process_message(make_message(tg_user, '/start'))
+
+        assert TgMessage.objects.filter(chat_id=tg_user.tg_id).count() == 2
+
+    def test_write_through(self, tg_user, chat_cache):
+        """Проверяет, что изменения состояния чата сохраняются в базе данных и в кэше"""
+        process_message(make_message(tg_user, '/create'))
+
+        assert TgChatState.objects.get(tg_user=tg_user).is_create_command
+        assert chat_cache.get(tg_user.tg_id).is_create_command
+
+        process_message(make_message(tg_user, '/cancel'))
+        assert not TgChatState.objects.get(tg_user=tg_user).is_create_command
+        assert not chat_cache.get(tg_user.tg_id).is_create_command
+
+    def test_not_verified_user_not_cached(self, tg_user, chat_cache):
+        """Проверяет, что состояние не верифицированного пользователя не кэшируется"""
+        process_message(make_message(tg_user, '/start'))
+        assert chat_cache.get(tg_user.tg_id)
+
+        tg_user.user = None
+        tg_user.save()
+        assert chat_cache.get(tg_user.tg_id) is None
+
+        process_message(make_message(tg_user, '/start'))
+        assert chat_cache.get(tg_user.tg_id) is None
+
+    def test_without_shared_cache(self, tg_user, settings, monkeypatch):
+        """Проверяет, что без общего кэша состояния чатов не кэшируются в процессе"""
+        settings.TG_CHAT_CACHE = ''
+        monkeypatch.setattr(bot_cache, '_chat_cache', ChatStateCache())
+
+        process_message(make_message(tg_user, '/start'))
+        assert get_chat_cache().get(tg_user.tg_id) is None
+
+        tg_user.user = None
+        tg_user.save()
+        process_message(make_message(tg_user, '/start'))
+        assert TgMessage.objects.filter(chat_id=tg_user.tg_id, text__startswith='С возвращением!').exists()
+
+
+def make_callback_query(tg_user, data: str) -> CallbackQuery:
+    return CallbackQuery.from_dict({
+        'id': '1',
+        'from': {'id': tg_user.tg_id, 'is_bot': False, 'first_name': 'name', 'username': tg_user.tg_username},
+        'message': {'message_id': 1, 'date': 1, 'chat': {'id': tg_user.tg_id, 'type': 'private'}},
+        'data': data,
+    })
+
+
+@pytest.mark.django_db(transaction=True)
+class TestCreateCommand:
+
+    @pytest.fixture(autouse=True)
+    def setup(self, tg_user, board_factory, category_factory, settings):
+        settings.TG_CATEGORY_CACHE_TIMEOUT = 300
+        self.tg_user = tg_user
+        board = board_factory.create(with_owner=tg_user.user)
+        self.categories = category_factory.create_batch(3, board=board, user=tg_user.user)
+        cache.clear()
+        yield
+        cache.clear()
+
+    def last_message(self) -> TgMessage:
+        return TgMessage.objects.filter(chat_id=self.tg_user.tg_id).latest('id')
+
+    def test_select_category_by_button(self, django_assert_num_queries):
+        """Проверяет выбор категории кнопкой клавиатуры и создание цели"""
+        process_message(make_message(self.tg_user, '/create'))
+        keyboard = self.last_message().reply_markup['inline_keyboard']
+        assert sorted(button['text'] for button, in keyboard) == sorted(c.title for c in self.categories)
+
+        category = self.categories[1]
+        #: Проверка категории, сохранение состояния и постановка сообщения в очередь, без чтения индекса
+        with django_assert_num_queries(3):
+            process_message(make_callback_query(self.tg_user, f'category:{category.id}'))
+        assert self.last_message().text == 'Отправьте название цели.'
+
+        process_message(make_message(self.tg_user, 'new goal'))
+        assert Goal.objects.get(title='new goal').category_id == category.id
+        assert not TgChatState.objects.get(tg_user=self.tg_user).is_create_command
+
+    def test_select_category_by_title(self):
+        """Проверяет выбор категории по названию и отклонение чужих категорий"""
+        process_message(make_message(self.tg_user, '/create'))
+
+        process_message(make_callback_query(self.tg_user, 'category:0'))
+        assert self.last_message().reply_markup
+        assert TgChatState.objects.get(tg_user=self.tg_user).category_id is None
+
+        process_message(make_message(self.tg_user, self.categories[2].title))
+        assert TgChatState.objects.get(tg_user=self.tg_user).category_id == self.categories[2].id
+
+    def test_index_invalidation(self, category_factory):
+        """Проверяет сброс индекса категорий при изменении категорий пользователя"""
+        user_id = self.tg_user.user_id
+        assert len(get_category_index(user_id).items) == 3
+
+        category = category_factory.create(board=self.categories[0].board, user=self.tg_user.user)
+        assert category.id in get_category_index(user_id).ids
+
+        category.is_deleted = True
+        category.save()
+        assert category.id not in get_category_index(user_id).ids
+
+    def test_stale_index(self):
+        """Проверяет отклонение категорий, удаленных без сброса индекса (в другом процессе)"""
+        process_message(make_message(self.tg_user, '/create'))
+        Category.objects.filter(id=self.categories[0].id).update(is_deleted=True)
+        assert self.categories[0].id in get_category_index(self.tg_user.user_id).ids
+
+        process_message(make_callback_query(self.tg_user, f'category:{self.categories[0].id}'))
+        assert TgChatState.objects.get(tg_user=self.tg_user).category_id is None
+
+        process_message(make_callback_query(self.tg_user, f'category:{self.categories[1].id}'))
+        Board.objects.filter(id=self.categories[1].board_id).update(is_deleted=True)
+        process_message(make_message(self.tg_user, 'new goal'))
+        assert not Goal.objects.filter(title='new goal').exists()
+        assert TgChatState.objects.get(tg_user=self.tg_user).category_id is None
+
+
+@pytest.mark.django_db()
+class TestGoalsCommand:
+
+    @pytest.fixture(autouse=True)
+    def setup(self, tg_user, board_factory, category_factory, goal_factory, settings):
+        settings.TG_GOALS_PAGE_SIZE = 3
+        self.tg_user = tg_user
+        board = board_factory.create(with_owner=tg_user.user)
+        category = category_factory.create(board=board, user=tg_user.user)
+        self.goals = goal_factory.create_batch(
+            7, category=category, user=tg_user.user, priority=Goal.Priority.low
+        )
+        goal_factory.create(category=category, user=tg_user.user, status=Goal.Status.archived)
+
+    def last_message(self) -> TgMessage:
+        return TgMessage.objects.filter(chat_id=self.tg_user.tg_id).latest('id')
+
+    def buttons(self) -> dict:
+        markup = self.last_message().reply_markup
+        return {button['text']: button['callback_data'] for button in markup['inline_keyboard'][0]} if markup else {}
+
+    def test_pages(self):
+        """Проверяет переход по страницам списка целей кнопками клавиатуры"""
+        titles = [goal.title for goal in self.goals]
+
+        process_message(make_message(self.tg_user, '/goals'))
+        assert self.last_message().text == '\n'.join(titles[:3])
+        assert list(self.buttons()) == ['Далее »']
+
+        process_message(make_callback_query(self.tg_user, self.buttons()['Далее »']))
+        assert self.last_message().text == '\n'.join(titles[3:6])
+        back = self.buttons()['« Назад']
+
+        process_message(make_callback_query(self.tg_user, self.buttons()['Далее »']))
+        assert self.last_message().text == titles[6]
+        assert list(self.buttons()) == ['« Назад']
+
+        process_message(make_callback_query(self.tg_user, back))
+        assert self.last_message().text == '\n'.join(titles[:3])
+
+    def test_filters(self, goal_factory):
+        """Проверяет фильтрацию списка целей по статусу и приоритету"""
+        goal = goal_factory.create(
+            category=self.goals[0].category, user=self.tg_user.user,
+            status=Goal.Status.in_progress, priority=Goal.Priority.critical
+        )
+        process_message(make_message(self.tg_user, '/goals status=2 priority=4'))
+        assert self.last_message().text == goal.title
+        assert self.last_message().reply_markup is None
+
+        process_message(make_message(self.tg_user, '/goals status=4'))
+        assert self.last_message().text.startswith('[unknown filter]')
+
+    def test_message_limit(self, goal_factory, settings):
+        """Проверяет ограничение длины сообщения со списком целей"""
+        settings.TG_GOALS_PAGE_SIZE = 50
+        goal_factory.create_batch(30, category=self.goals[0].category, user=self.tg_user.user, title='x' * 255)
+
+        process_message(make_message(self.tg_user, '/goals'))
+        assert len(self.last_message().text) <= 4096
+        assert 'Далее »' in self.buttons()
@@ -0,0 +1,49 @@
+from unittest import mock
+
+import pytest
+from requests import exceptions
+
+from bot.tg.client import TgClient
+
+
+class TestTgClientRetries:
+
+    @pytest.fixture(autouse=True)
+    def setup(self):
+        self.client = TgClient(token='token', retries=2, backoff=0)
+        self.session = mock.Mock()
+        with mock.patch('bot.tg.client.get_session', return_value=self.session):
+            yield
+
+    def test_send_message_read_timeout(self):
+        """Проверяет, что sendMessage не повторяется при таймауте ожидания ответа"""
+        self.session.get.side_effect = exceptions.ReadTimeout()
+
+        with pytest.raises(exceptions.RequestException) as error:
+            self.client.send_message(chat_id=1, text='text')
+
+        assert self.session.get.call_count == 1
+        assert isinstance(error.value.__cause__, exceptions.ReadTimeout)
+
+    def test_send_message_connect_error(self):
+        """Проверяет, что sendMessage повторяется при ошибке установки соединения"""
+        response = mock.Mock(status_code=200)
+        response.json.return_value = {'ok': True, 'result': {
+            'message_id': 1, 'from': {'id': 2, 'is_bot': True, 'first_name': 'bot'}, 'date': 0,
+            'chat': {'id': 1, 'type': 'private'}, 'text': 'text',
+        }}
+        self.session.get.side_effect = [exceptions.ConnectTimeout(), exceptions.ConnectionError(), response]
+
+        self.client.send_message(chat_id=1, text='text')
+
+        assert self.session.get.call_count == 3
+
+    def test_get_updates_read_timeout(self):
+        """Проверяет, что getUpdates повторяется при таймауте ожидания ответа"""
+        self.session.get.side_effect = exceptions.ReadTimeout()
+
+        with pytest.raises(exceptions.RequestException) as error:
+            self.client.get_updates(timeout=1)
+
+        assert self.session.get.call_count == 3
+        assert isinstance(error.value.__cause__, exceptions.ReadTimeout)
@@ -0,0 +1,74 @@
+import pytest
+
+from bot.tg.dc import CallbackQuery, Chat, GetUpdatesResponse, Message, MessageFrom, SendMessageResponse, Update
+
+MESSAGE_FROM = {'id': 1, 'is_bot': False, 'first_name': 'name', 'username': 'user', 'unknown': 'value'}
+CHAT = {'id': 2, 'type': 'private', 'first_name': 'name'}
+MESSAGE = {'message_id': 3, 'from': MESSAGE_FROM, 'date': 4, 'chat': CHAT, 'text': '/start'}
+
+
+def test_message():
+    """Тест на разбор сообщения: вложенные объекты, необязательные и неизвестные поля"""
+    message = Message.from_dict(MESSAGE)
+
+    assert message == Message(
+        message_id=3,
+        message_from=MessageFrom(id=1, is_bot=False, first_name='name', username='user'),
+        date=4,
+        chat=Chat(id=2, type='private', first_name='name'),
+        text='/start',
+    )
+    assert Message.from_dict({**MESSAGE, 'text': None}).text is None
+
+
+def test_required_field():
+    """Тест на разбор сообщения без обязательного поля"""
+    with pytest.raises(KeyError):
+        Message.from_dict({key: value for key, value in MESSAGE.items() if key != 'chat'})
+
+
+def test_callback_query():
+    """Тест на разбор нажатия кнопки: чат берется из сообщения, без сообщения - отправитель"""
+    data = {'id': '5', 'from': MESSAGE_FROM, 'message': MESSAGE, 'data': 'category:1'}
+
+    callback_query = CallbackQuery.from_dict(data)
+    assert (callback_query.id, callback_query.chat_id, callback_query.data) == ('5', 2, 'category:1')
+    assert callback_query.message_from.username == 'user'
+
+    data.pop('message')
+    assert CallbackQuery.from_dict(data).chat_id == 1
+
+
+def test_update():
+    """Тест на разбор обновления с сообщением, измененным сообщением и нажатием кнопки"""
+    update = Update.from_dict({'update_id': 6, 'message': MESSAGE, 'edited_message': MESSAGE})
+
+    assert update.message == Message.from_dict(MESSAGE)
+    assert update.callback_query is None
+    assert update.edited_message == Message.from_dict(MESSAGE)
+
+    update = Update.from_dict({'update_id': 7, 'callback_query': {'id': '8', 'from': MESSAGE_FROM}})
+    assert update.message is None
+    assert update.callback_query.chat_id == 1
+    assert update.edited_message is None
+
+
+def test_update_init():
+    """Тест на создание обновления с измененным сообщением"""
+    message = Message.from_dict(MESSAGE)
+    update = Update(update_id=1, edited_message=message)
+
+    assert update.edited_message is message
+
+
+def test_responses():
+    """Тест на разбор ответов методов 'getUpdates' и 'sendMessage'"""
+    response = GetUpdatesResponse.from_dict({
+        'ok': True, 'result': [{'update_id': 1, 'message': MESSAGE}, {'update_id': 2}],
+    })
+    assert response.ok
+    assert [update.update_id for update in response.result] == [1, 2]
+    assert response.result[0].message.text == '/start'
+
+    response = SendMessageResponse.from_dict({'ok': True, 'result': MESSAGE})
+    assert response.result == Message.from_dict(MESSAGE)
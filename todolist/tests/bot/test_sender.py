@@ -0,0 +1,137 @@
+from datetime import timedelta
+from unittest import mock
+
+import pytest
+from django.utils import timezone
+from requests import exceptions
+
+from bot.models import TgMessage
+from bot.sender import MessageSender, TokenBucket, enqueue_message
+from bot.tg.client import TgClient
+
+
+def test_token_bucket():
+    """Тест ограничителя частоты: после исчерпания токенов запросы отклоняются до пополнения"""
+    bucket = TokenBucket(rate=1, capacity=2)
+    assert bucket.try_acquire()
+    assert bucket.try_acquire()
+    assert not bucket.try_acquire()
+
+    with mock.patch('bot.sender.time.monotonic', return_value=bucket.updated + 1):
+        assert bucket.try_acquire()
+
+
+@pytest.mark.django_db()
+class TestMessageSender:
+
+    @pytest.fixture(autouse=True)
+    def setup(self, settings):
+        settings.TG_SEND_RATE = 1000
+        settings.TG_CHAT_SEND_RATE = 1
+        self.tg_client = mock.Mock()
+        self.sender = MessageSender(tg_client=self.tg_client, max_attempts=2)
+
+    def test_per_chat_rate(self):
+        """Проверяет, что сообщения сверх лимита чата откладываются, не задерживая другие чаты"""
+        first = enqueue_message(chat_id=1, text='first')
+        second = enqueue_message(chat_id=1, text='second')
+        other = enqueue_message(chat_id=2, text='other')
+
+        assert self.sender.run_once() == 2
+        assert [c.kwargs['text'] for c in self.tg_client.send_message.call_args_list] == ['first', 'other']
+
+        for message in (first, second, other):
+            message.refresh_from_db()
+        assert first.status == TgMessage.Status.sent
+        assert first.sent is not None
+        assert second.status == TgMessage.Status.pending
+        assert second.claimed is None
+        assert other.status == TgMessage.Status.sent
+
+    def test_failed_after_attempts(self):
+        """Проверяет повтор отправки при ошибке и пометку сообщения как неотправленного"""
+        self.tg_client.send_message.side_effect = exceptions.RequestException
+        self.sender.chat_buckets[1] = TokenBucket(rate=1000, capacity=10)
+        message = enqueue_message(chat_id=1, text='text')
+
+        self.sender.run_once()
+        message.refresh_from_db()
+        assert message.status == TgMessage.Status.pending
+        assert message.attempts == 1
+
+        self.sender.run_once()
+        message.refresh_from_db()
+        assert message.status == TgMessage.Status.failed
+        assert message.attempts == 2
+        assert self.sender.stats.failed == 1
+
+    def test_read_timeout_not_resent(self):
+        """Проверяет, что сообщение не отправляется повторно после таймаута ожидания ответа"""
+        self.tg_client = TgClient(token='token', retries=2, backoff=0)
+        self.sender = MessageSender(tg_client=self.tg_client, max_attempts=3)
+        self.sender.chat_buckets[1] = TokenBucket(rate=1000, capacity=10)
+        message = enqueue_message(chat_id=1, text='text')
+        session = mock.Mock()
+        session.get.side_effect = exceptions.ReadTimeout()
+
+        with mock.patch('bot.tg.client.get_session', return_value=session):
+            self.sender.run_once()
+            self.sender.run_once()
+
+        assert session.get.call_count == 1
+        message.refresh_from_db()
+        assert message.status == TgMessage.Status.failed
+        assert message.attempts == 1
+
+    def test_connection_error_resent(self):
+        """Проверяет повторную отправку сообщения после ошибки соединения"""
+        self.tg_client.send_message.side_effect = [exceptions.ConnectionError(), mock.DEFAULT]
+        self.sender.chat_buckets[1] = TokenBucket(rate=1000, capacity=10)
+        message = enqueue_message(chat_id=1, text='text')
+
+        self.sender.run_once()
+        self.sender.run_once()
+
+        assert self.tg_client.send_message.call_count == 2
+        message.refresh_from_db()
+        assert message.status == TgMessage.Status.sent
+
+    def test_claimed_once(self):
+        """Проверяет, что захваченное отправителем сообщение не отправляется другим отправителем"""
+        message = enqueue_message(chat_id=1, text='text')
+        other_client = mock.Mock()
+        other_sender = MessageSender(tg_client=other_client)
+
+        assert [claimed.id for claimed in self.sender.claim()] == [message.id]
+        assert other_sender.run_once() == 0
+        other_client.send_message.assert_not_called()
+
+        message.refresh_from_db()
+        assert message.status == TgMessage.Status.sending
+
+    def test_cleanup(self, settings):
+        """Проверяет возврат в очередь зависших сообщений и удаление устаревших обработанных"""
+        settings.TG_SEND_CLAIM_TIMEOUT = 60
+        settings.TG_MESSAGE_RETENTION = 3600
+        stale = enqueue_message(chat_id=1, text='stale')
+        sending = enqueue_message(chat_id=1, text='sending')
+        processed = (TgMessage.Status.sent, TgMessage.Status.failed)
+        old = [enqueue_message(chat_id=1, text=status.label) for status in processed]
+        recent = enqueue_message(chat_id=1, text='recent')
+        now = timezone.now()
+        TgMessage.objects.filter(id=stale.id).update(
+            status=TgMessage.Status.sending, claimed=now - timedelta(minutes=2)
+        )
+        TgMessage.objects.filter(id=sending.id).update(status=TgMessage.Status.sending, claimed=now)
+        for message, status in zip(old, processed):
+            TgMessage.objects.filter(id=message.id).update(status=status, created=now - timedelta(hours=2))
+        TgMessage.objects.filter(id=recent.id).update(status=TgMessage.Status.sent)
+
+        self.sender.cleanup()
+
+        statuses = dict(TgMessage.objects.values_list('id', 'status'))
+        assert statuses == {
+            stale.id: TgMessage.Status.pending,
+            sending.id: TgMessage.Status.sending,
+            recent.id: TgMessage.Status.sent,
+        }
@@ -0,0 +1,76 @@
+from datetime import timedelta
+from unittest import mock
+
+import pytest
+from django.utils import timezone
+
+from bot.models import TgMessage, TgUpdate
+from bot.updates import UpdateProcessor
+
+
+def make_update(tg_user, update_id: int, text: str) -> TgUpdate:
+    return TgUpdate.objects.create(update_id=update_id, chat_id=tg_user.tg_id, data={
+        'update_id': update_id,
+        'message': {
+            'message_id': update_id,
+            'from': {'id': tg_user.tg_id, 'is_bot': False, 'first_name': 'name', 'username': tg_user.tg_username},
+            'date': 1,
+            'chat': {'id': tg_user.tg_id, 'type': 'private'},
+            'text': text,
+        },
+    })
+
+
+@pytest.mark.django_db()
+class TestUpdateProcessor:
+
+    @pytest.fixture(autouse=True)
+    def setup(self):
+        self.processor = UpdateProcessor()
+        self.processor.dispatcher = mock.Mock()
+
+    def test_claim(self, tg_user):
+        """Проверяет передачу обновлений обработчикам по порядку и однократный захват"""
+        second = make_update(tg_user, 2, '/start')
+        first = make_update(tg_user, 1, '/start')
+
+        assert self.processor.run_once() == 2
+        assert [c.kwargs['message'].id for c in self.processor.dispatcher.put.call_args_list] == [first.id, second.id]
+        assert set(TgUpdate.objects.values_list('status', flat=True)) == {TgUpdate.Status.processing}
+
+        assert UpdateProcessor().run_once() == 0
+
+    def test_process(self, tg_user):
+        """Проверяет обработку сохраненного обновления и сохранение результата"""
+        update = make_update(tg_user, 1, '/start')
+        broken = TgUpdate.objects.create(update_id=2, chat_id=tg_user.tg_id, data={'update_id': 2, 'message': {}})
+
+        self.processor.process(update)
+        self.processor.process(broken)
+
+        assert TgMessage.objects.filter(chat_id=tg_user.tg_id).exists()
+        assert dict(TgUpdate.objects.values_list('update_id', 'status')) == {
+            1: TgUpdate.Status.processed,
+            2: TgUpdate.Status.failed,
+        }
+
+    def test_cleanup(self, tg_user, settings):
+        """Проверяет возврат в очередь зависших обновлений и удаление устаревших обработанных"""
+        settings.TG_SEND_CLAIM_TIMEOUT = 60
+        settings.TG_MESSAGE_RETENTION = 3600
+        stale, processing, old, recent = (make_update(tg_user, number, '/start') for number in range(1, 5))
+        now = timezone.now()
+        TgUpdate.objects.filter(id=stale.id).update(
+            status=TgUpdate.Status.processing, claimed=now - timedelta(minutes=2)
+        )
+        TgUpdate.objects.filter(id=processing.id).update(status=TgUpdate.Status.processing, claimed=now)
+        TgUpdate.objects.filter(id=old.id).update(status=TgUpdate.Status.processed, created=now - timedelta(hours=2))
+        TgUpdate.objects.filter(id=recent.id).update(status=TgUpdate.Status.processed)
+
+        self.processor.cleanup()
+
+        assert dict(TgUpdate.objects.values_list('update_id', 'status')) == {
+            1: TgUpdate.Status.pending,
+            2: TgUpdate.Status.processing,
+            4: TgUpdate.Status.processed,
+        }
@@ -0,0 +1,95 @@
+import pytest
+from django.urls import reverse
+from rest_framework import status
+
+from bot.models import TgUpdate
+
+
+@pytest.mark.django_db()
+class TestTgWebhook:
+    url = reverse('tg-webhook')
+    secret = 'webhook_secret'
+
+    @pytest.fixture(autouse=True)
+    def setup(self, settings):
+        settings.TG_WEBHOOK_SECRET = self.secret
+
+    @pytest.fixture()
+    def update(self) -> dict:
+        return {
+            'update_id': 1,
+            'message': {
+                'message_id': 10,
+                'from': {'id': 100, 'is_bot': False, 'first_name': 'name'},
+                'date': 1,
+                'chat': {'id': 200, 'type': 'private'},
+                'text': '/goals',
+            },
+        }
+
+    def test_success(self, client, update):
+        """Тест на эндпоинт POST: /bot/webhook
+
+        Производит проверку сохранения обновления для обработки и игнорирования повторной доставки.
+        """
+        for _ in range(2):
+            response = client.post(
+                self.url, update, format='json', HTTP_X_TELEGRAM_BOT_API_SECRET_TOKEN=self.secret
+            )
+            assert response.status_code == status.HTTP_200_OK
+
+        tg_update = TgUpdate.objects.get()
+        assert (tg_update.update_id, tg_update.chat_id, tg_update.status) == (1, 200, TgUpdate.Status.pending)
+        assert tg_update.data == update
+
+    @pytest.mark.parametrize('secret', [None, 'wrong_secret'], ids=['without secret', 'wrong secret'])
+    def test_invalid_secret(self, client, update, secret):
+        """Тест на эндпоинт POST: /bot/webhook
+
+        Производит проверку отклонения запросов без корректного секретного токена.
+        """
+        headers = {'HTTP_X_TELEGRAM_BOT_API_SECRET_TOKEN': secret} if secret else {}
+        response = client.post(self.url, update, format='json', **headers)
+        assert response.status_code == status.HTTP_403_FORBIDDEN
+        assert not TgUpdate.objects.exists()
+
+    def test_invalid_update(self, client):
+        """Тест на эндпоинт POST: /bot/webhook
+
+        Производит проверку ответа на некорректное обновление.
+        """
+        response = client.post(
+            self.url, {'message': {}}, format='json', HTTP_X_TELEGRAM_BOT_API_SECRET_TOKEN=self.secret
+        )
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert not TgUpdate.objects.exists()
+
+    def test_disabled_without_secret(self, client, update, settings):
+        """Тест на эндпоинт POST: /bot/webhook
+
+        Производит проверку недоступности эндпоинта, если секретный токен не задан.
+        """
+        settings.TG_WEBHOOK_SECRET = ''
+        response = client.post(self.url, update, format='json', HTTP_X_TELEGRAM_BOT_API_SECRET_TOKEN='')
+        assert response.status_code == status.HTTP_404_NOT_FOUND
+
+    def test_callback_query(self, client):
+        """Тест на эндпоинт POST: /bot/webhook
+
+        Производит проверку сохранения нажатия кнопки и подтверждения нажатия в ответе.
+        """
+        update = {
+            'update_id': 2,
+            'callback_query': {
+                'id': '300',
+                'from': {'id': 100, 'is_bot': False, 'first_name': 'name'},
+                'message': {'message_id': 10, 'date': 1, 'chat': {'id': 200, 'type': 'private'}},
+                'data': 'category:1',
+            },
+        }
+        response = client.post(self.url, update, format='json', HTTP_X_TELEGRAM_BOT_API_SECRET_TOKEN=self.secret)
+        assert response.status_code == status.HTTP_200_OK
+        assert response.json() == {'method': 'answerCallbackQuery', 'callback_query_id': '300'}
+
+        tg_update = TgUpdate.objects.get()
+        assert (tg_update.update_id, tg_update.chat_id) == (2, 200)
@@ -13,3 +13,9 @@ def client() -> APIClient:
 def auth_client(client, user) -> client:
     client.force_login(user)
     return client
+
+
+@pytest.fixture(autouse=True)
+def query_budget_strict(settings) -> None:
+    """Превышение бюджета SQL запросов представления завершает тест ошибкой"""
+    settings.QUERY_BUDGET_STRICT = True
@@ -88,3 +88,16 @@ class CommentFactory(DatesFactoryMixin):
 
     class Meta:
         model = 'goals.Comment'
+
+
+@register
+class TgUserFactory(factory.django.DjangoModelFactory):
+    """Фабрика по созданию экземпляра модели TgUser"""
+
+    tg_id = factory.Sequence(lambda n: 1000 + n)
+    tg_username = factory.Faker('user_name')
+    verification_code = factory.Faker('pystr', max_chars=16)
+    user = factory.SubFactory(UserFactory)
+
+    class Meta:
+        model = 'bot.TgUser'
@@ -1,8 +1,13 @@
 import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
 from rest_framework import status
 
-from goals.models import BoardParticipant, Category, Goal
+from core.models import User
+from goals.deletion import DeletionWorker
+from goals.membership import _get_role
+from goals.models import BoardParticipant, Category, DeletionJob, Goal
 from tests.utils import BaseTestCase
 
 
@@ -114,6 +119,87 @@ class TestBoardUpdate(BoardTestCase):
         self.board.refresh_from_db(fields=('title',))
         assert self.board.title == new_title
 
+    def test_success_update_participants(self, auth_client, user, user_factory):
+        """Тест на эндпоинт PATCH: /goals/board/<id>
+
+        Производит проверку добавления, изменения роли и удаления участников доски.
+        """
+        kept, changed, removed = user_factory.create_batch(3)
+        added = user_factory.create()
+        for participant_user in (kept, changed, removed):
+            BoardParticipant.objects.create(board=self.board, user=participant_user, role=BoardParticipant.Role.reader)
+
+        response = auth_client.patch(self.url, {'participants': [
+            {'user': kept.username, 'role': BoardParticipant.Role.reader},
+            {'user': changed.username, 'role': BoardParticipant.Role.writer},
+            {'user': added.username, 'role': BoardParticipant.Role.writer},
+        ]}, format='json')
+        assert response.status_code == status.HTTP_200_OK
+
+        assert dict(self.board.participants.values_list('user_id', 'role')) == {
+            user.id: BoardParticipant.Role.owner,
+            kept.id: BoardParticipant.Role.reader,
+            changed.id: BoardParticipant.Role.writer,
+            added.id: BoardParticipant.Role.writer,
+        }
+        assert len(response.json()['participants']) == 4
+
+    def test_removed_participant_role_reset(self, auth_client, settings, user_factory,
+                                            django_capture_on_commit_callbacks):
+        """Тест на эндпоинт PATCH: /goals/board/<id>
+
+        Производит проверку сброса закэшированной роли удаленного участника доски.
+        """
+        settings.BOARD_ROLE_CACHE_TIMEOUT = 60
+        removed, added = user_factory.create_batch(2)
+        BoardParticipant.objects.create(board=self.board, user=removed, role=BoardParticipant.Role.reader)
+        assert _get_role(board_id=self.board.id, user_id=removed.id) == BoardParticipant.Role.reader
+
+        with django_capture_on_commit_callbacks(execute=True):
+            response = auth_client.patch(self.url, {'participants': [
+                {'user': added.username, 'role': BoardParticipant.Role.reader},
+            ]}, format='json')
+        assert response.status_code == status.HTTP_200_OK
+        assert _get_role(board_id=self.board.id, user_id=removed.id) is None
+
+    def test_unknown_participant(self, auth_client):
+        """Тест на эндпоинт PATCH: /goals/board/<id>
+
+        Производит проверку ответа при передаче несуществующих пользователей:
+        все неизвестные имена возвращаются одной ошибкой.
+        """
+        response = auth_client.patch(self.url, {'participants': [
+            {'user': 'unknown_user_2', 'role': BoardParticipant.Role.reader},
+            {'user': self.participant.user.username, 'role': BoardParticipant.Role.reader},
+            {'user': 'unknown_user_1', 'role': BoardParticipant.Role.reader},
+        ]}, format='json')
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert response.json() == {'participants': ['Users do not exist: unknown_user_1, unknown_user_2.']}
+
+    def test_update_participants_queries(self, auth_client):
+        """Тест на эндпоинт PATCH: /goals/board/<id>
+
+        Производит проверку независимости количества запросов к базе данных от количества участников.
+        """
+        def replace_participants(count: int) -> int:
+            users = User.objects.bulk_create(User(username=f'participant_{count}_{n}') for n in range(count))
+            for participant_user in users[:count // 2]:
+                BoardParticipant.objects.create(
+                    board=self.board, user=participant_user, role=BoardParticipant.Role.reader
+                )
+            with CaptureQueriesContext(connection) as context:
+                response = auth_client.patch(self.url, {'participants': [
+                    {'user': participant_user.username, 'role': BoardParticipant.Role.writer}
+                    for participant_user in users[count // 4:]
+                ]}, format='json')
+            assert response.status_code == status.HTTP_200_OK
+            assert self.board.participants.count() == 1 + count - count // 4
+            return len(context.captured_queries)
+
+        #: При втором вызове удаляется больше 100 участников (пакет DELETE Django при удалении с сигналами)
+        first, second = replace_participants(8), replace_participants(600)
+        assert first == second, (first, second)
+
 
 class TestBoardDestroy(BoardTestCase):
     method = 'delete'
@@ -153,11 +239,16 @@ class TestBoardDestroy(BoardTestCase):
         assert self.participant.role == BoardParticipant.Role.owner
 
         response = auth_client.delete(self.url)
-        assert response.status_code == status.HTTP_204_NO_CONTENT
+        assert response.status_code == status.HTTP_202_ACCEPTED
+        assert response.json()['status'] == DeletionJob.Status.pending
 
         self.board.refresh_from_db(fields=('is_deleted',))
+        assert self.board.is_deleted
+        assert auth_client.get(self.url).status_code == status.HTTP_404_NOT_FOUND
+        assert not auth_client.get(reverse('goals:goal-list')).json()
+
+        assert DeletionWorker().run_once()
         self.cat.refresh_from_db(fields=('is_deleted',))
         self.goal.refresh_from_db(fields=('status',))
-        assert self.board.is_deleted
         assert self.cat.is_deleted
         assert self.goal.status == Goal.Status.archived
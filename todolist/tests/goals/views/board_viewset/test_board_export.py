@@ -0,0 +1,124 @@
+import csv
+import gzip
+import io
+import json
+import threading
+
+import pytest
+from django.db import connection
+from django.urls import reverse
+from rest_framework import status
+
+from goals import export
+from goals.models import Comment, Goal
+
+
+@pytest.mark.django_db()
+class TestBoardExport:
+
+    @pytest.fixture(autouse=True)
+    def setup(self, board_factory, category_factory, goal_factory, user):  # noqa: PT004
+        self.board = board_factory.create(with_owner=user)
+        self.category = category_factory.create(board=self.board, user=user)
+        self.goals = goal_factory.create_batch(5, category=self.category, user=user)
+        self.comments = [Comment.objects.create(goal=goal, user=user, text='Комментарий') for goal in self.goals[:2]]
+        self.url = reverse('goals:board-export', args=[self.board.id])
+
+    def test_auth_required(self, client):
+        """Тест на эндпоинт GET: /goals/board/<id>/export
+
+        Производит проверку требований аутентификации.
+        """
+        response = client.get(self.url)
+        assert response.status_code == status.HTTP_403_FORBIDDEN
+
+    def test_user_not_board_participant(self, client, user_factory):
+        """Тест на эндпоинт GET: /goals/board/<id>/export
+
+        Производит проверку недоступности экспорта доски, в которой пользователь не является участником.
+        """
+        client.force_login(user_factory.create())
+        response = client.get(self.url)
+        assert response.status_code == status.HTTP_404_NOT_FOUND
+
+    def test_invalid_type(self, auth_client):
+        """Тест на эндпоинт GET: /goals/board/<id>/export
+
+        Производит проверку отклонения неизвестного формата файла.
+        """
+        response = auth_client.get(self.url, {'type': 'xml'})
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+    def test_ndjson(self, auth_client, user, django_assert_max_num_queries, settings):
+        """Тест на эндпоинт GET: /goals/board/<id>/export
+
+        Производит проверку потоковой выгрузки NDJSON с чтением строк блоками
+        и фиксированного количества запросов к базе данных.
+        """
+        settings.EXPORT_CHUNK_SIZE = 2
+
+        with django_assert_max_num_queries(10):
+            response = auth_client.get(self.url)
+            assert response.status_code == status.HTTP_200_OK
+            assert response.streaming
+            content = b''.join(response.streaming_content)
+        assert response['Content-Type'] == 'application/x-ndjson'
+        assert response['Content-Disposition'] == f'attachment; filename="board-{self.board.id}.ndjson"'
+
+        records = [json.loads(line) for line in content.decode().splitlines()]
+        assert [record['type'] for record in records] == [
+            'board', 'participant', 'category', *['goal'] * 5, *['comment'] * 2
+        ]
+        assert records[1] == {'type': 'participant', 'user': user.username, 'role': 1}
+        assert {record['id'] for record in records if record['type'] == 'goal'} == {goal.id for goal in self.goals}
+        assert records[-1]['text'] == 'Комментарий'
+        assert records[-1]['goal'] == self.comments[-1].goal_id
+
+    def test_csv_gzip(self, auth_client):
+        """Тест на эндпоинт GET: /goals/board/<id>/export
+
+        Производит проверку выгрузки CSV со сжатием gzip.
+        """
+        response = auth_client.get(self.url, {'type': 'csv', 'gzip': 1})
+        assert response.status_code == status.HTTP_200_OK
+        assert response['Content-Type'] == 'application/gzip'
+        assert response['Content-Disposition'] == f'attachment; filename="board-{self.board.id}.csv.gz"'
+
+        content = gzip.decompress(b''.join(response.streaming_content)).decode()
+        rows = list(csv.DictReader(io.StringIO(content)))
+        assert len(rows) == 10
+        goal = next(row for row in rows if row['type'] == 'goal' and row['id'] == str(self.goals[0].id))
+        assert goal['title'] == self.goals[0].title
+        assert goal['category'] == str(self.category.id)
+        assert goal['text'] == ''
+
+
+@pytest.mark.django_db(transaction=True)
+def test_export_snapshot(board_factory, category_factory, goal_factory, user, monkeypatch):
+    """Тест на экспорт доски
+
+    Производит проверку согласованности файла: комментарий к цели, созданной другой транзакцией
+    после выгрузки целей, не попадает в файл.
+    """
+    board = board_factory.create(with_owner=user)
+    category = category_factory.create(board=board, user=user)
+    goal_factory.create_batch(2, category=category, user=user)
+    monkeypatch.setattr(export, 'BUFFER_SIZE', 1)
+
+    def create_goal_with_comment() -> None:
+        goal = Goal.objects.create(category=category, user=user, title='new goal')
+        Comment.objects.create(goal=goal, user=user, text='new comment')
+        connection.close()
+
+    chunks = export.iter_board_export(board.id, 'ndjson')
+    records = []
+    while not records or records[-1]['type'] != 'goal':
+        records.append(json.loads(next(chunks)))
+
+    thread = threading.Thread(target=create_goal_with_comment)
+    thread.start()
+    thread.join()
+
+    records += [json.loads(line) for line in b''.join(chunks).splitlines()]
+    assert [record['type'] for record in records].count('goal') == 2
+    assert not any(record['type'] == 'comment' for record in records)
@@ -0,0 +1,168 @@
+import io
+import json
+
+import pytest
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import CommandError, call_command
+from django.urls import reverse
+from rest_framework import status
+
+from goals.models import (
+    Board, BoardGoalCounter, BoardImport, BoardImportItem, BoardParticipant, Category, Comment, Goal
+)
+
+
+def make_file(records: list[dict]) -> SimpleUploadedFile:
+    content = '\n'.join(json.dumps(record, ensure_ascii=False) for record in records).encode()
+    return SimpleUploadedFile('board.ndjson', content, content_type='application/x-ndjson')
+
+
+@pytest.mark.django_db()
+class TestBoardImport:
+    url = reverse('goals:board-import')
+
+    @pytest.fixture(autouse=True)
+    def setup(self, user, user_factory):  # noqa: PT004
+        self.writer = user_factory.create()
+        self.records = [
+            {'type': 'board', 'id': 10, 'title': 'Импорт'},
+            {'type': 'participant', 'user': user.username, 'role': 1},
+            {'type': 'participant', 'user': self.writer.username, 'role': 2},
+            {'type': 'participant', 'user': 'unknown_user', 'role': 3},
+            {'type': 'category', 'id': 20, 'user': self.writer.username, 'title': 'Категория'},
+            *[
+                {'type': 'goal', 'id': 30 + number, 'category': 20, 'user': 'unknown_user', 'title': f'Цель {number}',
+                 'status': 2, 'priority': 3, 'due_date': '2030-01-01T00:00:00Z'}
+                for number in range(5)
+            ],
+            {'type': 'comment', 'id': 40, 'goal': 34, 'user': self.writer.username, 'text': 'Комментарий'},
+        ]
+
+    def test_auth_required(self, client):
+        """Тест на эндпоинт POST: /goals/board/import
+
+        Производит проверку требований аутентификации.
+        """
+        response = client.post(self.url, {'file': make_file(self.records)})
+        assert response.status_code == status.HTTP_403_FORBIDDEN
+
+    def test_success(self, auth_client, user, settings):
+        """Тест на эндпоинт POST: /goals/board/import
+
+        Производит проверку пакетного создания доски, категорий, целей и комментариев. Участники
+        файла не добавляются, автором всех записей становится импортирующий пользователь.
+        """
+        settings.IMPORT_BATCH_SIZE = 2
+
+        response = auth_client.post(self.url, {'file': make_file(self.records)})
+        assert response.status_code == status.HTTP_201_CREATED
+
+        data = response.json()
+        assert data['status'] == BoardImport.Status.done
+        assert data['position'] == len(self.records)
+        assert data['stats'] == {'board': 1, 'participant': 0, 'skipped': 3, 'category': 1, 'goal': 5, 'comment': 1}
+
+        board = Board.objects.get(id=data['board'])
+        assert board.title == 'Импорт'
+        assert dict(board.participants.values_list('user_id', 'role')) == {user.id: BoardParticipant.Role.owner}
+        goals = Goal.objects.filter(board=board).order_by('id')
+        assert [goal.title for goal in goals] == [f'Цель {number}' for number in range(5)]
+        assert {goal.user_id for goal in goals} == {user.id}
+        assert BoardGoalCounter.objects.get_summary(board.id)['by_status']['in_progress'] == 5
+
+        comment = Comment.objects.get(board=board)
+        assert (comment.goal_id, comment.user_id) == (goals[4].id, user.id)
+        assert Category.objects.get(board=board).user_id == user.id
+        assert not BoardImportItem.objects.exists()
+
+    def test_max_size(self, auth_client, settings):
+        """Тест на эндпоинт POST: /goals/board/import
+
+        Производит проверку ограничения размера файла.
+        """
+        settings.IMPORT_MAX_SIZE = 100
+        response = auth_client.post(self.url, {'file': make_file(self.records)})
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert 'file' in response.json()
+        assert not Board.objects.exists()
+
+    def test_resume(self, auth_client, settings):
+        """Тест на эндпоинт POST: /goals/board/import
+
+        Производит проверку сохранения пакетов до ошибочной записи и продолжения импорта
+        с первой несохраненной строки исправленного файла.
+        """
+        settings.IMPORT_BATCH_SIZE = 2
+        invalid = [*self.records]
+        invalid[8] = {**invalid[8], 'category': 999}
+
+        response = auth_client.post(self.url, {'file': make_file(invalid)})
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        data = response.json()
+        assert data['status'] == BoardImport.Status.failed
+        assert data['error'] == 'Line 9: Unknown category: 999'
+        assert data['position'] == 7
+        assert Goal.objects.count() == 2
+
+        response = auth_client.post(self.url, {'file': make_file(self.records), 'board_import': data['id']})
+        assert response.status_code == status.HTTP_201_CREATED
+        assert response.json()['stats']['goal'] == 5
+        assert Board.objects.count() == 1
+        assert Goal.objects.count() == 5
+
+    def test_resume_other_user(self, client, user_factory):
+        """Тест на эндпоинт POST: /goals/board/import
+
+        Производит проверку запрета продолжения импорта другого пользователя.
+        """
+        board_import = BoardImport.objects.create(user=self.writer)
+        client.force_login(user_factory.create())
+        response = client.post(self.url, {'file': make_file(self.records), 'board_import': board_import.id})
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+    def test_export_import(self, auth_client, user, board_factory, category_factory, goal_factory):
+        """Тест на эндпоинты GET: /goals/board/<id>/export, POST: /goals/board/import
+
+        Производит проверку импорта файла экспорта доски.
+        """
+        board = board_factory.create(with_owner=user)
+        category = category_factory.create(board=board, user=user)
+        goal_factory.create_batch(3, category=category, user=user)
+
+        content = b''.join(auth_client.get(reverse('goals:board-export', args=[board.id])).streaming_content)
+        response = auth_client.post(self.url, {'file': SimpleUploadedFile('board.ndjson', content)})
+        assert response.status_code == status.HTTP_201_CREATED
+
+        imported = Goal.objects.filter(board_id=response.json()['board'])
+        assert sorted(imported.values_list('title', 'status', 'priority')) == sorted(
+            Goal.objects.filter(board=board).values_list('title', 'status', 'priority')
+        )
+
+    def test_command(self, user, tmp_path):
+        """Тест на команду manage.py import_board
+
+        Производит проверку импорта из файла, вывода прогресса, продолжения прерванного импорта
+        и сопоставления участников и авторов по имени пользователя.
+        """
+        path = tmp_path / 'board.ndjson'
+        path.write_text('\n'.join(json.dumps(record) for record in self.records[:7]) + '\n{invalid')
+
+        with pytest.raises(CommandError, match='Line 8: Invalid JSON'):
+            call_command('import_board', str(path), user=user.username, batch_size=2)
+        board_import = BoardImport.objects.get()
+        assert board_import.status == BoardImport.Status.failed
+
+        path.write_text('\n'.join(json.dumps(record) for record in self.records))
+        stdout = io.StringIO()
+        call_command('import_board', str(path), user=user.username, batch_size=2, resume=board_import.id, stdout=stdout)
+        output = stdout.getvalue().splitlines()
+        assert output[-1].startswith(f'Import {board_import.id} finished')
+        assert any(line.startswith(f'Import {board_import.id}: line ') for line in output)
+        assert Goal.objects.count() == 5
+
+        board_import.refresh_from_db()
+        assert dict(board_import.board.participants.values_list('user_id', 'role')) == {
+            user.id: BoardParticipant.Role.owner, self.writer.id: BoardParticipant.Role.writer,
+        }
+        comment = Comment.objects.get(board=board_import.board)
+        assert comment.user_id == self.writer.id
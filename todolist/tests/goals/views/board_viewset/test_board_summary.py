@@ -0,0 +1,141 @@
+from datetime import timedelta
+
+import pytest
+from django.db.models import Count
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+
+from goals.deletion import DeletionWorker
+from goals.models import BoardGoalCounter, Goal
+
+
+def get_counters(board_id: int) -> dict:
+    return {
+        (status, priority): count
+        for status, priority, count in BoardGoalCounter.objects.filter(board_id=board_id, count__gt=0).values_list(
+            'status', 'priority', 'count'
+        )
+    }
+
+
+def count_goals(board_id: int) -> dict:
+    return {
+        (status, priority): count
+        for status, priority, count in Goal.objects.filter(board_id=board_id).values_list(
+            'status', 'priority'
+        ).annotate(count=Count('id')).order_by()
+    }
+
+
+@pytest.mark.django_db()
+class TestBoardSummary:
+
+    @pytest.fixture(autouse=True)
+    def setup(self, board_factory, category_factory, goal_factory, user):  # noqa: PT004
+        self.board = board_factory.create(with_owner=user)
+        self.category = category_factory.create(board=self.board, user=user)
+        self.url = reverse('goals:board-summary', args=[self.board.id])
+
+        past = timezone.now() - timedelta(days=1)
+        goal_factory.create_batch(
+            3, category=self.category, user=user, status=Goal.Status.to_do, priority=Goal.Priority.high, due_date=past
+        )
+        goal_factory.create_batch(2, category=self.category, user=user, status=Goal.Status.done, due_date=past)
+        goal_factory.create(category=self.category, user=user, status=Goal.Status.archived)
+
+    def test_auth_required(self, client):
+        """Тест на эндпоинт GET: /goals/board/<id>/summary
+
+        Производит проверку требований аутентификации.
+        """
+        response = client.get(self.url)
+        assert response.status_code == status.HTTP_403_FORBIDDEN
+
+    def test_user_not_board_participant(self, client, user_factory):
+        """Тест на эндпоинт GET: /goals/board/<id>/summary
+
+        Производит проверку недоступности сводки доски, в которой пользователь не является участником.
+        """
+        client.force_login(user_factory.create())
+        response = client.get(self.url)
+        assert response.status_code == status.HTTP_404_NOT_FOUND
+
+    def test_success(self, auth_client, django_assert_max_num_queries):
+        """Тест на эндпоинт GET: /goals/board/<id>/summary
+
+        Производит проверку структуры ответа и количества запросов к базе данных.
+        """
+        with django_assert_max_num_queries(6):
+            response = auth_client.get(self.url)
+        assert response.status_code == status.HTTP_200_OK
+
+        assert response.json() == {
+            'board': self.board.id,
+            'total': 5,
+            'by_status': {'to_do': 3, 'in_progress': 0, 'done': 2, 'archived': 1},
+            'by_priority': {'low': 0, 'medium': 2, 'high': 3, 'critical': 0},
+            'overdue': 3,
+        }
+
+    def test_counters_maintained(self, auth_client, board_factory, category_factory, user):
+        """Тест на счетчики целей доски
+
+        Производит проверку соответствия счетчиков целям доски после изменения, архивации,
+        переноса и удаления целей.
+        """
+        assert get_counters(self.board.id) == count_goals(self.board.id)
+
+        goal = Goal.objects.filter(status=Goal.Status.to_do).first()
+        response = auth_client.patch(
+            reverse('goals:goal-detail', args=[goal.id]),
+            {'status': Goal.Status.in_progress, 'priority': Goal.Priority.critical}
+        )
+        assert response.status_code == status.HTTP_200_OK
+        assert get_counters(self.board.id) == count_goals(self.board.id)
+
+        response = auth_client.delete(reverse('goals:goal-detail', args=[goal.id]))
+        assert response.status_code == status.HTTP_204_NO_CONTENT
+        assert get_counters(self.board.id) == count_goals(self.board.id)
+
+        other_board = board_factory.create(with_owner=user)
+        moved_category = category_factory.create(board=self.board, user=user)
+        Goal.objects.create(category=moved_category, user=user, title='moved')
+        moved_category.board = other_board
+        moved_category.save()
+        assert get_counters(self.board.id) == count_goals(self.board.id)
+        assert get_counters(other_board.id) == count_goals(other_board.id) == {(1, 2): 1}
+
+        Goal.objects.filter(status=Goal.Status.done).first().delete()
+        assert get_counters(self.board.id) == count_goals(self.board.id)
+
+        response = auth_client.delete(reverse('goals:category-detail', args=[self.category.id]))
+        assert response.status_code == status.HTTP_202_ACCEPTED
+        assert DeletionWorker().run_once()
+        assert get_counters(self.board.id) == count_goals(self.board.id)
+        assert get_counters(self.board.id) == {
+            (Goal.Status.archived, Goal.Priority.medium): 2,
+            (Goal.Status.archived, Goal.Priority.high): 2,
+            (Goal.Status.archived, Goal.Priority.critical): 1,
+        }
+
+        response = auth_client.delete(reverse('goals:board-detail', args=[other_board.id]))
+        assert response.status_code == status.HTTP_202_ACCEPTED
+        assert DeletionWorker().run_once()
+        assert get_counters(other_board.id) == {(Goal.Status.archived, Goal.Priority.medium): 1}
+
+    def test_counters_stale_instances(self):
+        """Тест на счетчики целей доски
+
+        Производит проверку счетчиков при сохранении двух загруженных ранее копий одной цели
+        (параллельное изменение статуса и приоритета).
+        """
+        goal_id = Goal.objects.filter(status=Goal.Status.to_do).values_list('id', flat=True).first()
+        first, second = Goal.objects.get(id=goal_id), Goal.objects.get(id=goal_id)
+
+        first.status = Goal.Status.in_progress
+        first.save(update_fields=('status',))
+        second.priority = Goal.Priority.critical
+        second.save(update_fields=('priority',))
+
+        assert get_counters(self.board.id) == count_goals(self.board.id)
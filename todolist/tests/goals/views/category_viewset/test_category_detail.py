@@ -2,6 +2,7 @@ import pytest
 from django.urls import reverse
 from rest_framework import status
 
+from goals.deletion import DeletionWorker
 from goals.models import Category, Board, BoardParticipant, Goal
 from tests.utils import BaseTestCase
 
@@ -159,9 +160,11 @@ class TestCategoryDestroy(CategoryTestCase):
         assert self.participant.role == user_role
 
         response = auth_client.delete(self.url)
-        assert response.status_code == status.HTTP_204_NO_CONTENT
+        assert response.status_code == status.HTTP_202_ACCEPTED
 
         self.category.refresh_from_db(fields=('is_deleted',))
-        self.goal.refresh_from_db(fields=('status',))
         assert self.category.is_deleted
+
+        assert DeletionWorker().run_once()
+        self.goal.refresh_from_db(fields=('status',))
         assert self.goal.status == Goal.Status.archived
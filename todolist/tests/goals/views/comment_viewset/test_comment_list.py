@@ -78,3 +78,17 @@ class TestCommentList(BaseTestCase):
         response = auth_client.get(self.url)
         assert response.status_code == status.HTTP_200_OK
         assert [comment['created'] for comment in response.json()] == sorted(created, reverse=True)
+
+    def test_deleted_category(self, auth_client, category_factory, goal_factory, comment_factory):
+        """Тест на endpoint GET: /goals/goal_comment/list
+
+        Производит проверку, что комментарии к целям удаленной категории не отображаются
+        до завершения фонового удаления ее целей.
+        """
+        comment: Comment = comment_factory.create(goal=self.goal)
+        deleted_category: Category = category_factory.create(board=self.board, is_deleted=True)
+        comment_factory.create(goal=goal_factory.create(category=deleted_category))
+
+        response = auth_client.get(self.url)
+        assert response.status_code == status.HTTP_200_OK
+        assert [item['id'] for item in response.json()] == [comment.id]
@@ -0,0 +1,125 @@
+import pytest
+from django.db.models import Count
+from django.urls import reverse
+from rest_framework import status
+
+from goals.models import Board, BoardGoalCounter, BoardParticipant, Category, Comment, Goal
+from goals.serializers import GoalBulkSerializer
+
+
+@pytest.mark.django_db()
+class TestGoalBulk:
+    url = reverse('goals:goal-bulk')
+
+    @pytest.fixture(autouse=True)
+    def setup(self, board_factory, category_factory, goal_factory, user):
+        self.board: Board = board_factory.create(with_owner=user)
+        self.category: Category = category_factory.create(board=self.board)
+        self.goals = goal_factory.create_batch(3, category=self.category, user=user)
+
+    def test_auth_required(self, client):
+        """Тест на endpoint POST: /goals/goal/bulk
+
+        Производит проверку требований аутентификации.
+        """
+        response = client.post(self.url, {}, format='json')
+        assert response.status_code == status.HTTP_403_FORBIDDEN
+
+    def test_failed_by_reader(self, auth_client, board_factory, category_factory, user):
+        """Тест на endpoint POST: /goals/goal/bulk
+
+        Производит проверку отклонения всего запроса, если на одной из досок пользователь является читателем.
+        """
+        board = board_factory.create()
+        BoardParticipant.objects.create(board=board, user=user, role=BoardParticipant.Role.reader)
+        category = category_factory.create(board=board)
+
+        response = auth_client.post(self.url, {
+            'create': [
+                {'category': self.category.id, 'title': 'goal'},
+                {'category': category.id, 'title': 'goal'},
+            ],
+        }, format='json')
+        assert response.status_code == status.HTTP_403_FORBIDDEN
+        assert Goal.objects.count() == 3
+
+    def test_invalid_goals(self, auth_client, goal_factory):
+        """Тест на endpoint POST: /goals/goal/bulk
+
+        Производит проверку отклонения архивных, неизвестных и повторяющихся целей.
+        """
+        archived = goal_factory.create(category=self.category, status=Goal.Status.archived)
+        for data in (
+            {'archive': [archived.id]},
+            {'archive': [0]},
+            {'update': [{'id': self.goals[0].id, 'title': 'goal'}], 'archive': [self.goals[0].id]},
+        ):
+            response = auth_client.post(self.url, data, format='json')
+            assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+    def test_success(self, auth_client, category_factory, board_factory, user, django_assert_max_num_queries):
+        """Тест на endpoint POST: /goals/goal/bulk
+
+        Производит проверку создания, изменения и архивации целей, фиксированного количества
+        запросов к базе данных и обновления счетчиков целей досок.
+        """
+        other_board = board_factory.create(with_owner=user)
+        other_category = category_factory.create(board=other_board)
+        comment = Comment.objects.create(goal=self.goals[1], user=user, text='comment')
+
+        with django_assert_max_num_queries(12):
+            response = auth_client.post(self.url, {
+                'create': [{'category': self.category.id, 'title': f'goal {n}'} for n in range(100)],
+                'update': [
+                    {'id': self.goals[0].id, 'status': Goal.Status.done, 'priority': Goal.Priority.critical},
+                    {'id': self.goals[1].id, 'category': other_category.id},
+                ],
+                'archive': [self.goals[2].id],
+            }, format='json')
+        assert response.status_code == status.HTTP_200_OK
+
+        data = response.json()
+        assert len(data['create']) == 100
+        assert data['create'][0]['title'] == 'goal 0'
+        assert [goal['id'] for goal in data['update']] == [self.goals[0].id, self.goals[1].id]
+        assert data['archive'] == [self.goals[2].id]
+
+        goal = Goal.objects.get(id=self.goals[0].id)
+        assert (goal.status, goal.priority) == (Goal.Status.done, Goal.Priority.critical)
+        assert Goal.objects.get(id=self.goals[1].id).board_id == other_board.id
+        assert Comment.objects.get(id=comment.id).board_id == other_board.id
+        assert Goal.objects.get(id=self.goals[2].id).status == Goal.Status.archived
+        assert Goal.objects.filter(title__startswith='goal ', board=self.board).count() == 100
+
+        for board in (self.board, other_board):
+            goals = dict(Goal.objects.filter(board=board).values_list('status').annotate(Count('id')).order_by())
+            assert BoardGoalCounter.objects.get_summary(board.id)['by_status'] == {
+                goal_status.name: goals.get(goal_status.value, 0) for goal_status in Goal.Status
+            }
+
+    def test_concurrent_change(self, auth_client, monkeypatch):
+        """Тест на endpoint POST: /goals/goal/bulk
+
+        Производит проверку счетчиков целей доски, если цель изменена другим запросом
+        после проверки данных запроса.
+        """
+        validate = GoalBulkSerializer.validate
+
+        def validate_and_change(serializer, attrs):
+            attrs = validate(serializer, attrs)
+            goal = Goal.objects.get(id=self.goals[0].id)
+            goal.status = Goal.Status.in_progress
+            goal.save(update_fields=('status',))
+            return attrs
+
+        monkeypatch.setattr(GoalBulkSerializer, 'validate', validate_and_change)
+        response = auth_client.post(self.url, {
+            'update': [{'id': self.goals[0].id, 'priority': Goal.Priority.critical}],
+        }, format='json')
+        assert response.status_code == status.HTTP_200_OK
+
+        goal = Goal.objects.get(id=self.goals[0].id)
+        assert (goal.status, goal.priority) == (Goal.Status.in_progress, Goal.Priority.critical)
+        assert BoardGoalCounter.objects.get_summary(self.board.id)['by_status'] == {
+            **dict.fromkeys(Goal.Status.names, 0), 'to_do': 2, 'in_progress': 1,
+        }
@@ -123,6 +123,24 @@ class TestGoalUpdate(GoalTestCase):
         self.goal.refresh_from_db(fields=('title',))
         assert self.goal.title == new_title
 
+    def test_board_synced_on_category_change(self, auth_client, user, board_factory, category_factory, comment_factory):
+        """Тест на endpoint PATCH: /goals/goal/<id>
+
+        Производит проверку синхронизации поля board цели и ее комментариев при смене категории.
+        """
+        comment = comment_factory.create(goal=self.goal, user=user)
+        assert self.goal.board_id == comment.board_id == self.board.id
+
+        new_board: Board = board_factory.create(with_owner=user)
+        new_category: Category = category_factory.create(board=new_board)
+
+        response = auth_client.patch(self.url, {'category': new_category.id})
+        assert response.status_code == status.HTTP_200_OK
+
+        self.goal.refresh_from_db(fields=('board',))
+        comment.refresh_from_db(fields=('board',))
+        assert self.goal.board_id == comment.board_id == new_board.id
+
 
 class TestGoalDestroy(GoalTestCase):
     method = 'delete'
@@ -165,3 +183,31 @@ class TestGoalDestroy(GoalTestCase):
 
         self.goal.refresh_from_db(fields=('status',))
         assert self.goal.status == Goal.Status.archived
+
+
+class TestGoalPermissionsQueries(GoalTestCase):
+    method = 'get'
+
+    def test_role_resolved_once(self, auth_client, django_assert_num_queries):
+        """Тест на endpoint GET: /goals/goal/<id>
+
+        Производит проверку количества запросов: сессия, пользователь, цель, роль участника доски.
+        """
+        with django_assert_num_queries(4):
+            response = auth_client.get(self.url)
+        assert response.status_code == status.HTTP_200_OK
+
+    def test_cached_role_reset_on_participant_change(self, auth_client, settings, faker):
+        """Тест на endpoint PATCH: /goals/goal/<id>
+
+        Производит проверку сброса закэшированной роли участника при ее изменении.
+        """
+        settings.BOARD_ROLE_CACHE_TIMEOUT = 60
+        assert auth_client.patch(self.url, {'title': faker.sentence()}).status_code == status.HTTP_200_OK
+
+        participant: BoardParticipant = self.board.participants.last()
+        participant.role = BoardParticipant.Role.reader
+        participant.save(update_fields=('role',))
+
+        response = auth_client.patch(self.url, {'title': faker.sentence()})
+        assert response.status_code == status.HTTP_403_FORBIDDEN
@@ -76,3 +76,22 @@ class TestGoalList(BaseTestCase):
         response = auth_client.get(self.url)
         assert response.status_code == status.HTTP_200_OK
         assert [goal['priority'] for goal in response.json()] == [1, 2, 3, 4]
+
+    def test_full_text_search(self, auth_client, goal_factory):
+        """Тест на endpoint GET: /goals/goal/list?search=
+
+        Производит проверку полнотекстового поиска целей по заголовку и описанию:
+        поиск по префиксу слова, сортировка по релевантности (совпадение в заголовке выше).
+        """
+        in_description = goal_factory.create(
+            category=self.category, title='Спорт', description='Пробежать марафон', priority=1
+        )
+        in_title = goal_factory.create(category=self.category, title='Марафоны в этом году', priority=4)
+        goal_factory.create(category=self.category, title='Прочитать книгу', description='Любую')
+
+        response = auth_client.get(self.url, {'search': 'марафон'})
+        assert response.status_code == status.HTTP_200_OK
+        assert [goal['id'] for goal in response.json()] == [in_title.id, in_description.id]
+
+        response = auth_client.get(self.url, {'search': 'мара', 'ordering': 'priority'})
+        assert [goal['id'] for goal in response.json()] == [in_description.id, in_title.id]
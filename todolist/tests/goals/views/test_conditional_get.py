@@ -0,0 +1,125 @@
+import pytest
+from django.core.cache import cache
+from django.urls import reverse
+from rest_framework import status
+
+from goals.models import Goal
+
+
+@pytest.mark.django_db()
+class TestConditionalGet:
+
+    @pytest.fixture(autouse=True)
+    def setup(self, board_factory, category_factory, goal_factory, user):  # noqa: PT004
+        self.board = board_factory.create(with_owner=user)
+        self.category = category_factory.create(board=self.board, user=user)
+        self.goals = goal_factory.create_batch(3, category=self.category, user=user)
+
+    @pytest.mark.parametrize(
+        'url_name', ['goals:board-list', 'goals:category-list', 'goals:goal-list', 'goals:comment-list']
+    )
+    def test_list_not_modified(self, auth_client, url_name: str, django_assert_max_num_queries):
+        """Тест на эндпоинты GET: {basename}-list
+
+        Производит проверку ответа 304 при совпадении ETag без повторной выборки данных.
+        """
+        url = reverse(url_name)
+        response = auth_client.get(url)
+        assert response.status_code == status.HTTP_200_OK
+        etag = response['ETag']
+
+        with django_assert_max_num_queries(3):
+            response = auth_client.get(url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == status.HTTP_304_NOT_MODIFIED
+        assert response['ETag'] == etag
+        assert not response.content
+
+    def test_goal_list_modified(self, auth_client, goal_factory, user):
+        """Тест на эндпоинт GET: /goals/goal/list
+
+        Производит проверку изменения ETag при создании, изменении и архивации целей,
+        а также при изменении параметров запроса.
+        """
+        url = reverse('goals:goal-list')
+
+        def get_etag(params=None) -> str:
+            response = auth_client.get(url, params or {})
+            assert response.status_code == status.HTTP_200_OK
+            return response['ETag']
+
+        etags = [get_etag(), get_etag({'limit': 1})]
+
+        goal_factory.create(category=self.category, user=user)
+        etags.append(get_etag())
+
+        goal = self.goals[0]
+        goal.title = 'new title'
+        goal.save()
+        etags.append(get_etag())
+
+        Goal.objects.filter(id=goal.id).archive()
+        etags.append(get_etag())
+
+        assert len(set(etags)) == len(etags)
+
+        response = auth_client.get(url, HTTP_IF_NONE_MATCH=etags[0])
+        assert response.status_code == status.HTTP_200_OK
+
+    def test_list_validators(self, auth_client):
+        """Тест на эндпоинт GET: /goals/goal/list
+
+        Производит проверку отсутствия Last-Modified у списков и условных запросов в режиме keyset
+        пагинации без кэша ответов (версия списка требует COUNT по всей выборке).
+        """
+        url = reverse('goals:goal-list')
+        response = auth_client.get(url)
+        assert response['ETag']
+        assert not response.has_header('Last-Modified')
+
+        assert not auth_client.get(url, {'pagination': 'cursor'}).has_header('ETag')
+
+    def test_list_cache_version(self, auth_client, settings, django_assert_max_num_queries,
+                                django_capture_on_commit_callbacks):
+        """Тест на эндпоинт GET: /goals/goal/list
+
+        Производит проверку версии списка по версиям досок при включенном кэше ответов:
+        ответ 304 без запросов к данным, в том числе в режиме keyset пагинации, и изменение
+        ETag при архивации цели.
+        """
+        settings.LIST_CACHE_TIMEOUT = 300
+        cache.clear()
+        url = reverse('goals:goal-list')
+        etag = auth_client.get(url, {'pagination': 'cursor'})['ETag']
+
+        #: Сессия, пользователь и доски пользователя
+        with django_assert_max_num_queries(3):
+            response = auth_client.get(url, {'pagination': 'cursor'}, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == status.HTTP_304_NOT_MODIFIED
+
+        with django_capture_on_commit_callbacks(execute=True):
+            Goal.objects.filter(id=self.goals[0].id).archive()
+        response = auth_client.get(url, {'pagination': 'cursor'}, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == status.HTTP_200_OK
+
+    def test_detail_not_modified(self, auth_client, user_factory):
+        """Тест на эндпоинты GET: {basename}-detail
+
+        Производит проверку ответа 304 для объекта и изменения ETag доски при изменении участников.
+        """
+        url = reverse('goals:goal-detail', args=[self.goals[0].id])
+        etag = auth_client.get(url)['ETag']
+        assert auth_client.get(url, HTTP_IF_NONE_MATCH=etag).status_code == status.HTTP_304_NOT_MODIFIED
+
+        url = reverse('goals:board-detail', args=[self.board.id])
+        response = auth_client.get(url)
+        etag = response['ETag']
+        assert response['Last-Modified']
+        assert auth_client.get(
+            url, HTTP_IF_MODIFIED_SINCE=response['Last-Modified']
+        ).status_code == status.HTTP_304_NOT_MODIFIED
+
+        response = auth_client.patch(url, {'participants': [
+            {'user': user_factory.create().username, 'role': 3},
+        ]}, format='json')
+        assert response.status_code == status.HTTP_200_OK
+        assert auth_client.get(url, HTTP_IF_NONE_MATCH=etag).status_code == status.HTTP_200_OK
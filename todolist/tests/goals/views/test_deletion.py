@@ -0,0 +1,75 @@
+from datetime import timedelta
+
+import pytest
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+
+from goals.deletion import DeletionWorker
+from goals.models import BoardGoalCounter, Category, DeletionJob, Goal
+
+
+@pytest.mark.django_db()
+class TestDeletion:
+
+    @pytest.fixture(autouse=True)
+    def setup(self, board_factory, category_factory, goal_factory, user):  # noqa: PT004
+        self.board = board_factory.create(with_owner=user)
+        self.categories = category_factory.create_batch(3, board=self.board, user=user)
+        for category in self.categories:
+            goal_factory.create_batch(2, category=category, user=user)
+
+    def test_board_deletion(self, auth_client, client, user_factory):
+        """Тест на эндпоинты DELETE: /goals/board/<id>, GET: /goals/deletion/<id>
+
+        Производит проверку скрытия доски до обработки задачи, обработки категорий и целей
+        пакетами и статуса задачи.
+        """
+        response = auth_client.delete(reverse('goals:board-detail', args=[self.board.id]))
+        assert response.status_code == status.HTTP_202_ACCEPTED
+        url = reverse('goals:deletion-detail', args=[response.json()['id']])
+
+        assert auth_client.get(url).json()['status'] == DeletionJob.Status.pending
+        for url_name in ('goals:category-list', 'goals:goal-list', 'goals:comment-list'):
+            assert not auth_client.get(reverse(url_name)).json()
+
+        worker = DeletionWorker(batch_size=2)
+        assert worker.run_once()
+        assert not worker.run_once()
+
+        data = auth_client.get(url).json()
+        assert data['status'] == DeletionJob.Status.done
+        assert data['processed'] == 9
+        assert not Category.objects.filter(board=self.board, is_deleted=False).exists()
+        assert not Goal.objects.filter(board=self.board).exclude(status=Goal.Status.archived).exists()
+        assert BoardGoalCounter.objects.get_summary(self.board.id)['by_status']['archived'] == 6
+
+        client.force_login(user_factory.create())
+        assert client.get(url).status_code == status.HTTP_404_NOT_FOUND
+
+    def test_goal_create_in_deleted_board(self, auth_client):
+        """Тест на эндпоинт POST: /goals/goal/create
+
+        Производит проверку запрета создания цели в категории доски, удаление которой не завершено.
+        """
+        auth_client.delete(reverse('goals:board-detail', args=[self.board.id]))
+        response = auth_client.post(reverse('goals:goal-create'), {'category': self.categories[0].id, 'title': 'goal'})
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+    def test_expired_job(self, user):
+        """Тест на обработчик задач удаления
+
+        Производит проверку повторного выполнения задачи, прерванной во время выполнения.
+        """
+        category = self.categories[0]
+        category.is_deleted = True
+        category.save(update_fields=('is_deleted',))
+        job = DeletionJob.objects.create(user=user, category=category, status=DeletionJob.Status.running)
+
+        worker = DeletionWorker(lease=60)
+        assert not worker.run_once()
+
+        DeletionJob.objects.filter(id=job.id).update(updated=timezone.now() - timedelta(minutes=2))
+        assert worker.run_once()
+        job.refresh_from_db()
+        assert (job.status, job.processed) == (DeletionJob.Status.done, 2)
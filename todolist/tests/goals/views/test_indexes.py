@@ -0,0 +1,93 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework import status
+
+#: Объем тестовых данных: доски других пользователей
+BOARDS = 2000
+CATEGORIES_PER_BOARD = 2
+GOALS_PER_CATEGORY = 10
+COMMENTS_PER_GOAL = 2
+
+
+@pytest.fixture()
+def large_dataset(user, user_factory, board_factory, category_factory, goal_factory, comment_factory):
+    """Наполняет базу данных большим количеством досок, категорий, целей и комментариев
+
+    Данные создаются средствами SQL (generate_series), после чего обновляется статистика планировщика.
+    Пользователю user доступна одна доска.
+    """
+    owner = user_factory.create()
+    board = board_factory.create(with_owner=user)
+    category = category_factory.create(board=board, user=user)
+    goal = goal_factory.create(category=category, user=user)
+    comment_factory.create(goal=goal, user=user)
+
+    with connection.cursor() as cursor:
+        cursor.execute(
+            'INSERT INTO goals_board (title, is_deleted, created, updated) '
+            'SELECT %s || n, false, now(), now() FROM generate_series(1, %s) n',
+            ['board ', BOARDS]
+        )
+        cursor.execute(
+            'INSERT INTO goals_boardparticipant (board_id, user_id, role, created, updated) '
+            'SELECT id, %s, 1, now(), now() FROM goals_board WHERE id <> %s',
+            [owner.id, board.id]
+        )
+        cursor.execute(
+            'INSERT INTO goals_category (title, user_id, board_id, is_deleted, created, updated) '
+            'SELECT %s || n, %s, b.id, n %% 5 = 0, now(), now() '
+            'FROM goals_board b, generate_series(1, %s) n WHERE b.id <> %s',
+            ['category ', owner.id, CATEGORIES_PER_BOARD, board.id]
+        )
+        cursor.execute(
+            'INSERT INTO goals_goal '
+            '(title, description, user_id, category_id, board_id, status, priority, due_date, created, updated) '
+            'SELECT %s || n, %s, %s, c.id, c.board_id, n %% 4 + 1, n %% 4 + 1, now() + n * interval %s, now(), now() '
+            'FROM goals_category c, generate_series(1, %s) n WHERE c.board_id <> %s',
+            ['goal ', '', owner.id, '1 day', GOALS_PER_CATEGORY, board.id]
+        )
+        cursor.execute(
+            'INSERT INTO goals_comment (text, user_id, goal_id, board_id, created, updated) '
+            'SELECT %s || n, %s, g.id, g.board_id, now(), now() '
+            'FROM goals_goal g, generate_series(1, %s) n WHERE g.board_id <> %s',
+            ['comment ', owner.id, COMMENTS_PER_GOAL, board.id]
+        )
+        cursor.execute('ANALYZE')
+
+    return board
+
+
+@pytest.mark.django_db()
+@pytest.mark.parametrize(
+    'url, table', [
+        (reverse('goals:board-list'), 'goals_board'),
+        (reverse('goals:category-list'), 'goals_category'),
+        (reverse('goals:goal-list'), 'goals_goal'),
+        (reverse('goals:comment-list'), 'goals_comment'),
+    ],
+    ids=['board-list', 'category-list', 'goal-list', 'comment-list']
+)
+def test_list_uses_index_scan(url: str, table: str, auth_client, large_dataset):
+    """Тест на эндпоинты GET: {basename}-list
+
+    Производит проверку плана выполнения (EXPLAIN) запроса списка на большом объеме данных:
+    основная таблица и таблица участников досок читаются по индексу, а не последовательным сканированием.
+    """
+    with CaptureQueriesContext(connection) as context:
+        response = auth_client.get(url, {'limit': 20})
+    assert response.status_code == status.HTTP_200_OK
+    assert response.json()['count'] == 1
+
+    queries = [query['sql'] for query in context.captured_queries if f'FROM "{table}"' in query['sql']]
+    assert queries
+
+    with connection.cursor() as cursor:
+        for sql in queries:
+            cursor.execute(f'EXPLAIN {sql}')
+            plan = '\n'.join(row[0] for row in cursor.fetchall())
+
+            assert f'Seq Scan on {table}' not in plan, plan
+            assert 'Seq Scan on goals_boardparticipant' not in plan, plan
+            assert 'Index' in plan, plan
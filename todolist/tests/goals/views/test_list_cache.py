@@ -0,0 +1,95 @@
+import pytest
+from django.core.cache import cache
+from django.urls import reverse
+from rest_framework import status
+
+from goals.models import BoardParticipant, Comment, Goal
+
+
+@pytest.mark.django_db()
+class TestListCache:
+
+    @pytest.fixture(autouse=True)
+    def setup(self, settings, board_factory, category_factory, goal_factory, user):  # noqa: PT004
+        settings.LIST_CACHE_TIMEOUT = 300
+        cache.clear()
+
+        self.board = board_factory.create(with_owner=user)
+        self.category = category_factory.create(board=self.board, user=user)
+        self.goals = goal_factory.create_batch(3, category=self.category, user=user)
+        self.comment = Comment.objects.create(goal=self.goals[0], user=user, text='comment')
+
+    @pytest.mark.parametrize(
+        'url_name', ['goals:board-list', 'goals:category-list', 'goals:goal-list', 'goals:comment-list']
+    )
+    def test_cached(self, auth_client, url_name: str, django_assert_max_num_queries):
+        """Тест на эндпоинты GET: {basename}-list
+
+        Производит проверку ответа из кэша без выборки и сериализации данных.
+        """
+        url = reverse(url_name)
+        response = auth_client.get(url)
+        assert response.status_code == status.HTTP_200_OK
+
+        with django_assert_max_num_queries(4):
+            cached = auth_client.get(url)
+        assert cached.status_code == status.HTTP_200_OK
+        assert cached.json() == response.json()
+
+    def test_cache_per_user(self, client, user_factory, board_factory):
+        """Тест на эндпоинт GET: /goals/board/list
+
+        Производит проверку, что ответ одного пользователя не возвращается другому.
+        """
+        url = reverse('goals:board-list')
+        other_user = user_factory.create()
+        board_factory.create(with_owner=other_user)
+
+        responses = []
+        for user in (self.board.participants.get().user, other_user):
+            client.force_login(user)
+            responses.append(client.get(url).json())
+        assert responses[0] != responses[1]
+
+    def test_invalidation(self, auth_client, user_factory, django_capture_on_commit_callbacks):
+        """Тест на эндпоинты GET: {basename}-list
+
+        Производит проверку сброса кэша при изменении целей, комментариев, участников досок
+        и профиля пользователя, в т.ч. групповыми операциями без сигналов моделей.
+        """
+        goal_url, comment_url = reverse('goals:goal-list'), reverse('goals:comment-list')
+
+        def get_titles() -> list:
+            return [goal['title'] for goal in auth_client.get(goal_url).json()]
+
+        assert len(get_titles()) == 3
+
+        with django_capture_on_commit_callbacks(execute=True):
+            response = auth_client.patch(reverse('goals:goal-detail', args=[self.goals[0].id]), {'title': 'patched'})
+        assert response.status_code == status.HTTP_200_OK
+        assert 'patched' in get_titles()
+
+        with django_capture_on_commit_callbacks(execute=True):
+            Goal.objects.filter(id=self.goals[1].id).archive()
+        assert len(get_titles()) == 2
+
+        with django_capture_on_commit_callbacks(execute=True):
+            response = auth_client.post(reverse('goals:goal-bulk'), {
+                'update': [{'id': self.goals[2].id, 'title': 'bulk'}],
+            }, format='json')
+        assert response.status_code == status.HTTP_200_OK
+        assert 'bulk' in get_titles()
+
+        assert auth_client.get(comment_url).json()[0]['user']['username'] == self.comment.user.username
+        with django_capture_on_commit_callbacks(execute=True):
+            self.comment.user.username = 'renamed'
+            self.comment.user.save()
+        assert auth_client.get(comment_url).json()[0]['user']['username'] == 'renamed'
+
+        reader = user_factory.create()
+        auth_client.force_login(reader)
+        assert not auth_client.get(goal_url).json()
+
+        with django_capture_on_commit_callbacks(execute=True):
+            BoardParticipant.objects.create(board=self.board, user=reader, role=BoardParticipant.Role.reader)
+        assert len(get_titles()) == 2
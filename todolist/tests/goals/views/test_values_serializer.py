@@ -0,0 +1,57 @@
+import json
+
+import pytest
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.utils.encoders import JSONEncoder
+
+from goals.models import Category, Comment, Goal
+from goals.serializers import CategoryListSerializer, CommentListSerializer, GoalListSerializer
+
+
+def serialize(serializer_class, queryset) -> list:
+    """Ответ исходного ModelSerializer в виде JSON"""
+    return json.loads(json.dumps(serializer_class(queryset, many=True).data, cls=JSONEncoder))
+
+
+@pytest.mark.django_db()
+class TestValuesSerializer:
+
+    @pytest.fixture(autouse=True)
+    def setup(self, board_factory, category_factory, goal_factory, user):  # noqa: PT004
+        self.board = board_factory.create(with_owner=user)
+        self.category = category_factory.create(board=self.board, user=user)
+        self.goals = goal_factory.create_batch(5, category=self.category, user=user)
+        self.goals[0].due_date = None
+        self.goals[0].save()
+        for goal in self.goals:
+            Comment.objects.create(goal=goal, user=user, text=f'comment {goal.id}')
+
+    @pytest.mark.parametrize(('url_name', 'serializer_class', 'queryset'), [
+        ('goals:category-list', CategoryListSerializer, Category.objects.order_by('title', 'id')),
+        ('goals:goal-list', GoalListSerializer, Goal.objects.order_by('priority', 'id')),
+        ('goals:comment-list', CommentListSerializer, Comment.objects.order_by('-created', '-id')),
+    ])
+    def test_same_shape(self, auth_client, url_name: str, serializer_class, queryset):
+        """Тест на эндпоинты GET: {basename}-list
+
+        Производит проверку совпадения ответа с ответом ModelSerializer (в т.ч. формата дат),
+        с пагинацией по смещению и по ключу.
+        """
+        url = reverse(url_name)
+        expected = serialize(serializer_class, queryset)
+
+        response = auth_client.get(url)
+        assert response.status_code == status.HTTP_200_OK
+        assert sorted(response.json(), key=lambda row: row['id']) == sorted(expected, key=lambda row: row['id'])
+
+        response = auth_client.get(url, {'limit': 2, 'offset': 1})
+        assert response.json()['count'] == len(expected)
+        assert len(response.json()['results']) == min(2, len(expected) - 1)
+
+        results, data = [], auth_client.get(url, {'pagination': 'cursor', 'limit': 2}).json()
+        results.extend(data['results'])
+        while data['next']:
+            data = auth_client.get(data['next']).json()
+            results.extend(data['results'])
+        assert sorted(results, key=lambda row: row['id']) == sorted(expected, key=lambda row: row['id'])
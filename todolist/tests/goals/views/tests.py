@@ -1,4 +1,7 @@
+from datetime import timedelta
+
 import pytest
+from django.utils import timezone
 from factory.django import DjangoModelFactory
 from rest_framework import status
 from rest_framework.reverse import reverse
@@ -47,3 +50,42 @@ def test_pagination(factory: DjangoModelFactory, url: str, auth_client, user):
     assert offset_response.status_code == status.HTTP_200_OK
     assert offset_response.json()['count'] == 10
     assert len(offset_response.json()['results']) == 2
+
+
+@pytest.mark.django_db()
+def test_cursor_pagination(auth_client, user):
+    """Тест на эндпоинт GET: /goals/goal/list?pagination=cursor
+
+    Производит проверку функционирования пагинации по ключу (priority, due_date, id):
+    обход страниц вперед и назад без пропусков и повторов, отсутствие поля count
+    """
+    board = board_factory.create(with_owner=user)
+    category = category_factory.create(board=board)
+    due_dates = [None, timezone.now(), timezone.now() + timedelta(days=1)]
+    goals = [
+        goal_factory.create(category=category, priority=priority, due_date=due_date)
+        for priority in (2, 1) for due_date in due_dates for _ in range(2)
+    ]
+    expected = [
+        goal.id for goal in sorted(
+            goals, key=lambda goal: (goal.priority, goal.due_date is None, goal.due_date or 0, goal.id)
+        )
+    ]
+
+    url = reverse('goals:goal-list')
+    response = auth_client.get(url, {'pagination': 'cursor', 'limit': 5})
+    assert response.status_code == status.HTTP_200_OK
+    assert 'count' not in response.json()
+    assert response.json()['previous'] is None
+
+    pages = [response.json()]
+    while pages[-1]['next']:
+        pages.append(auth_client.get(pages[-1]['next']).json())
+    assert [len(page['results']) for page in pages] == [5, 5, 2]
+    assert [goal['id'] for page in pages for goal in page['results']] == expected
+
+    previous_page = auth_client.get(pages[-1]['previous']).json()
+    assert [goal['id'] for goal in previous_page['results']] == expected[5:10]
+
+    invalid_response = auth_client.get(url, {'cursor': 'invalid'})
+    assert invalid_response.status_code == status.HTTP_404_NOT_FOUND
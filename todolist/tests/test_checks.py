@@ -0,0 +1,22 @@
+from bot.checks import check_bot_caches
+from goals.checks import check_goals_caches
+
+
+def test_local_cache_refused(settings):
+    """Тест на проверку настроек кэширования: кэш процесса недопустим вне режима DEBUG"""
+    settings.DEBUG = False
+    settings.CACHES = {'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}}
+    settings.BOARD_ROLE_CACHE_TIMEOUT = 60
+    settings.LIST_CACHE_TIMEOUT = 0
+    settings.TG_CHAT_CACHE = 'default'
+    settings.TG_CATEGORY_CACHE_TIMEOUT = 0
+
+    assert [error.id for error in check_goals_caches(None)] == ['goals.E001']
+    assert [error.id for error in check_bot_caches(None)] == ['bot.E001']
+
+    settings.CACHES = {'default': {'BACKEND': 'django.core.cache.backends.redis.RedisCache', 'LOCATION': 'redis://'}}
+    assert check_goals_caches(None) == check_bot_caches(None) == []
+
+    settings.CACHES = {'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}}
+    settings.DEBUG = True
+    assert check_goals_caches(None) == check_bot_caches(None) == []
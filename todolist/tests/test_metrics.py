@@ -0,0 +1,121 @@
+import os
+import time
+
+import pytest
+from django.urls import reverse
+from rest_framework import status
+
+from todolist.metrics import BOT_SEND_ERRORS, REGISTRY, Counter, Histogram, Registry, render
+
+
+def get_sample(content: str, sample: str) -> float:
+    for line in content.splitlines():
+        if line.startswith(f'{sample} '):
+            return float(line.rsplit(' ', 1)[1])
+    return 0
+
+
+@pytest.mark.django_db()
+class TestMetrics:
+    url = reverse('metrics')
+
+    @pytest.fixture(autouse=True)
+    def setup(self, client, settings):
+        settings.METRICS_TOKEN = 'secret'
+        client.defaults['HTTP_AUTHORIZATION'] = 'Bearer secret'
+
+    def test_request_metrics(self, auth_client, client):
+        """Тест на эндпоинт GET: /metrics
+
+        Производит проверку учета длительности запросов и количества SQL запросов по имени маршрута.
+        """
+        before = client.get(self.url).content.decode()
+        auth_client.get(reverse('goals:goal-list'), HTTP_AUTHORIZATION='')
+        response = client.get(self.url)
+        assert response.status_code == status.HTTP_200_OK
+        assert response['Content-Type'].startswith('text/plain; version=0.0.4')
+
+        content = response.content.decode()
+        assert '# TYPE todolist_http_request_duration_seconds histogram' in content
+        sample = 'todolist_http_request_duration_seconds_count{route="goal-list",method="GET"}'
+        assert get_sample(content, sample) == get_sample(before, sample) + 1
+        sample = 'todolist_http_requests_total{route="goal-list",method="GET",status="200"}'
+        assert get_sample(content, sample) == get_sample(before, sample) + 1
+        sample = 'todolist_db_queries_total{route="goal-list"}'
+        assert get_sample(content, sample) > get_sample(before, sample)
+
+    def test_token(self, client, settings):
+        """Тест на эндпоинт GET: /metrics
+
+        Производит проверку доступа по токену и отключения эндпоинта без токена.
+        """
+        assert client.get(self.url, HTTP_AUTHORIZATION='').status_code == status.HTTP_403_FORBIDDEN
+        assert client.get(self.url, HTTP_AUTHORIZATION='Bearer other').status_code == status.HTTP_403_FORBIDDEN
+        assert client.get(self.url).status_code == status.HTTP_200_OK
+
+        settings.METRICS_TOKEN = ''
+        assert client.get(self.url).status_code == status.HTTP_404_NOT_FOUND
+
+    def test_processes(self, client, settings, tmp_path):
+        """Тест на эндпоинт GET: /metrics
+
+        Производит проверку суммирования снимков метрик нескольких процессов.
+        """
+        BOT_SEND_ERRORS.inc(method='sendMessage')
+        sample = 'todolist_bot_send_errors_total{method="sendMessage"}'
+        before = get_sample(render(REGISTRY.snapshot()), sample)
+
+        settings.METRICS_DIR = str(tmp_path)
+        other = Registry()
+        Counter(BOT_SEND_ERRORS.name, BOT_SEND_ERRORS.documentation, ('method',), registry=other).inc(
+            2, method='sendMessage'
+        )
+        other.flush()
+
+        content = client.get(self.url).content.decode()
+        assert get_sample(content, sample) == before + 2
+        assert len(list(tmp_path.glob('*.json'))) == 2
+
+    def test_stale_processes(self, client, settings, tmp_path):
+        """Тест на эндпоинт GET: /metrics
+
+        Производит проверку переноса снимков завершившихся процессов в общий файл.
+        """
+        BOT_SEND_ERRORS.inc(method='sendMessage')
+        sample = 'todolist_bot_send_errors_total{method="sendMessage"}'
+        before = get_sample(render(REGISTRY.snapshot()), sample)
+
+        settings.METRICS_DIR = str(tmp_path)
+        stale_time = time.time() - settings.METRICS_FLUSH_INTERVAL * 20
+        for amount in (2, 3):
+            other = Registry()
+            Counter(BOT_SEND_ERRORS.name, BOT_SEND_ERRORS.documentation, ('method',), registry=other).inc(
+                amount, method='sendMessage'
+            )
+            other.flush()
+            os.utime(tmp_path / other._filename, (stale_time, stale_time))
+
+        for _ in range(2):
+            content = client.get(self.url).content.decode()
+            assert get_sample(content, sample) == before + 5
+            assert sorted(path.name for path in tmp_path.glob('*.json')) == sorted(
+                ['aggregate.json', REGISTRY._filename]
+            )
+
+
+def test_histogram():
+    """Тест на формирование гистограммы в текстовом формате Prometheus"""
+    registry = Registry()
+    histogram = Histogram('latency_seconds', 'Latency', ('type',), buckets=(0.1, 1), registry=registry)
+    for value in (0.05, 0.1, 0.5, 20):
+        histogram.observe(value, type='a"b')
+
+    assert render(registry.snapshot()).splitlines() == [
+        '# HELP latency_seconds Latency',
+        '# TYPE latency_seconds histogram',
+        'latency_seconds_bucket{type="a\\"b",le="0.1"} 2',
+        'latency_seconds_bucket{type="a\\"b",le="1.0"} 3',
+        'latency_seconds_bucket{type="a\\"b",le="+Inf"} 4',
+        'latency_seconds_sum{type="a\\"b"} 20.65',
+        'latency_seconds_count{type="a\\"b"} 4',
+    ]
@@ -0,0 +1,88 @@
+import json
+import logging
+
+import pytest
+from django.urls import reverse
+
+from goals.views import GoalViewSet
+from todolist.middleware import QueryBudgetExceeded
+
+
+@pytest.mark.django_db()
+class TestQueryBudgetMiddleware:
+
+    @pytest.fixture(autouse=True)
+    def setup(self, board_factory, category_factory, goal_factory, user):  # noqa: PT004
+        self.board = board_factory.create(with_owner=user)
+        self.category = category_factory.create(board=self.board, user=user)
+        self.goals = goal_factory.create_batch(3, category=self.category, user=user)
+
+    def test_server_timing(self, auth_client, settings, caplog):
+        """Тест на инструментацию запросов
+
+        Производит проверку заголовка Server-Timing и записи показателей запроса в журнал.
+        """
+        settings.SERVER_TIMING = True
+        with caplog.at_level(logging.INFO, logger='todolist.requests'):
+            response = auth_client.get(reverse('goals:goal-list'))
+
+        timing = response['Server-Timing']
+        assert timing.startswith('db;dur=')
+        assert 'render;dur=' in timing and 'total;dur=' in timing
+
+        record = json.loads(caplog.records[-1].getMessage())
+        assert record['view'] == 'goals:goal-list'
+        assert record['status'] == 200
+        assert f'desc="{record["queries"]} queries"' in timing
+        assert 0 < record['queries'] <= GoalViewSet.query_budgets['list']
+
+    def test_disabled_header(self, auth_client, settings, user):
+        """Тест на инструментацию запросов
+
+        Производит проверку отключения заголовка Server-Timing для всех, кроме персонала.
+        """
+        settings.SERVER_TIMING = False
+        assert 'Server-Timing' not in auth_client.get(reverse('goals:goal-list'))
+
+        user.is_staff = True
+        user.save(update_fields=('is_staff',))
+        assert 'Server-Timing' in auth_client.get(reverse('goals:goal-list'))
+
+    def test_staff_header_without_user_load(self, auth_client, settings, user, django_assert_num_queries):
+        """Тест на инструментацию запросов
+
+        Производит проверку, что для заголовка Server-Timing не загружается пользователь,
+        не загруженный представлением.
+        """
+        settings.SERVER_TIMING = False
+        settings.METRICS_TOKEN = 'secret'
+        user.is_staff = True
+        user.save(update_fields=('is_staff',))
+
+        with django_assert_num_queries(0):
+            response = auth_client.get(reverse('metrics'), HTTP_AUTHORIZATION='Bearer secret')
+        assert 'Server-Timing' not in response
+
+    def test_budget_exceeded(self, auth_client, monkeypatch):
+        """Тест на бюджет SQL запросов
+
+        Производит проверку ошибки при превышении бюджета запросов действия представления.
+        """
+        monkeypatch.setitem(GoalViewSet.query_budgets, 'retrieve', 1)
+        with pytest.raises(QueryBudgetExceeded, match='goals:goal-detail'):
+            auth_client.get(reverse('goals:goal-detail', args=[self.goals[0].id]))
+
+    def test_budget_warning(self, auth_client, monkeypatch, settings, caplog):
+        """Тест на бюджет SQL запросов
+
+        Производит проверку предупреждения в журнале при отключенном строгом режиме.
+        """
+        settings.QUERY_BUDGET_STRICT = False
+        monkeypatch.setitem(GoalViewSet.query_budgets, 'list', 1)
+        with caplog.at_level(logging.INFO, logger='todolist.requests'):
+            response = auth_client.get(reverse('goals:goal-list'))
+
+        assert response.status_code == 200
+        record = caplog.records[-1]
+        assert record.levelno == logging.WARNING
+        assert json.loads(record.getMessage())['query_budget'] == 1
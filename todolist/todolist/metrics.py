@@ -0,0 +1,313 @@
+import atexit
+import fcntl
+import glob
+import json
+import logging
+import os
+import threading
+import time
+import uuid
+from bisect import bisect_left
+
+from django.conf import settings
+
+#: Границы интервалов гистограмм по умолчанию (секунды)
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+#: Файл каталога METRICS_DIR с суммой снимков завершившихся процессов
+AGGREGATE_FILENAME = 'aggregate.json'
+#: Снимок, не обновлявшийся дольше этого количества интервалов записи, считается снимком завершившегося процесса
+STALE_FLUSH_INTERVALS = 12
+
+
+class Registry:
+    """Реестр метрик процесса
+
+    Значения метрик накапливаются в памяти процесса. Если задан каталог settings.METRICS_DIR,
+    каждый процесс (воркер gunicorn, бот) раз в settings.METRICS_FLUSH_INTERVAL секунд и при
+    завершении записывает снимок своих значений в отдельный файл каталога, а при чтении
+    метрик снимки всех процессов суммируются. Без каталога доступны только метрики
+    текущего процесса.
+
+    Снимки завершившихся процессов (не обновлявшиеся STALE_FLUSH_INTERVALS интервалов записи)
+    при чтении метрик переносятся в общий файл AGGREGATE_FILENAME и удаляются, поэтому количество
+    файлов каталога не растет с перезапусками воркеров. Идентификатор процесса для этого не используется:
+    процессы разных контейнеров, пишущие в общий каталог, имеют собственные пространства pid.
+    """
+
+    def __init__(self):
+        self.metrics: dict[str, Metric] = {}
+        self.logger = logging.getLogger(__name__)
+        self._reset()
+        os.register_at_fork(after_in_child=self._reset)
+        atexit.register(self.flush)
+
+    def register(self, metric: 'Metric') -> None:
+        if metric.name in self.metrics:
+            raise ValueError(f'Metric {metric.name} is already registered')
+        self.metrics[metric.name] = metric
+
+    def snapshot(self) -> dict:
+        """Возвращает значения метрик процесса
+
+        Returns:
+            dict: {имя: {'type', 'help', 'labels', 'buckets', 'samples': {JSON значений меток: значение}}}
+        """
+        return {name: metric.snapshot() for name, metric in self.metrics.items()}
+
+    def collect(self) -> dict:
+        """Возвращает значения метрик, суммированные по всем процессам"""
+        if not settings.METRICS_DIR:
+            return self.snapshot()
+
+        self.flush()
+        self._merge_stale()
+        collected = {}
+        for path in glob.glob(os.path.join(settings.METRICS_DIR, '*.json')):
+            if (snapshot := _load(path)) is not None:
+                merge_snapshot(collected, snapshot)
+        return collected
+
+    def flush(self) -> None:
+        """Записывает снимок значений метрик процесса в файл каталога settings.METRICS_DIR"""
+        if not settings.METRICS_DIR or not self.started:
+            return
+
+        path = os.path.join(settings.METRICS_DIR, self._filename)
+        try:
+            with open(f'{path}.tmp', 'w') as file:
+                json.dump(self.snapshot(), file)
+            os.replace(f'{path}.tmp', path)
+        except OSError:
+            self.logger.exception('Metrics flush to %s failed', path)
+
+    def start(self) -> None:
+        """Запускает периодическую запись снимков (при первом изменении метрик в процессе)"""
+        with self._lock:
+            if self.started:
+                return
+            if settings.METRICS_DIR:
+                threading.Thread(target=self._flush_loop, name='metrics-flush', daemon=True).start()
+            self.started = True
+
+    def _flush_loop(self) -> None:
+        while True:
+            time.sleep(settings.METRICS_FLUSH_INTERVAL)
+            self.flush()
+
+    def _merge_stale(self) -> None:
+        #: Переносит снимки завершившихся процессов в общий файл (под блокировкой, чтобы снимок
+        #: не был учтен дважды при одновременном чтении метрик несколькими воркерами)
+        stale_before = time.time() - settings.METRICS_FLUSH_INTERVAL * STALE_FLUSH_INTERVALS
+        aggregate_path = os.path.join(settings.METRICS_DIR, AGGREGATE_FILENAME)
+        stale = [
+            path for path in glob.glob(os.path.join(settings.METRICS_DIR, '*.json'))
+            if path != aggregate_path and _get_mtime(path) < stale_before
+        ]
+        if not stale:
+            return
+
+        try:
+            with open(os.path.join(settings.METRICS_DIR, 'aggregate.lock'), 'w') as lock:
+                fcntl.flock(lock, fcntl.LOCK_EX)
+                aggregate = _load(aggregate_path) or {}
+                merged = []
+                for path in stale:
+                    if (snapshot := _load(path)) is not None:
+                        merge_snapshot(aggregate, snapshot)
+                        merged.append(path)
+                if not merged:
+                    return
+                with open(f'{aggregate_path}.tmp', 'w') as file:
+                    json.dump(aggregate, file)
+                os.replace(f'{aggregate_path}.tmp', aggregate_path)
+                for path in merged:
+                    os.remove(path)
+        except OSError:
+            self.logger.exception('Metrics merge to %s failed', aggregate_path)
+
+    def _reset(self) -> None:
+        #: Дочерний процесс (воркер gunicorn) начинает с нулевых значений и пишет снимки в свой файл
+        self._lock = threading.Lock()
+        self.started = False
+        self._filename = f'{os.getpid()}-{uuid.uuid4().hex[:8]}.json'
+        for metric in self.metrics.values():
+            metric.reset()
+
+
+def _load(path: str) -> dict | None:
+    try:
+        with open(path) as file:
+            return json.load(file)
+    except (OSError, ValueError):
+        return None
+
+
+def _get_mtime(path: str) -> float:
+    try:
+        return os.path.getmtime(path)
+    except OSError:
+        return float('inf')
+
+
+def merge_snapshot(target: dict, snapshot: dict) -> None:
+    """Добавляет значения метрик снимка snapshot к значениям target"""
+    for name, data in snapshot.items():
+        if (current := target.get(name)) is None:
+            target[name] = data
+        elif (current['type'], current['buckets']) == (data['type'], data['buckets']):
+            merge_samples(current['samples'], data['samples'])
+
+
+def merge_samples(target: dict, samples: dict) -> None:
+    """Добавляет значения samples к значениям target (счетчики и интервалы гистограмм суммируются)"""
+    for key, value in samples.items():
+        if (current := target.get(key)) is None:
+            target[key] = value
+        elif isinstance(current, list):
+            target[key] = [left + right for left, right in zip(current, value)]
+        else:
+            target[key] = current + value
+
+
+REGISTRY = Registry()
+
+
+class Metric:
+    """Базовый класс метрики с метками
+
+    Args:
+        name (str): имя метрики
+        documentation (str): описание метрики
+        labelnames (tuple): имена меток
+        registry (Registry): реестр метрик
+    """
+
+    type = ''
+
+    def __init__(self, name: str, documentation: str, labelnames: tuple[str, ...] = (),
+                 registry: Registry = REGISTRY):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self.registry = registry
+        self.reset()
+        registry.register(self)
+
+    def reset(self) -> None:
+        self._lock = threading.Lock()
+        self._values: dict[tuple, float | list] = {}
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            samples = {
+                json.dumps(key): value.copy() if isinstance(value, list) else value
+                for key, value in self._values.items()
+            }
+        return {
+            'type': self.type,
+            'help': self.documentation,
+            'labels': self.labelnames,
+            'buckets': getattr(self, 'buckets', None),
+            'samples': samples,
+        }
+
+    def _key(self, labels: dict) -> tuple:
+        if not self.registry.started:
+            self.registry.start()
+        return tuple(str(labels[name]) for name in self.labelnames)
+
+
+class Counter(Metric):
+    """Счетчик"""
+
+    type = 'counter'
+
+    def inc(self, amount: float = 1, **labels) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+
+class Histogram(Metric):
+    """Гистограмма: количество наблюдений по интервалам, сумма и количество наблюдений
+
+    Args:
+        buckets (tuple): верхние границы интервалов по возрастанию (интервал +Inf добавляется автоматически)
+    """
+
+    type = 'histogram'
+
+    def __init__(self, name: str, documentation: str, labelnames: tuple[str, ...] = (),
+                 buckets: tuple[float, ...] = DEFAULT_BUCKETS, registry: Registry = REGISTRY):
+        self.buckets = list(buckets)
+        super().__init__(name, documentation, labelnames, registry)
+
+    def observe(self, value: float, **labels) -> None:
+        key = self._key(labels)
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            if (state := self._values.get(key)) is None:
+                #: Количество наблюдений в каждом интервале (не нарастающим итогом) и сумма наблюдений
+                state = self._values[key] = [0] * (len(self.buckets) + 2)
+            state[index] += 1
+            state[-1] += value
+
+
+def render(collected: dict) -> str:
+    """Формирует метрики в текстовом формате Prometheus"""
+    lines = []
+    for name, data in sorted(collected.items()):
+        lines.append(f'# HELP {name} {data["help"]}')
+        lines.append(f'# TYPE {name} {data["type"]}')
+        for key, value in sorted(data['samples'].items()):
+            labels = list(zip(data['labels'], json.loads(key)))
+            if data['type'] != 'histogram':
+                lines.append(f'{name}{_format_labels(labels)} {_format_value(value)}')
+                continue
+
+            cumulative = 0
+            for bound, count in zip([*data['buckets'], '+Inf'], value[:-1]):
+                cumulative += count
+                le = bound if isinstance(bound, str) else _format_value(bound)
+                lines.append(f'{name}_bucket{_format_labels([*labels, ("le", le)])} {cumulative}')
+            lines.append(f'{name}_sum{_format_labels(labels)} {_format_value(value[-1])}')
+            lines.append(f'{name}_count{_format_labels(labels)} {cumulative}')
+    return '\n'.join(lines) + '\n'
+
+
+def _format_labels(labels: list[tuple[str, str]]) -> str:
+    if not labels:
+        return ''
+    escaped = (
+        (name, value.replace('\\', r'\\').replace('"', r'\"').replace('\n', r'\n')) for name, value in labels
+    )
+    return '{' + ','.join(f'{name}="{value}"' for name, value in escaped) + '}'
+
+
+def _format_value(value: float) -> str:
+    return repr(float(value))
+
+
+#: Метрики запросов к API (учитываются в todolist.middleware.QueryBudgetMiddleware)
+HTTP_REQUEST_DURATION = Histogram(
+    'todolist_http_request_duration_seconds', 'Request processing time by route', ('route', 'method'),
+)
+HTTP_REQUESTS = Counter(
+    'todolist_http_requests_total', 'Requests by route and response status', ('route', 'method', 'status'),
+)
+DB_QUERIES = Counter('todolist_db_queries_total', 'SQL queries executed by requests by route', ('route',))
+DB_QUERY_DURATION = Counter(
+    'todolist_db_query_duration_seconds_total', 'SQL query execution time of requests by route', ('route',),
+)
+
+#: Метрики Telegram бота
+BOT_UPDATE_DURATION = Histogram(
+    'todolist_bot_update_duration_seconds', 'Bot update processing time by update type', ('type',),
+)
+BOT_UPDATE_LAG = Histogram(
+    'todolist_bot_update_lag_seconds', 'Time between a message being sent and received by the bot', ('source',),
+    buckets=(0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 300),
+)
+BOT_SEND_ERRORS = Counter(
+    'todolist_bot_send_errors_total', 'Telegram API request errors by method', ('method',),
+)
@@ -0,0 +1,139 @@
+import json
+import logging
+import time
+
+from django.conf import settings
+from django.db import connection
+from django.utils.functional import SimpleLazyObject, empty
+
+from todolist import metrics as app_metrics
+
+logger = logging.getLogger('todolist.requests')
+
+
+class QueryBudgetExceeded(Exception):
+    """Количество SQL запросов представления превысило объявленный бюджет"""
+
+
+class RequestMetrics:
+    """Показатели обработки запроса: количество и время SQL запросов, время рендеринга ответа
+
+    Используется как обертка выполнения запросов (connection.execute_wrapper)
+    """
+
+    __slots__ = ('started', 'queries', 'db_time', 'render_started', 'render_time')
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.queries = 0
+        self.db_time = 0.0
+        self.render_started = None
+        self.render_time = 0.0
+
+    def __call__(self, execute, sql, params, many, context):
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.db_time += time.perf_counter() - started
+            self.queries += 1
+
+    @property
+    def total_time(self) -> float:
+        return time.perf_counter() - self.started
+
+
+class QueryBudgetMiddleware:
+    """Инструментация запросов к API
+
+    Для каждого запроса подсчитываются количество и время SQL запросов и время рендеринга
+    (сериализации) ответа. Показатели передаются в заголовке Server-Timing при SERVER_TIMING
+    (по умолчанию - в режиме DEBUG) или в ответах персоналу (is_staff) и записываются в журнал
+    todolist.requests одной JSON строкой, а также учитываются в метриках /metrics по имени
+    маршрута (goal-list, board-detail, ...).
+
+    Представление может объявить бюджет запросов атрибутом query_budget (число) или
+    query_budgets (словарь {действие ViewSet: число}). При превышении бюджета в журнал
+    записывается предупреждение, а при QUERY_BUDGET_STRICT (тесты) выбрасывается
+    исключение QueryBudgetExceeded.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        request.metrics = metrics = RequestMetrics()
+        with connection.execute_wrapper(metrics):
+            response = self.get_response(request)
+
+        total_time = metrics.total_time
+        view_name = request.resolver_match.view_name if request.resolver_match else None
+        budget = getattr(request, '_query_budget', None)
+
+        route = (request.resolver_match.url_name or view_name) if request.resolver_match else 'unmatched'
+        app_metrics.HTTP_REQUEST_DURATION.observe(total_time, route=route, method=request.method)
+        app_metrics.HTTP_REQUESTS.inc(route=route, method=request.method, status=response.status_code)
+        app_metrics.DB_QUERIES.inc(metrics.queries, route=route)
+        app_metrics.DB_QUERY_DURATION.inc(metrics.db_time, route=route)
+
+        record = {
+            'method': request.method,
+            'path': request.path,
+            'view': view_name,
+            'status': response.status_code,
+            'queries': metrics.queries,
+            'db_ms': round(metrics.db_time * 1000, 2),
+            'render_ms': round(metrics.render_time * 1000, 2),
+            'total_ms': round(total_time * 1000, 2),
+        }
+        if budget is not None and metrics.queries > budget:
+            record['query_budget'] = budget
+            logger.warning(json.dumps(record))
+            if getattr(settings, 'QUERY_BUDGET_STRICT', False):
+                raise QueryBudgetExceeded(
+                    f'{view_name}: {metrics.queries} queries, budget {budget}'
+                )
+        else:
+            logger.info(json.dumps(record))
+
+        if getattr(settings, 'SERVER_TIMING', False) or self._is_staff(request):
+            response['Server-Timing'] = ', '.join((
+                f'db;dur={metrics.db_time * 1000:.2f};desc="{metrics.queries} queries"',
+                f'render;dur={metrics.render_time * 1000:.2f}',
+                f'total;dur={total_time * 1000:.2f}',
+            ))
+        return response
+
+    @staticmethod
+    def _is_staff(request) -> bool:
+        #: Пользователь проверяется, только если он уже загружен представлением (аутентификация DRF):
+        #: вычисление ленивого request.user выполнило бы запросы вне учета показателей
+        user = getattr(request, 'user', None)
+        if user is None or isinstance(user, SimpleLazyObject) and user._wrapped is empty:
+            return False
+        return user.is_staff
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        #: Бюджет объявляется в классе представления (для ViewSet - по действию, определяемому методом запроса)
+        view_class = getattr(view_func, 'cls', None) or getattr(view_func, 'view_class', None)
+        if view_class is None:
+            return None
+
+        budget = getattr(view_class, 'query_budget', None)
+        budgets = getattr(view_class, 'query_budgets', None)
+        actions = getattr(view_func, 'actions', None)
+        if budgets and actions and (action := actions.get(request.method.lower())) in budgets:
+            budget = budgets[action]
+        request._query_budget = budget
+        return None
+
+    def process_template_response(self, request, response):
+        #: Ответы DRF рендерятся после выхода из представления - время рендеринга измеряется отдельно
+        metrics = request.metrics
+        metrics.render_started = time.perf_counter()
+
+        def finish(rendered):
+            metrics.render_time += time.perf_counter() - metrics.render_started
+
+        response.add_post_render_callback(finish)
+        return response
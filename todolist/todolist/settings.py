@@ -38,6 +38,7 @@ INSTALLED_APPS = [
     'django.contrib.sessions',
     'django.contrib.messages',
     'django.contrib.staticfiles',
+    'django.contrib.postgres',
     'rest_framework',
     'social_django',
     'django_filters',
@@ -51,6 +52,7 @@ INSTALLED_APPS = [
 
 MIDDLEWARE = [
     'django.middleware.security.SecurityMiddleware',
+    'todolist.middleware.QueryBudgetMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'corsheaders.middleware.CorsMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -157,10 +159,48 @@ AUTHENTICATION_BACKENDS = (
 )
 
 REST_FRAMEWORK = {
-    'DEFAULT_PAGINATION_CLASS': 'rest_framework.pagination.LimitOffsetPagination',
+    'DEFAULT_PAGINATION_CLASS': 'goals.pagination.KeysetPagination',
     'DATETIME_FORMAT': '%Y-%m-%d %H:%M:%S',
 }
 
+# Кэш Django: при заданном CACHE_URL (например, redis://redis:6379/0) - общий для процессов кэш Redis,
+# иначе - кэш в памяти процесса (разработка, тесты). Кэширование ролей, ответов списков и состояний чатов бота
+# при нескольких процессах требует общего кэша (проверки goals.E001 и bot.E001)
+CACHE_URL = env.str('CACHE_URL', default='')
+if CACHE_URL:
+    CACHES = {'default': {'BACKEND': 'django.core.cache.backends.redis.RedisCache', 'LOCATION': CACHE_URL}}
+else:
+    CACHES = {'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}}
+
+# Время хранения ролей участников досок в кэше между запросами (секунды).
+# 0 - роль определяется один раз за запрос. Для нескольких процессов требуется общий кэш (CACHE_URL).
+BOARD_ROLE_CACHE_TIMEOUT = env.int('BOARD_ROLE_CACHE_TIMEOUT', default=0)
+
+# Кэш ответов списков досок, категорий, целей и комментариев: время хранения (секунды, 0 - отключен)
+# и имя кэша в CACHES. Для нескольких процессов требуется общий кэш (CACHE_URL).
+LIST_CACHE_TIMEOUT = env.int('LIST_CACHE_TIMEOUT', default=0)
+LIST_CACHE = env.str('LIST_CACHE', default='default')
+
+# Количество строк, читаемых из базы данных за один раз при экспорте доски
+EXPORT_CHUNK_SIZE = env.int('EXPORT_CHUNK_SIZE', default=2000)
+# Количество записей, сохраняемых одним запросом при импорте доски
+IMPORT_BATCH_SIZE = env.int('IMPORT_BATCH_SIZE', default=1000)
+# Максимальный размер файла импорта доски через API (байты); большие файлы импортируются командой import_board
+IMPORT_MAX_SIZE = env.int('IMPORT_MAX_SIZE', default=5 * 1024 * 1024)
+# Количество категорий и целей, обрабатываемых в одной транзакции при фоновом удалении досок и категорий
+DELETION_BATCH_SIZE = env.int('DELETION_BATCH_SIZE', default=500)
+# Инструментация запросов: заголовок Server-Timing с количеством и временем SQL запросов и временем рендеринга
+# (всем клиентам - по умолчанию только в режиме DEBUG, персоналу - всегда),
+# исключение при превышении бюджета запросов представления (иначе - предупреждение в журнале todolist.requests)
+SERVER_TIMING = env.bool('SERVER_TIMING', default=DEBUG)
+QUERY_BUDGET_STRICT = env.bool('QUERY_BUDGET_STRICT', default=False)
+# Метрики /metrics: общий каталог снимков метрик процессов (воркеров gunicorn и бота; пустое значение -
+# только метрики процесса, обработавшего запрос), интервал записи снимков (секунды) и токен доступа
+# (пустое значение отключает эндпоинт)
+METRICS_DIR = env.str('METRICS_DIR', default='')
+METRICS_FLUSH_INTERVAL = env.float('METRICS_FLUSH_INTERVAL', default=5)
+METRICS_TOKEN = env.str('METRICS_TOKEN', default='')
+
 if DEBUG:
     import socket
 
@@ -175,3 +215,25 @@ if DEBUG:
     INTERNAL_IPS = [ip[: ip.rfind(".")] + ".1" for ip in ips] + ["127.0.0.1", "10.0.2.2"]
 
 TG_TOKEN = env.str('TG_TOKEN')
+# Количество потоков обработки сообщений бота (сообщения одного чата обрабатываются по порядку)
+TG_BOT_WORKERS = env.int('TG_BOT_WORKERS', default=4)
+# Ограничения частоты отправки сообщений бота (сообщений в секунду): общее и для одного чата
+TG_SEND_RATE = env.float('TG_SEND_RATE', default=30)
+TG_CHAT_SEND_RATE = env.float('TG_CHAT_SEND_RATE', default=1)
+# Время, после которого захваченное, но не отправленное сообщение или не обработанное обновление webhook
+# (отправитель или обработчик завершился аварийно) возвращается в очередь, и время хранения обработанных
+# сообщений и обновлений (секунды, 0 - без удаления)
+TG_SEND_CLAIM_TIMEOUT = env.int('TG_SEND_CLAIM_TIMEOUT', default=300)
+TG_MESSAGE_RETENTION = env.int('TG_MESSAGE_RETENTION', default=7 * 24 * 3600)
+# Кэш состояний чатов верифицированных пользователей бота: имя общего кэша в CACHES (пустое значение -
+# без кэша; кэш процесса не используется, так как изменения пользователей в API до него не доходят)
+# и время жизни записей (секунды)
+TG_CHAT_CACHE = env.str('TG_CHAT_CACHE', default='')
+TG_CHAT_CACHE_TIMEOUT = env.int('TG_CHAT_CACHE_TIMEOUT', default=300)
+# Время хранения индекса категорий пользователя для команды /create бота в кэше (секунды, 0 - без кэша).
+# Сброс индекса из процесса API доходит до бота только через общий бэкенд CACHES.
+TG_CATEGORY_CACHE_TIMEOUT = env.int('TG_CATEGORY_CACHE_TIMEOUT', default=0)
+# Количество целей на странице ответа на команду /goals бота
+TG_GOALS_PAGE_SIZE = env.int('TG_GOALS_PAGE_SIZE', default=20)
+# Секретный токен webhook бота (заголовок X-Telegram-Bot-Api-Secret-Token). Пустое значение отключает webhook
+TG_WEBHOOK_SECRET = env.str('TG_WEBHOOK_SECRET', default='')
@@ -1,23 +1,45 @@
+import hmac
+
 from django.contrib import admin
+from django.http import Http404, HttpResponse, HttpResponseForbidden
 from django.urls import path, include
 from django.conf import settings
 from django.conf.urls.static import static
+from django.views.decorators.http import require_GET
 from rest_framework.decorators import api_view
 from rest_framework.response import Response
 
+from todolist.metrics import REGISTRY, render
+
 
 @api_view(['GET'])
 def health_check(request):
     return Response({'status': 'OK'})
 
 
+@require_GET
+def metrics(request):
+    """Метрики API и бота в текстовом формате Prometheus
+
+    Требуется заголовок Authorization: Bearer <settings.METRICS_TOKEN>. Без токена эндпоинт отключен
+    """
+    if not settings.METRICS_TOKEN:
+        raise Http404
+    if not hmac.compare_digest(
+        request.META.get('HTTP_AUTHORIZATION', '').encode(), f'Bearer {settings.METRICS_TOKEN}'.encode()
+    ):
+        return HttpResponseForbidden()
+    return HttpResponse(render(REGISTRY.collect()), content_type='text/plain; version=0.0.4; charset=utf-8')
+
+
 urlpatterns = [
     path('admin/', admin.site.urls),
     path('bot/', include('bot.urls')),
     path('core/', include('core.urls')),
     path('goals/', include('goals.urls')),
     path('oauth/', include('social_django.urls', namespace='social')),
-    path('ping/', health_check, name='health-check')
+    path('ping/', health_check, name='health-check'),
+    path('metrics', metrics, name='metrics'),
 ]
 
 if settings.DEBUG: